@@ -1,23 +1,28 @@
 from fastapi import FastAPI, Request, Response, Depends, HTTPException, status
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional, List, Dict, Any
 
 import os
+import copy
 import json
 import time
 import re
 import shutil
+import threading
 import flask
 import hashlib
+import marshal
 import traceback
 import platform
 import psutil
-import nbformat
 import ast
 import codecs
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
 import requests
@@ -27,6 +32,18 @@ from sqlalchemy.orm import sessionmaker
 
 from app.events import event_manager
 from app.events.event_definitions import EventType
+from app.services.ai_conversation import gemini_contents
+from app.services.ai_health import get_ai_health_monitor, health_key
+from app.services.evaluator import parse_benchmark_sizes, run_tests  # noqa: F401 - run_tests geriye dönük uyumluluk
+from app.services.expected_outputs import content_hash, get_expected_outputs, store_expected_outputs
+from app.services.kernel_pool import get_kernel_pool
+from app.services.notebook_catalog import content_hash as notebook_content_hash
+from app.services.notebook_cache import load_notebook
+from app.services.sandbox_pool import get_sandbox_pool
+from app.services.test_shards import run_sharded_job
+from app.services.search_index import get_search_index
+from app.services.test_plans import CompiledTestPlan, get_test_plan_cache
+from app.utils.cache import LRUCache
 from config import Config
 
 # Veritabanı bağlantısı
@@ -37,6 +54,16 @@ Base = declarative_base()
 
 api = FastAPI(title="Python Playground API", version="1.0.0")
 
+# Aynı kodun aynı soru sürümüne tekrar gönderimi için değerlendirme sonuçları
+evaluation_result_cache = LRUCache(max_size=Config.EVALUATION_RESULT_CACHE_SIZE,
+                                   ttl=Config.EVALUATION_RESULT_CACHE_TTL)
+
+# Yük altında oluşabildiğinden bu durumdaki testleri içeren sonuçlar önbelleğe alınmaz
+UNCACHEABLE_TEST_STATUSES = ("timeout", "too_slow")
+
+# Yeniden kullanılan AI istemcilerinin (sağlayıcı, anahtar, model) en fazla sayısı
+AI_CLIENT_CACHE_SIZE = 16
+
 # CORS ekle - domain sınırlaması
 api.add_middleware(
     CORSMiddleware,
@@ -45,6 +72,41 @@ api.add_middleware(
     allow_headers=["*"],
 )
 
+
+@api.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """
+    Geçersiz performans testi ayarlarını (benchmark_sizes) 400 ile reddeder; diğer doğrulama
+    hataları FastAPI'nin varsayılan 422 yanıtıyla döner.
+    """
+    errors = [error for error in exc.errors() if "benchmark_sizes" in error.get("loc", ())]
+    if errors:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST,
+                            content={"detail": [error["msg"] for error in errors]})
+    return await request_validation_exception_handler(request, exc)
+
+
+def validate_benchmark_sizes(value):
+    """
+    benchmark_sizes alanını soru formundaki kuralla doğrular: boş olabilir, doluysa virgülle
+    ayrılmış en az iki pozitif tamsayı olmalıdır.
+
+    Raises:
+        ValueError: Değer geçersizse (istek 400 ile reddedilir).
+    """
+    if value is not None and value.strip():
+        parse_benchmark_sizes(value)
+    return value
+
+
+@api.on_event("startup")
+def start_sandbox_pool():
+    """
+    Uygulama başlarken kod değerlendirme işçi havuzunu ısıtır, böylece ilk gönderim
+    süreç başlatma maliyetini ödemez.
+    """
+    get_sandbox_pool().start()
+
 # BaseModeller
 
 class ServerStatus(BaseModel):
@@ -67,6 +129,10 @@ class ServerStatus(BaseModel):
         (GB cinsinden).
         process_ram_allocated (float): Süreç tarafından tahsis edilen RAM miktarını
         belirtir (GB cinsinden).
+        notebook_kernels (Optional[Dict[str, Any]]): Notebook çekirdek havuzunun durumu ve
+        kullanıcı başına bellek kullanımı.
+        ai_providers (Optional[List[Dict[str, Any]]]): AI sağlayıcılarının devre kesici durumu
+        ve son çağrılara göre canlılık bilgisi.
     """
     python_version: str
     flask_version: str
@@ -76,6 +142,8 @@ class ServerStatus(BaseModel):
     cpu_usage: float
     process_ram_used: float
     process_ram_allocated: float
+    notebook_kernels: Optional[Dict[str, Any]] = None
+    ai_providers: Optional[List[Dict[str, Any]]] = None
 
 # User model - sadece API amaçlı
 class UserRole(BaseModel):
@@ -116,11 +184,63 @@ class EvaluationRequest(BaseModel):
     Bu sınıf, bir fonksiyonun adı, kodu, test girdileri ve çözüm kodu gibi bilgileri
     depolamak ve değerlendirme süreçlerinde kullanılmak üzere yapılandırılmıştır.
     Kullanıcı kodunu test etmek ve doğrulamak için gerekli olan tüm bilgileri içerir.
+    question_id verildiğinde referans çözüm çıktıları önbellekten okunur; question_version
+    (sorunun updated_at değeri) de verilirse derlenmiş test planı bellekte saklanır.
+    fail_fast True ise ilk başarısız testte durulur; cheapest_first ile testler küçük
+    girdilerden başlanarak çalıştırılır. Bu mod hızlı "Test Et" denemeleri içindir.
+    size_generator verilen performans sorularında testler geçtikten sonra kod, büyüyen
+    girdilerde (benchmark_sizes) referans çözümle karşılaştırılır; time_tolerance referans
+    süresinin kaç katına izin verildiğini belirtir. Performans testi fail_fast modunda çalıştırılmaz.
+    """
+    code: str
+    function_name: str
+    test_inputs: str
+    solution_code: str
+    question_id: Optional[int] = None
+    question_version: Optional[str] = None
+    fail_fast: bool = False
+    cheapest_first: bool = False
+    size_generator: Optional[str] = None
+    benchmark_sizes: Optional[str] = None
+    time_tolerance: Optional[float] = None
+
+    @field_validator("benchmark_sizes")
+    @classmethod
+    def check_benchmark_sizes(cls, value):
+        return validate_benchmark_sizes(value)
+
+class BatchSubmissionItem(BaseModel):
     """
+    Toplu değerlendirmedeki tek bir kodu temsil eder.
+
+    Attributes:
+        id (Optional[int]): Çağıranın sonucu eşleştirmek için kullandığı kimlik (ör. Submission ID).
+        code (str): Değerlendirilecek kod.
+    """
+    id: Optional[int] = None
     code: str
+
+class BatchEvaluationRequest(BaseModel):
+    """
+    Birden fazla kodun aynı soruya karşı değerlendirilmesi için gerekli verileri temsil eder.
+
+    Soru bilgileri (fonksiyon adı, test girdileri, çözüm kodu) bir kez gönderilir ve tüm
+    kodlar aynı test planı ile değerlendirilir.
+    """
     function_name: str
     test_inputs: str
     solution_code: str
+    question_id: Optional[int] = None
+    question_version: Optional[str] = None
+    size_generator: Optional[str] = None
+    benchmark_sizes: Optional[str] = None
+    time_tolerance: Optional[float] = None
+    submissions: List[BatchSubmissionItem]
+
+    @field_validator("benchmark_sizes")
+    @classmethod
+    def check_benchmark_sizes(cls, value):
+        return validate_benchmark_sizes(value)
 
 class EvaluationResult(BaseModel):
     """
@@ -140,6 +260,9 @@ class EvaluationResult(BaseModel):
     passed_tests: int
     failed_tests: int
     test_results: Optional[dict] = None
+    skipped_tests: int = 0
+    cpu_time: float = 0
+    peak_memory: Optional[float] = None
 
 # --- AI Notebook Summary Modelleri ---
 class NotebookSummaryRequest(BaseModel):
@@ -241,7 +364,9 @@ class SubmissionDetail(BaseModel):
     question_id: int
     question_title: str
     is_correct: bool
-    execution_time: float
+    execution_time: Optional[float] = None
+    cpu_time: Optional[float] = None
+    peak_memory: Optional[float] = None
     created_at: str
 
 class Badge(BaseModel):
@@ -371,7 +496,9 @@ class ProgrammingQuestionCreate(BaseModel):
 
     Bu sınıf, programlama sorularının oluşturulması için gerekli olan
     başlık, açıklama, zorluk seviyesi, puan, konu, örnek giriş/çıktı ve
-    çözüm kodu gibi bilgileri içerir.
+    çözüm kodu gibi bilgileri içerir. Performans soruları için size_generator,
+    benchmark_sizes ve time_tolerance da verilebilir; güncellemede gönderilmeyen
+    performans alanlarının mevcut değerleri korunur.
     """
     id: Optional[int] = None
     title: str
@@ -384,6 +511,14 @@ class ProgrammingQuestionCreate(BaseModel):
     function_name: str = ""
     solution_code: str = ""
     test_inputs: str = "[]"
+    size_generator: Optional[str] = None
+    benchmark_sizes: Optional[str] = None
+    time_tolerance: Optional[float] = None
+
+    @field_validator("benchmark_sizes")
+    @classmethod
+    def check_benchmark_sizes(cls, value):
+        return validate_benchmark_sizes(value)
 
 # Instagram post yanıt modelini tanımlayalım
 class InstagramPostResponse(BaseModel):
@@ -417,60 +552,80 @@ class AIClient:
         self.api_key = api_key
         self.model = model_name
         self.base_url = "https://generativelanguage.googleapis.com/v1"
+        self.health_key = health_key(api_provider, api_key)
+
+    # Sağlayıcı başına aynı anda yapılabilecek çağrı sayısını sınırlayan semaforlar
+    _slots = {}
+    _slots_lock = threading.Lock()
+
+    @classmethod
+    def _provider_slots(cls, api_provider):
+        with cls._slots_lock:
+            slots = cls._slots.get(api_provider)
+            if slots is None:
+                slots = cls._slots[api_provider] = threading.BoundedSemaphore(Config.AI_PROVIDER_CONCURRENCY)
+            return slots
 
     def chat_completion(self, messages, max_tokens=100000):
+        # Devre açıksa sağlayıcıya istek gönderilmez; çağrı sonuçları devrenin durumunu günceller
+        health = get_ai_health_monitor()
+        allowed, last_error = health.allow(self.health_key)
+        if not allowed:
+            return {"error": f"AI servisi geçici olarak kullanılamıyor: {last_error}"}
+
+        with self._provider_slots(self.api_provider):
+            result = self._chat_completion(messages, max_tokens)
+        if "error" in result:
+            health.record_failure(self.health_key, result["error"])
+        else:
+            health.record_success(self.health_key)
+        return result
+
+    # Gemini yapılandırması süreç geneline uygulanır: yalnızca API anahtarı değiştiğinde yeniden
+    # yapılandırılır ve model nesneleri o anahtar için önbellekte tutulur
+    _configured_key = None
+    _models = {}
+    _models_lock = threading.Lock()
+
+    @staticmethod
+    def _gemini_model_name(model_name):
+        # Model adını düzelt
+        gemini_model = model_name
+        if "models/" in gemini_model:
+            gemini_model = gemini_model.replace("models/", "")
+
+        # Gemini 1.5 modellerini doğru formatta kullan
+        if gemini_model == "gemini-1.5-pro":
+            gemini_model = "gemini-1.5-pro-latest"
+        elif gemini_model == "gemini-1.5-flash":
+            gemini_model = "gemini-1.5-flash-latest"
+        return gemini_model
+
+    def _gemini_model(self):
+        import google.generativeai as genai
+
+        gemini_model = self._gemini_model_name(self.model)
+        with AIClient._models_lock:
+            if AIClient._configured_key != self.api_key:
+                genai.configure(api_key=self.api_key)
+                AIClient._configured_key = self.api_key
+                AIClient._models.clear()
+            model = AIClient._models.get(gemini_model)
+            if model is None:
+                model = AIClient._models[gemini_model] = genai.GenerativeModel(model_name=gemini_model)
+        return genai, model
+
+    def _chat_completion(self, messages, max_tokens):
         try:
             # Gemini API
             if self.api_provider == "gemini":
-                import google.generativeai as genai
-                genai.configure(api_key=self.api_key)
-
-                # Model adını düzelt
-                gemini_model = self.model
-                if "models/" in gemini_model:
-                    gemini_model = gemini_model.replace("models/", "")
-
-                # Gemini 1.5 modellerini doğru formatta kullan
-                if gemini_model == "gemini-1.5-pro":
-                    gemini_model = "gemini-1.5-pro-latest"
-                elif gemini_model == "gemini-1.5-flash":
-                    gemini_model = "gemini-1.5-flash-latest"
-
-                # Mesajları Gemini formatına dönüştürme
-                system_prompt = None
-                user_messages = []
-                assistant_messages = []
-
-                for msg in messages:
-                    if msg["role"] == "system":
-                        system_prompt = msg["content"]
-                    elif msg["role"] == "user":
-                        user_messages.append(msg["content"])
-                    elif msg["role"] == "assistant":
-                        assistant_messages.append(msg["content"])
-
-                gen_config = genai.GenerationConfig(max_output_tokens=max_tokens)
-                gen_model = genai.GenerativeModel(model_name=gemini_model, generation_config=gen_config)
-
-                chat = gen_model.start_chat()
-
-                if system_prompt:
-                    chat.send_message(f"SYSTEM: {system_prompt}")
-
-                for i in range(max(len(user_messages), len(assistant_messages))):
-                    if i < len(user_messages):
-                        if i < len(assistant_messages):
-                            chat.send_message(user_messages[i])
-                            chat.send_message(assistant_messages[i])
-                        else:
-                            prompt = user_messages[i]
-                    if i < len(assistant_messages) and i >= len(user_messages):
-                        chat.send_message(assistant_messages[i])
+                genai, model = self._gemini_model()
 
-                prompt = user_messages[-1] if user_messages else (
-                        system_prompt or "Notebook hakkında bilgi verir misiniz?")
-
-                response = chat.send_message(prompt)
+                # Tüm konuşma tek istekte gönderilir
+                response = model.generate_content(
+                    gemini_contents(messages),
+                    generation_config=genai.GenerationConfig(max_output_tokens=max_tokens)
+                )
 
                 return {"content": response.text if hasattr(response, 'text') else str(response)}
 
@@ -480,6 +635,34 @@ class AIClient:
         except Exception as e:
             return {"error": str(e)}
 
+
+# İstemciler API anahtarının kendisiyle değil health_key özetiyle anahtarlanır; istek başına
+# farklı anahtarlar gelebildiğinden önbellek boyutu sınırlıdır
+_ai_clients = LRUCache(max_size=AI_CLIENT_CACHE_SIZE)
+_ai_clients_lock = threading.Lock()
+
+
+def get_ai_client(api_provider, api_key, model_name):
+    """
+    Sağlayıcı, API anahtarı ve model için uygulama boyunca yeniden kullanılan AIClient örneğini döndürür.
+
+    Args:
+        api_provider (str): AI sağlayıcısının adı.
+        api_key (str): API anahtarı.
+        model_name (str): Model adı.
+
+    Returns:
+        AIClient: Paylaşılan istemci.
+    """
+    key = (*health_key(api_provider, api_key), model_name)
+    with _ai_clients_lock:
+        client = _ai_clients.get(key)
+        # Özet çakışmasında başka bir anahtarın istemcisi kullanılmaz
+        if client is None or client.api_key != api_key:
+            client = AIClient(api_provider, api_key, model_name)
+            _ai_clients.set(key, client)
+        return client
+
 # Veritabanı oturumu dependency
 def get_db():
     """
@@ -535,6 +718,9 @@ def server_status(admin: dict = Depends(get_current_admin), db=Depends(get_db)):
             - cpu_usage (float): Yüzdesel olarak sistem CPU kullanım oranı.
             - process_ram_used (float): Çalışmakta olan sürecin kullandığı RAM miktarı (GB cinsinden).
             - process_ram_allocated (float): Çalışmakta olan sürecin tahsis edilen RAM miktarı (GB cinsinden).
+            - notebook_kernels (dict): Notebook çekirdeklerinin sayısı, toplam ve kullanıcı başına bellek
+              kullanımı ile kapatılma sayıları.
+            - ai_providers (list): AI sağlayıcılarının devre durumu, canlılığı ve son hatası.
     """
     # Python sürümü
     python_version = platform.python_version()
@@ -568,7 +754,9 @@ def server_status(admin: dict = Depends(get_current_admin), db=Depends(get_db)):
         'ram_total': ram_total,
         'cpu_usage': cpu_usage,
         'process_ram_used': process_ram_used,
-        'process_ram_allocated': process_ram_allocated
+        'process_ram_allocated': process_ram_allocated,
+        'notebook_kernels': get_kernel_pool().status(),
+        'ai_providers': get_ai_health_monitor().status()
     }
 
 @api.get("/api/recent-users", response_model=List[UserData])
@@ -660,6 +848,22 @@ def normalize_indentation(code: str) -> str:
     return '\n'.join(normalized_lines)
 
 
+def _empty_evaluation_result():
+    """Değerlendirme sonucunun başlangıç değerlerini döndürür."""
+    return {
+        "is_correct": False,
+        "execution_time": 0,
+        "test_count": 0,
+        "test_results": {},
+        "errors": [],
+        "passed_tests": 0,  # Zorunlu alan
+        "failed_tests": 0,  # Zorunlu alan
+        "skipped_tests": 0,
+        "cpu_time": 0,
+        "peak_memory": None
+    }
+
+
 @api.post("/api/evaluate", response_model=EvaluationResult)
 def evaluate_solution(request: EvaluationRequest):
     """
@@ -668,20 +872,47 @@ def evaluate_solution(request: EvaluationRequest):
     Bu API endpoint'i kullanıcının gönderdiği kodu çalıştırır, çözüm ile karşılaştırır
     ve test sonuçlarını döndürür.
     """
-    # Sonuç nesnesi başlangıç değerleri
-    result = {
-        "is_correct": False,
-        "execution_time": 0,
-        "test_count": 0,
-        "test_results": {},
-        "errors": [],
-        "passed_tests": 0,  # Zorunlu alan
-        "failed_tests": 0  # Zorunlu alan
-    }
+    try:
+        # Test planını (girdiler, seed'li ve derlenmiş çözüm kodu) önbellekten al veya oluştur
+        plan = get_test_plan(request)
+    except json.JSONDecodeError:
+        result = _empty_evaluation_result()
+        result["errors"].append("Test girdileri geçerli JSON formatında değil")
+        return result
+
+    return evaluate_with_plan(request.code, request, plan)
+
+
+def evaluate_with_plan(code, request, plan, shard=True):
+    """
+    Kullanıcı kodunu hazır bir test planına göre sandbox işçisinde değerlendirir.
+
+    Args:
+        code (str): Kullanıcının gönderdiği kod.
+        request (EvaluationRequest | BatchEvaluationRequest): Soru bilgilerini taşıyan istek.
+        plan (CompiledTestPlan): get_test_plan ile alınmış test planı.
+        shard (bool): True ise çok sayıda test içeren değerlendirmeler işçiler arasında
+            bölünür. Havuzu zaten dolduran toplu değerlendirmelerde kapatılır.
+
+    Returns:
+        dict: EvaluationResult alanlarını içeren değerlendirme sonucu.
+    """
+    # Performans testi, testler geçtikten sonra çalışan ek bir test olarak sayılır (hızlı denemede çalışmaz)
+    fail_fast = getattr(request, "fail_fast", False)
+    test_count = len(plan.test_inputs) + (1 if plan.benchmark and not fail_fast else 0)
+
+    # Aynı kod aynı soru sürümüne daha önce gönderildiyse sonucu yeniden kullan
+    cache_key = evaluation_cache_key(code, request)
+    cached = get_cached_evaluation(cache_key, request.question_id, test_count)
+    if cached is not None:
+        return cached
+
+    result = _empty_evaluation_result()
+    result["test_count"] = test_count
 
     try:
         # 1. Kod ön işleme ve kontrol
-        normalized_code = normalize_indentation(request.code)
+        normalized_code = normalize_indentation(code)
 
         # Geliştirilmiş girinti kontrolü
         is_valid, line_num, error_msg, error_type = check_indentation(normalized_code)
@@ -696,52 +927,70 @@ def evaluate_solution(request: EvaluationRequest):
 
         # 2. Random kullanım kontrolü ve seed enjeksiyonu
         normalized_code = inject_random_seed(normalized_code, request.function_name)
-        modified_solution_code = inject_random_seed(request.solution_code, request.function_name)
-
-        # 3. Test girdilerini yükle
-        try:
-            test_inputs = json.loads(request.test_inputs)
-            result["test_count"] = len(test_inputs)
-        except json.JSONDecodeError:
-            result["errors"].append("Test girdileri geçerli JSON formatında değil")
-            return result
-
-        # 4. Kullanıcı fonksiyonunu çalıştırma
-        user_namespace = {}
-        exec(normalized_code, user_namespace)
-        user_function = user_namespace.get(request.function_name)
-
-        if user_function is None:
-            result["errors"].append(f"'{request.function_name}' adında bir fonksiyon bulunamadı")
-            return result
-
-        if not callable(user_function):
-            result["errors"].append(f"'{request.function_name}' çağrılabilir bir fonksiyon değil")
-            return result
-
-        # 5. Çözüm fonksiyonunu çalıştırma
-        solution_namespace = {}
-        exec(modified_solution_code, solution_namespace)
-        solution_function = solution_namespace.get(request.function_name)
 
-        if not solution_function:
-            result["errors"].append("Çözüm fonksiyonu bulunamadı")
+        # 3. Kullanıcı ve çözüm kodunu sandbox işçisinde çalıştır
+        # Test başına sınırlar işçi içinde uygulanır; iş geneli sınırlar yalnızca son güvencedir
+        test_inputs = plan.test_inputs
+        limits = {
+            "test_timeout": Config.EVALUATOR_TEST_TIMEOUT,
+            "test_cpu_limit": Config.EVALUATOR_TEST_CPU_LIMIT,
+            "memory_limit_mb": Config.EVALUATOR_MEMORY_LIMIT_MB,
+            "output_limit": Config.EVALUATOR_OUTPUT_LIMIT_KB * 1024,
+            # Tepe bellek ölçümü yavaşlattığından varsayılan olarak yalnızca performans sorularında açılır
+            "trace_memory": Config.EVALUATOR_TRACE_MEMORY or bool(plan.benchmark and not fail_fast)
+        }
+        # Referans çözüm çıktıları önbellekte varsa çözüm kodu çalıştırılmaz
+        job = {
+            "code": normalized_code,
+            "solution_code": plan.solution_code,
+            "solution_bytecode": plan.solution_bytecode,
+            "function_name": request.function_name,
+            "test_inputs": test_inputs,
+            "expected_outputs": plan.expected_outputs,
+            "benchmark": plan.benchmark,
+            "limits": limits
+        }
+        if fail_fast:
+            # Hızlı denemede performans testi çalıştırılmaz; yalnızca gönderimde ölçülür
+            job["fail_fast"] = True
+            job["benchmark"] = None
+            if getattr(request, "cheapest_first", False):
+                job["order"] = plan.cheapest_first_order
+
+        # Çok sayıda test varsa girdiler işçilere bölünür (ilk hatada durma modunda bölünmez)
+        shard_count = _shard_count(len(test_inputs)) if shard and not fail_fast else 1
+        if shard_count > 1:
+            response = _run_sharded_job(job, shard_count)
+        else:
+            response = _run_sandbox_job(job, len(test_inputs) + _benchmark_cost(job["benchmark"]))
+
+        if not response.get("ok"):
+            if response.get("status") == "timeout":
+                result["errors"].append(f"Zaman aşımı: {response.get('error')}")
+            elif response.get("status") == "memory_exceeded":
+                result["errors"].append(f"Bellek sınırı aşıldı: {response.get('error')}")
+            elif response.get("status") == "output_limit":
+                result["errors"].append(f"Çıktı sınırı aşıldı: {response.get('error')}")
+            else:
+                result["errors"].append(f"Değerlendirme hatası: {response.get('error')}")
+                if response.get("traceback"):
+                    result["error_details"] = response["traceback"]
             return result
 
-        # 6. Testleri çalıştır ve değerlendir
-        start_time = time.time()
-        test_results, passed, failed, is_all_correct, error_messages = run_tests(
-            user_function, solution_function, test_inputs
-        )
-        end_time = time.time()
-
-        # 7. Sonuçları hazırla
-        result["is_correct"] = is_all_correct
-        result["execution_time"] = round((end_time - start_time) * 1000, 2)  # milisaniye
-        result["test_results"] = test_results
-        result["passed_tests"] = passed
-        result["failed_tests"] = failed
-        result["errors"].extend(error_messages)
+        # 4. Sonuçları hazırla
+        sandbox_result = response["result"]
+        result["is_correct"] = sandbox_result["is_correct"]
+        result["execution_time"] = sandbox_result["execution_time"]
+        result["cpu_time"] = sandbox_result.get("cpu_time", 0)
+        result["peak_memory"] = sandbox_result.get("peak_memory")
+        result["test_results"] = sandbox_result["test_results"]
+        result["passed_tests"] = sandbox_result["passed_tests"]
+        result["failed_tests"] = sandbox_result["failed_tests"]
+        result["skipped_tests"] = result["test_count"] - len(sandbox_result["test_results"])
+        result["errors"].extend(sandbox_result["errors"])
+
+        if is_cacheable_evaluation(result):
+            evaluation_result_cache.set(cache_key, copy.deepcopy(result))
 
         return result
 
@@ -754,6 +1003,377 @@ def evaluate_solution(request: EvaluationRequest):
         return result
 
 
+def _run_sandbox_job(job, test_count):
+    """İşi test sayısına göre ölçeklenen süre ve CPU sınırlarıyla sandbox havuzunda çalıştırır."""
+    return get_sandbox_pool().run(
+        job,
+        timeout=Config.EVALUATOR_JOB_TIMEOUT + test_count * Config.EVALUATOR_TEST_TIMEOUT,
+        cpu_limit=Config.EVALUATOR_JOB_CPU_LIMIT + int(test_count * Config.EVALUATOR_TEST_CPU_LIMIT) + 1
+    )
+
+
+def _benchmark_cost(benchmark):
+    """Performans testinin sandbox süre sınırlarına test sayısı cinsinden katkısını hesaplar."""
+    if not benchmark:
+        return 0
+    return len(benchmark["sizes"]) * benchmark["repeats"] * 2
+
+
+def _shard_count(test_count):
+    """
+    Test sayısına ve havuz boyutuna göre işin kaç parçaya bölüneceğini hesaplar.
+    EVALUATOR_SHARD_MIN_TESTS 0 ise (varsayılan) bölme kapalıdır.
+    """
+    min_tests = Config.EVALUATOR_SHARD_MIN_TESTS
+    if min_tests <= 0 or test_count < 2 * min_tests:
+        return 1
+    return max(1, min(get_sandbox_pool().size, test_count // min_tests))
+
+
+def _run_sharded_job(job, shard_count):
+    """
+    İşi test_shards.run_sharded_job ile parçalara bölerek sandbox havuzunda çalıştırır.
+
+    Args:
+        job (dict): evaluate_with_plan tarafından hazırlanan iş tanımı.
+        shard_count (int): Parça sayısı.
+
+    Returns:
+        dict: SandboxPool.run ile aynı biçimde birleştirilmiş yanıt.
+    """
+    return run_sharded_job(job, shard_count, _run_sandbox_job, _benchmark_cost(job.get("benchmark")))
+
+
+def evaluation_cache_key(code, request):
+    """
+    Tekrarlanan gönderimleri tanımak için normalleştirilmiş kod ve soru sürümünden özet hesaplar.
+
+    Args:
+        code (str): Kullanıcının gönderdiği kod.
+        request (EvaluationRequest | BatchEvaluationRequest): Soru bilgilerini taşıyan istek.
+
+    Returns:
+        str: 64 karakterlik SHA-256 özeti.
+    """
+    normalized_code = '\n'.join(line.rstrip() for line in normalize_indentation(code).strip().splitlines())
+    digest = hashlib.sha256()
+    mode = "fail_fast" if getattr(request, "fail_fast", False) else "full"
+    if mode == "fail_fast" and getattr(request, "cheapest_first", False):
+        mode += ":cheapest_first"
+    for part in (str(request.question_id), str(request.question_version), request.function_name,
+                 plan_content_hash(request), mode, normalized_code):
+        digest.update((part or '').encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def plan_content_hash(request):
+    """
+    Test planının içerik özetini hesaplar: çözüm kodu ve test girdilerinin yanında performans
+    testi ayarlarını da kapsar, böylece yalnızca bu ayarlar değiştiğinde de plan yenilenir.
+
+    Args:
+        request (EvaluationRequest | BatchEvaluationRequest): Soru bilgilerini taşıyan istek.
+
+    Returns:
+        str: 64 karakterlik SHA-256 özeti.
+    """
+    benchmark = json.dumps([request.size_generator, request.benchmark_sizes, request.time_tolerance])
+    return hashlib.sha256(
+        f"{content_hash(request.solution_code, request.test_inputs)}\0{benchmark}".encode('utf-8')
+    ).hexdigest()
+
+
+def is_cacheable_evaluation(result):
+    """
+    Değerlendirme sonucunun önbelleğe alınıp alınamayacağını (ve Submission'a code_hash
+    yazılıp yazılamayacağını) döndürür. Sandbox hatasıyla biten (test sonucu olmayan)
+    değerlendirmeler ile yük altında oluşabilecek zaman aşımı ve yavaşlık sonuçları
+    tekrarlanabilir olmadığından önbelleğe alınmaz.
+
+    Args:
+        result (dict): Değerlendirme sonucu.
+
+    Returns:
+        bool: Sonuç yeniden kullanılabiliyorsa True.
+    """
+    test_results = result.get("test_results") or {}
+    if not test_results or result.get("error_details"):
+        return False
+    return not any(test.get("status") in UNCACHEABLE_TEST_STATUSES for test in test_results.values())
+
+
+def get_cached_evaluation(cache_key, question_id=None, test_count=None):
+    """
+    Önbellekteki değerlendirme sonucunu döndürür. Bellekte yoksa ve kalıcı önbellek açıksa
+    aynı code_hash ile kaydedilmiş son Submission'dan sonucu yeniden oluşturur.
+
+    Args:
+        cache_key (str): evaluation_cache_key ile hesaplanan özet.
+        question_id (Optional[int]): Soru ID değeri; kalıcı arama yalnızca soru için yapılır.
+        test_count (Optional[int]): Planın test sayısı (performans testi dahil). Verilirse
+            kayıttan oluşturulan sonuçta çalıştırılmayan testler skipped_tests olarak sayılır.
+
+    Returns:
+        Optional[dict]: Değerlendirme sonucunun bir kopyası veya None.
+    """
+    cached = evaluation_result_cache.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    if not (Config.EVALUATION_RESULT_CACHE_PERSIST and question_id):
+        return None
+
+    db = SessionLocal()
+    try:
+        row = db.execute(text("""
+                              SELECT is_correct, test_results, execution_time, cpu_time, peak_memory, error_message
+                              FROM submission
+                              WHERE question_id = :question_id
+                                AND code_hash = :code_hash
+                              ORDER BY id DESC
+                              LIMIT 1
+                              """), {"question_id": question_id, "code_hash": cache_key}).first()
+        if not row:
+            return None
+
+        test_results = json.loads(row.test_results or "{}")
+        errors = json.loads(row.error_message or "[]")
+        if not isinstance(test_results, dict) or not isinstance(errors, list):
+            return None
+    except Exception as e:
+        print(f"Kayıtlı değerlendirme sonucu okunamadı: {str(e)}")
+        return None
+    finally:
+        db.close()
+
+    passed = sum(1 for test in test_results.values() if test.get("passed"))
+    if test_count is None:
+        test_count = len(test_results)
+    result = _empty_evaluation_result()
+    result.update({
+        "is_correct": bool(row.is_correct),
+        "execution_time": row.execution_time or 0,
+        "cpu_time": row.cpu_time or 0,
+        "peak_memory": row.peak_memory,
+        "test_count": test_count,
+        "test_results": test_results,
+        "errors": errors,
+        "passed_tests": passed,
+        "failed_tests": len(test_results) - passed,
+        "skipped_tests": max(0, test_count - len(test_results))
+    })
+    # Bu kontrol öncesinde yazılmış, önbelleğe alınmaması gereken kayıtlar yeniden kullanılmaz
+    if not is_cacheable_evaluation(result):
+        return None
+    evaluation_result_cache.set(cache_key, copy.deepcopy(result))
+    return result
+
+
+def evaluate_batch(request):
+    """
+    Birden fazla kodu aynı soruya karşı, ortak test planını paylaşarak sandbox
+    havuzundaki işçilere dağıtır ve sonuçları tamamlandıkça üretir.
+
+    Args:
+        request (BatchEvaluationRequest): Toplu değerlendirme isteği.
+
+    Yields:
+        dict: 'index', 'id' ve EvaluationResult alanlarını içeren sonuç.
+    """
+    try:
+        plan = get_test_plan(request)
+    except json.JSONDecodeError:
+        for index, item in enumerate(request.submissions):
+            result = _empty_evaluation_result()
+            result["errors"].append("Test girdileri geçerli JSON formatında değil")
+            yield dict(result, index=index, id=item.id)
+        return
+
+    # Her işçi için bir iş parçacığı yeterli; fazlası havuz kuyruğunda bekler
+    with ThreadPoolExecutor(max_workers=get_sandbox_pool().size) as executor:
+        futures = {
+            executor.submit(evaluate_with_plan, item.code, request, plan, False): (index, item)
+            for index, item in enumerate(request.submissions)
+        }
+        for future in as_completed(futures):
+            index, item = futures[future]
+            yield dict(future.result(), index=index, id=item.id)
+
+
+@api.post("/api/evaluate/batch")
+def evaluate_solution_batch(request: BatchEvaluationRequest):
+    """
+    Bir soruya ait birden fazla kodu değerlendirir ve her gönderimin sonucunu
+    tamamlandığı anda NDJSON satırı olarak akıtır.
+    """
+    def generate():
+        for result in evaluate_batch(request):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+def build_test_plan(request):
+    """
+    Değerlendirme isteği için test planını oluşturur: test girdilerini ayrıştırır, çözüm
+    koduna seed enjekte eder, kodu derler ve varsa önbellekteki beklenen çıktıları yükler.
+
+    Args:
+        request (EvaluationRequest): Değerlendirme isteği.
+
+    Returns:
+        CompiledTestPlan: Oluşturulan plan.
+
+    Raises:
+        json.JSONDecodeError: Test girdileri geçerli JSON değilse.
+    """
+    test_inputs = json.loads(request.test_inputs)
+    solution_code = inject_random_seed(request.solution_code, request.function_name)
+
+    # Derlenemeyen çözüm kodu işçide exec edilir, böylece hata mesajı değişmez
+    try:
+        solution_bytecode = marshal.dumps(compile(solution_code, "<string>", "exec"))
+    except (SyntaxError, ValueError):
+        solution_bytecode = None
+
+    expected_outputs = None
+    if request.question_id:
+        expected_outputs = load_expected_outputs(request.question_id, request.solution_code,
+                                                 request.test_inputs)
+
+    return CompiledTestPlan(
+        question_id=request.question_id,
+        version=request.question_version,
+        content_hash=plan_content_hash(request),
+        test_inputs=test_inputs,
+        solution_code=solution_code,
+        solution_bytecode=solution_bytecode,
+        expected_outputs=expected_outputs,
+        benchmark=build_benchmark_settings(request)
+    )
+
+
+def build_benchmark_settings(request):
+    """
+    Performans sorusu için sandbox işçisine gönderilecek ölçüm ayarlarını hazırlar.
+
+    Args:
+        request (EvaluationRequest | BatchEvaluationRequest): Soru bilgilerini taşıyan istek.
+
+    Returns:
+        Optional[dict]: run_benchmark ayarları; soru bir boyut üreteci tanımlamıyorsa None.
+        benchmark_sizes ayrıştırılamazsa Config.EVALUATOR_BENCHMARK_SIZES kullanılır.
+    """
+    if not (request.size_generator or '').strip():
+        return None
+
+    sizes = Config.EVALUATOR_BENCHMARK_SIZES
+    if (request.benchmark_sizes or '').strip():
+        try:
+            sizes = parse_benchmark_sizes(request.benchmark_sizes)
+        except ValueError as e:
+            # Doğrulamadan önce kaydedilmiş hatalı değerler değerlendirmeyi bozmaz
+            print(f"Geçersiz girdi boyutları, varsayılanlar kullanılıyor: {str(e)}")
+
+    return {
+        "size_generator": request.size_generator,
+        "sizes": sizes,
+        "tolerance": request.time_tolerance or Config.EVALUATOR_BENCHMARK_TOLERANCE,
+        "growth_tolerance": Config.EVALUATOR_GROWTH_TOLERANCE,
+        "repeats": Config.EVALUATOR_BENCHMARK_REPEATS
+    }
+
+
+def get_test_plan(request):
+    """
+    Soru ID ve sürümü verilmişse test planını önbellekten döndürür, yoksa oluşturup saklar.
+
+    Args:
+        request (EvaluationRequest): Değerlendirme isteği.
+
+    Returns:
+        CompiledTestPlan: Kullanılacak plan.
+    """
+    if not (request.question_id and request.question_version):
+        return build_test_plan(request)
+
+    cache = get_test_plan_cache()
+    plan = cache.get(request.question_id, request.question_version)
+    if plan is not None and plan.matches(plan_content_hash(request)):
+        return plan
+
+    plan = build_test_plan(request)
+    cache.put(plan)
+    return plan
+
+
+def load_expected_outputs(question_id, solution_code, test_inputs):
+    """Sorunun önbellekteki beklenen çıktılarını okur; hata durumunda None döner."""
+    db = SessionLocal()
+    try:
+        return get_expected_outputs(db, question_id, solution_code, test_inputs)
+    except Exception as e:
+        print(f"Beklenen çıktı önbelleği okunamadı: {str(e)}")
+        return None
+    finally:
+        db.close()
+
+
+def save_expected_outputs(question_id, solution_code, test_inputs, outputs, db=None):
+    """Beklenen çıktıları önbelleğe yazar; önbellek hatası değerlendirmeyi etkilemez."""
+    session = db or SessionLocal()
+    try:
+        store_expected_outputs(session, question_id, solution_code, test_inputs, outputs)
+    except Exception as e:
+        session.rollback()
+        print(f"Beklenen çıktı önbelleği yazılamadı: {str(e)}")
+    finally:
+        if db is None:
+            session.close()
+
+
+def refresh_expected_outputs(question_id, function_name, solution_code, test_inputs, db=None):
+    """
+    Sorunun referans çözümünü sandbox'ta çalıştırıp beklenen çıktı önbelleğini yeniler.
+
+    Soru kaydedildiğinde (/api/save-question ve admin düzenleme sayfaları) çağrılır.
+
+    Args:
+        question_id (int): Soru ID değeri.
+        function_name (str): Çözüm fonksiyonunun adı.
+        solution_code (str): Referans çözüm kodu.
+        test_inputs (str): JSON formatındaki test girdileri.
+        db: İsteğe bağlı SQLAlchemy oturumu. Verilmezse yeni bir oturum açılır.
+
+    Returns:
+        bool: Önbellek güncellendiyse True.
+    """
+    try:
+        parsed_inputs = json.loads(test_inputs or "[]")
+    except json.JSONDecodeError:
+        return False
+
+    try:
+        response = get_sandbox_pool().run({
+            "task": "expected_outputs",
+            "solution_code": inject_random_seed(solution_code, function_name),
+            "function_name": function_name,
+            "test_inputs": parsed_inputs
+        })
+    except Exception as e:
+        print(f"Beklenen çıktılar hesaplanamadı (soru {question_id}): {str(e)}")
+        return False
+
+    if not response.get("ok") or response["result"].get("expected_outputs") is None:
+        print(f"Beklenen çıktılar hesaplanamadı (soru {question_id}): "
+              f"{response.get('error') or response.get('result', {}).get('errors')}")
+        return False
+
+    save_expected_outputs(question_id, solution_code, test_inputs, response["result"]["expected_outputs"], db=db)
+    return True
+
+
 def inject_random_seed(code, function_name):
     """Random modülü kullanıldığında seed ekler"""
     if not code:
@@ -774,91 +1394,27 @@ def inject_random_seed(code, function_name):
     return code
 
 
-def run_tests(user_function, solution_function, test_inputs):
-    """Test girişlerine göre fonksiyonu çalıştırır ve sonuçları değerlendirir"""
-    all_correct = True
-    passed_tests = 0
-    failed_tests = 0
-    test_results = {}
-    error_messages = []
-
-    for i, test_input in enumerate(test_inputs):
-        # Test girişlerinin liste olduğundan emin ol
-        if not isinstance(test_input, list):
-            test_input = [test_input]
-
-        test_key = f"test_{i + 1}"
-        test_results[test_key] = {"input": test_input, "passed": False}
-
-        try:
-            # Her iki fonksiyonu da aynı girdilerle çalıştır
-            user_result = user_function(*test_input)
-            expected_result = solution_function(*test_input)
-
-            # Sonuçları karşılaştır
-            if user_result != expected_result:
-                all_correct = False
-                failed_tests += 1
-                test_results[test_key]["passed"] = False
-                test_results[test_key]["expected"] = expected_result
-                test_results[test_key]["actual"] = user_result
-                error_messages.append(
-                    f"Test başarısız: Girdi: {test_input}, Beklenen: {expected_result}, Alınan: {user_result}")
-            else:
-                passed_tests += 1
-                test_results[test_key]["passed"] = True
-
-        except TypeError as e:
-            error_msg = str(e)
-            failed_tests += 1
-            test_results[test_key]["passed"] = False
-            test_results[test_key]["error"] = error_msg
-
-            if "'builtin_function_or_method' object is not subscriptable" in error_msg:
-                # Hata konumunu bul
-                import traceback
-                tb = traceback.extract_tb(e.__traceback__)
-                line_number = None
-
-                for frame in tb:
-                    if frame.filename == "<string>":
-                        line_number = frame.lineno
-                        break
-
-                line_info = f"Satır {line_number}: " if line_number else ""
-                error_messages.append(
-                    f"{line_info}Yerleşik fonksiyon/metot indeks notasyonu ile kullanılamaz. "
-                    "Örnek: 'max[0]' yerine 'max(liste)' kullanmalısınız."
-                )
-            else:
-                error_messages.append(f"Tip hatası: {error_msg}")
-            all_correct = False
-
-        except Exception as e:
-            failed_tests += 1
-            test_results[test_key]["passed"] = False
-            test_results[test_key]["error"] = str(e)
-            error_messages.append(f"Çalışma zamanı hatası: {str(e)}")
-            all_correct = False
-
-    return test_results, passed_tests, failed_tests, all_correct, error_messages
-
-
 @api.post("/api/notebook-summary", response_model=NotebookSummaryResponse)
 def get_notebook_summary(request: NotebookSummaryRequest, force_update: bool = False, db=Depends(get_db)):
-    """Notebook için özet oluşturur veya var olan özeti döndürür"""
+    """
+    Notebook için özet oluşturur veya var olan özeti döndürür.
+
+    Özet, üretildiği notebook içeriğinin özetiyle (content_hash) saklanır. Notebook değişmediyse
+    kayıtlı özet döndürülür; değiştiyse yalnızca girdisi değişen bölümler (genel özet, kod hücresi
+    grupları, teknik analiz) yeniden üretilir. force_update tüm bölümleri yeniden üretir.
+    """
     try:
         # Veritabanında özet var mı kontrol et
         summary_query = text("""
-                             SELECT notebook_path, summary, code_explanation, last_updated
+                             SELECT notebook_path, summary, code_explanation, last_updated, content_hash, code_sections
                              FROM notebook_summary
                              WHERE notebook_path = :path
                              """)
 
         existing = db.execute(summary_query, {"path": request.notebook_path}).first()
+        has_summary = bool(existing and existing.summary and len(existing.summary.strip()) > 10)
 
-        # Force update parametresi ile zorla güncelleme imkanı, boş özet kontrolü eklendi
-        if not force_update and existing and existing.summary and len(existing.summary.strip()) > 10:
+        def existing_response():
             return {
                 "summary": existing.summary,
                 "code_explanation": existing.code_explanation,
@@ -866,6 +1422,39 @@ def get_notebook_summary(request: NotebookSummaryRequest, force_update: bool = F
                 "error": None
             }
 
+        # Notebook dosyasının tam yolunu oluştur
+        repo_dir = os.path.join(os.getcwd(), 'notebooks_repo')
+        notebook_file_path = os.path.normpath(os.path.join(repo_dir, request.notebook_path))
+
+        if not notebook_file_path.startswith(repo_dir) or not os.path.exists(notebook_file_path):
+            if has_summary and not force_update:
+                return existing_response()
+            raise HTTPException(status_code=404, detail=f"Notebook bulunamadı: {request.notebook_path}")
+
+        # Ayrıştırılmış notebook'u paylaşılan önbellekten al
+        nb, _ = load_notebook(repo_dir, os.path.relpath(notebook_file_path, repo_dir))
+        notebook_hash = notebook_content_hash(nb.cells)
+
+        # Notebook değişmediyse kayıtlı özet döndürülür
+        if not force_update and has_summary:
+            if existing.content_hash is None:
+                # İçerik özeti eklenmeden önce üretilmiş özetler mevcut içeriğe ait kabul edilir
+                db.execute(text("UPDATE notebook_summary SET content_hash = :hash WHERE notebook_path = :path"),
+                           {"hash": notebook_hash, "path": request.notebook_path})
+                db.commit()
+                return existing_response()
+            if existing.content_hash == notebook_hash:
+                return existing_response()
+
+        # Önceki üretimden yeniden kullanılabilecek bölümler (girdi özeti -> açıklama)
+        previous_sections = {}
+        if not force_update and existing and existing.code_sections:
+            try:
+                previous_sections = json.loads(existing.code_sections)
+            except ValueError:
+                previous_sections = {}
+        previous_groups = dict(previous_sections.get('groups') or [])
+
         # Ayarları veritabanından al
         settings = {}
         settings_query = text("SELECT `key`, `value` FROM settings WHERE `key` LIKE 'ai_%'")
@@ -886,20 +1475,6 @@ def get_notebook_summary(request: NotebookSummaryRequest, force_update: bool = F
             return {"summary": "", "code_explanation": "", "last_updated": datetime.utcnow().isoformat(),
                     "error": "API anahtarı bulunamadı."}
 
-        # Notebook dosyasının tam yolunu oluştur
-        repo_dir = os.path.join(os.getcwd(), 'notebooks_repo')
-        notebook_file_path = os.path.join(repo_dir, request.notebook_path)
-
-        if not os.path.exists(notebook_file_path):
-            raise HTTPException(status_code=404, detail=f"Notebook bulunamadı: {request.notebook_path}")
-
-        # Notebook içeriğini oku
-        with open(notebook_file_path, 'r', encoding='utf-8') as f:
-            notebook_content = f.read()
-
-        # Jupyter notebook formatını parse et
-        nb = nbformat.reads(notebook_content, as_version=4)
-
         # Metin içeriğini çıkart
         text_content = ""
         code_cells = []
@@ -916,24 +1491,13 @@ def get_notebook_summary(request: NotebookSummaryRequest, force_update: bool = F
                 cell_number += 1
 
         # AI istemcisini oluştur
-        client = AIClient(api_provider, api_key, model_name)
-
-        # API bağlantı testi - sağlamlık kontrolü
-        test_response = client.chat_completion(
-            messages=[
-                {"role": "system", "content": "Kısa bir test mesajı"},
-                {"role": "user", "content": "Çalışıyor musun?"}
-            ],
-            max_tokens=100
-        )
-
-        if "error" in test_response:
-            return {"summary": "", "code_explanation": "", "last_updated": datetime.utcnow().isoformat(),
-                    "error": f"AI servisi bağlantı hatası: {test_response.get('error')}"}
+        client = get_ai_client(api_provider, api_key, model_name)
 
-        if not test_response.get("content"):
+        # Ayrı bir bağlantı testi yerine önceki gerçek çağrıların sonuçlarına bakılır
+        available, last_error = get_ai_health_monitor().available(client.health_key)
+        if not available:
             return {"summary": "", "code_explanation": "", "last_updated": datetime.utcnow().isoformat(),
-                    "error": "AI servisi boş yanıt döndürdü. API anahtarınızı kontrol ediniz."}
+                    "error": f"AI servisi bağlantı hatası: {last_error}"}
 
         # Yardımcı fonksiyonlar
         def generate_unique_id():
@@ -942,6 +1506,9 @@ def get_notebook_summary(request: NotebookSummaryRequest, force_update: bool = F
             unique_hash = hashlib.md5(f"{timestamp}-{random_data}".encode()).hexdigest()[:12]
             return unique_hash
 
+        def section_hash(value):
+            return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
         def sanitize_text(text, max_length=50000):
             if not text:
                 return ""
@@ -996,8 +1563,10 @@ KESİN KISITLAMALAR: Kesinlikle önceki analizlere atıfta bulunma, Özür dilem
         }
 
         # Summary elde etme ve hata kontrolü
+        # Özetin girdisi (markdown ve kod örnekleri) değişmediyse kayıtlı özet kullanılır
+        summary_hash = section_hash(f"{text_content}\0{code_sample}")
         retry_count = 2
-        summary_text = ""
+        summary_text = existing.summary if has_summary and previous_sections.get('summary') == summary_hash else ""
         while retry_count >= 0 and not summary_text:
             summary_response = client.chat_completion(
                 messages=[
@@ -1032,14 +1601,18 @@ KESİN KISITLAMALAR: Kesinlikle önceki analizlere atıfta bulunma, Özür dilem
                 break  # Başarılı özet elde edildi
 
         # 2. Hücreleri gruplar halinde analiz et
-        code_explanations = []
         group_size = 10
 
-        for i in range(0, len(numbered_code_cells), group_size):
+        def explain_group(i):
             group_end = min(i + group_size, len(numbered_code_cells))
             group_cells = numbered_code_cells[i:group_end]
             group_content = "\n".join(group_cells)
 
+            # Hücreleri ve numaraları değişmeyen grubun kayıtlı açıklaması kullanılır
+            group_hash = section_hash(group_content)
+            if group_hash in previous_groups:
+                return group_hash, previous_groups[group_hash]
+
             group_id = generate_unique_id()
             group_timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
             group_start = i + 1
@@ -1084,7 +1657,8 @@ KESİN KISITLAMALAR: Kesinlikle önceki analizlere atıfta bulunma, Özür dilem
             )
 
             if "error" not in group_response:
-                code_explanations.append(group_response.get("content", ""))
+                return group_hash, group_response.get("content", "")
+            return group_hash, None
 
         # 3. Kullanılan tekniklerin özeti için ek istek
         techniques_id = generate_unique_id()
@@ -1092,6 +1666,8 @@ KESİN KISITLAMALAR: Kesinlikle önceki analizlere atıfta bulunma, Özür dilem
 
         # Teknik analiz için daha fazla kod örneği kullan
         code_sample_for_techniques = sanitize_text(' '.join(code_cells[:min(10, len(code_cells))]), 5000)
+        techniques_hash = section_hash(code_sample_for_techniques)
+        previous_techniques = previous_sections.get('techniques') or [None, None]
 
         techniques_prompt = f"""YENİ TEKNİK ANALİZİ TALEBİ
 ID: {techniques_id}
@@ -1142,13 +1718,39 @@ KESİN KISITLAMALAR: Kesinlikle önceki analizlere atıfta bulunma, Özür dilem
             "content": f"Sen bir teknik programlama analisti olarak görev yapıyorsun. Bu talep ({techniques_id}) ŞU AN ({techniques_timestamp}) yapılan YENİ bir istektir. Tüm kodun teknik özelliklerini kapsamlı analiz et."
         }
 
-        techniques_response = client.chat_completion(
-            messages=[
-                techniques_system,
-                {"role": "user", "content": techniques_prompt}
-            ],
-            max_tokens=max_tokens
-        )
+        # Grup açıklamaları ve teknik analiz birbirinden bağımsızdır; eşzamanlı istenir ve
+        # sonuçlar hücre sırasına göre birleştirilir. Sağlayıcıya giden eşzamanlı istek sayısını
+        # AIClient sınırlar, böylece süre grupların toplamı yerine en yavaş gruba bağlı kalır.
+        group_starts = list(range(0, len(numbered_code_cells), group_size))
+        workers = max(1, min(len(group_starts) + 1, Config.AI_PROVIDER_CONCURRENCY))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='notebook-summary') as executor:
+            group_futures = [executor.submit(explain_group, i) for i in group_starts]
+            if previous_techniques[0] == techniques_hash:
+                techniques_future = None
+                techniques_response = {"content": previous_techniques[1]}
+            else:
+                techniques_future = executor.submit(
+                    client.chat_completion,
+                    messages=[
+                        techniques_system,
+                        {"role": "user", "content": techniques_prompt}
+                    ],
+                    max_tokens=max_tokens
+                )
+            group_results = [future.result() for future in group_futures]
+            if techniques_future:
+                techniques_response = techniques_future.result()
+
+        code_explanations = [explanation for _, explanation in group_results if explanation is not None]
+
+        # Başarılı bölümler girdi özetleriyle saklanır; başarısız olanlar bir sonraki üretimde yeniden istenir
+        code_sections = {
+            "summary": summary_hash,
+            "groups": [[group_hash, explanation] for group_hash, explanation in group_results
+                       if explanation is not None],
+            "techniques": ([techniques_hash, techniques_response.get("content")]
+                           if "error" not in techniques_response and techniques_response.get("content") else None)
+        }
 
         # Tüm analizleri birleştir
         try:
@@ -1176,7 +1778,9 @@ KESİN KISITLAMALAR: Kesinlikle önceki analizlere atıfta bulunma, Özür dilem
                                 UPDATE notebook_summary
                                 SET summary          = :summary,
                                     code_explanation = :code_explanation,
-                                    last_updated     = :last_updated
+                                    last_updated     = :last_updated,
+                                    content_hash     = :content_hash,
+                                    code_sections    = :code_sections
                                 WHERE notebook_path = :path
                                 """)
 
@@ -1184,22 +1788,28 @@ KESİN KISITLAMALAR: Kesinlikle önceki analizlere atıfta bulunma, Özür dilem
                 "summary": summary_text,
                 "code_explanation": code_explanation_combined,
                 "last_updated": last_updated,
+                "content_hash": notebook_hash,
+                "code_sections": json.dumps(code_sections, ensure_ascii=False),
                 "path": request.notebook_path
             })
         else:
             insert_query = text("""
-                                INSERT INTO notebook_summary (notebook_path, summary, code_explanation, last_updated)
-                                VALUES (:path, :summary, :code_explanation, :last_updated)
+                                INSERT INTO notebook_summary (notebook_path, summary, code_explanation, last_updated,
+                                                              content_hash, code_sections)
+                                VALUES (:path, :summary, :code_explanation, :last_updated, :content_hash, :code_sections)
                                 """)
 
             db.execute(insert_query, {
                 "path": request.notebook_path,
                 "summary": summary_text,
                 "code_explanation": code_explanation_combined,
-                "last_updated": last_updated
+                "last_updated": last_updated,
+                "content_hash": notebook_hash,
+                "code_sections": json.dumps(code_sections, ensure_ascii=False)
             })
 
         db.commit()
+        get_search_index().update_summary(request.notebook_path, summary_text, code_explanation_combined)
 
         return {
             "summary": summary_text,
@@ -1218,6 +1828,38 @@ KESİN KISITLAMALAR: Kesinlikle önceki analizlere atıfta bulunma, Özür dilem
             "error": f"Notebook özeti oluşturulurken hata: {str(e)}"
         }
 
+@api.get("/api/search")
+def search_notebooks(q: str, limit: int = 20, db=Depends(get_db)):
+    """
+    Notebook içerikleri ve özetleri üzerinde tam metin arama yapar. Arama bellek içi
+    indekste yapılır; indeks ilk istekte oluşturulur ve depo eşitlemelerinden sonra
+    yalnızca değişen notebook'lar için güncellenir.
+
+    Args:
+        q (str): Arama metni.
+        limit (int): Döndürülecek en fazla sonuç sayısı (1-100).
+        db: Veritabanı bağlantısı için bağımlılık fonksiyonu.
+
+    Returns:
+        dict: 'query', 'results' ve 'took_ms' anahtarları. Her sonuç 'notebook_path',
+        'title', 'score', 'matched_in' ve 'snippet' içerir.
+
+    Raises:
+        HTTPException: Geçersiz limit için 400 döner.
+    """
+    if not 1 <= limit <= 100:
+        raise HTTPException(status_code=400, detail="limit 1 ile 100 arasında olmalıdır")
+
+    started = time.perf_counter()
+    index = get_search_index()
+    index.ensure_built(db)
+    results = index.search(q, limit=limit)
+    return {
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
 @api.get("/api/last-questions-detail", response_model=List[DetailedQuestion])
 def get_last_questions_detail(limit: Optional[int] = 5, db=Depends(get_db)):
     """
@@ -1326,15 +1968,22 @@ def get_leaderboard_api(limit: int = 20, db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @api.get("/api/last-submissions", response_model=List[SubmissionDetail])
-def get_last_submissions(limit: Optional[int] = 10, db=Depends(get_db)):
+def get_last_submissions(limit: Optional[int] = 10, question_id: Optional[int] = None,
+                         order_by: str = "recent", db=Depends(get_db)):
     """
     API'ye yapılan son gönderimlerin bir listesini döndürür. Gönderimler, kullanıcı bilgileri,
     soru başlığı ve diğer detaylarla birlikte en son tarihe göre sıralanmıştır ve belirtilen
     limit kadar alınır. SQL sorgusu doğrudan veritabanında yürütülür ve veriler yapısal bir
     liste olarak geri döndürülür.
 
+    order_by="performance" verildiğinde yalnızca doğru çözümler, kullanıcı kodunun CPU
+    süresine (eşitlikte duvar saati süresi ve tepe belleğe) göre en hızlıdan yavaşa sıralanır.
+    Süreler farklı sorular arasında karşılaştırılamadığından bu sıralama question_id ister.
+
     Args:
         limit (Optional[int], default=10): Döndürülmesi istenen en fazla gönderim sayısını belirler.
+        question_id (Optional[int]): Verilirse yalnızca bu sorunun gönderimleri döndürülür.
+        order_by (str): "recent" (varsayılan) veya "performance".
         db: Veritabanı bağlantısı için bağımlılık fonksiyonu.
 
     Returns:
@@ -1342,20 +1991,41 @@ def get_last_submissions(limit: Optional[int] = 10, db=Depends(get_db)):
 
     Raises:
         HTTPException: Sunucu kaynaklı bir hata meydana geldiğinde, ayrıntılı hata mesajıyla birlikte
-        500 durumu döner.
+        500 durumu döner. Geçersiz order_by değeri veya question_id olmadan performans
+        sıralaması istendiğinde 400 döner.
     """
+    if order_by not in ("recent", "performance"):
+        raise HTTPException(status_code=400, detail="order_by 'recent' veya 'performance' olmalıdır")
+    if order_by == "performance" and question_id is None:
+        raise HTTPException(status_code=400, detail="Performans sıralaması için question_id gereklidir")
+
     try:
-        sql_query = text("""
+        conditions = []
+        params = {"limit": limit}
+        if question_id is not None:
+            conditions.append("s.question_id = :question_id")
+            params["question_id"] = question_id
+
+        if order_by == "performance":
+            # Ölçüm sütunları olmayan eski gönderimler sıralamaya alınmaz
+            conditions.append("s.is_correct = 1 AND s.cpu_time IS NOT NULL")
+            order_clause = "s.cpu_time ASC, s.execution_time ASC, s.peak_memory ASC"
+        else:
+            order_clause = "s.created_at DESC"
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql_query = text(f"""
             SELECT s.id, s.user_id, u.username, s.question_id, q.title as question_title, 
-                   s.is_correct, s.execution_time, s.created_at
+                   s.is_correct, s.execution_time, s.cpu_time, s.peak_memory, s.created_at
             FROM submission s
             JOIN user u ON s.user_id = u.id
             JOIN programming_question q ON s.question_id = q.id
-            ORDER BY s.created_at DESC
+            {where_clause}
+            ORDER BY {order_clause}
             LIMIT :limit
         """)
 
-        result = db.execute(sql_query, {"limit": limit})
+        result = db.execute(sql_query, params)
 
         submissions = []
         for row in result:
@@ -1367,6 +2037,8 @@ def get_last_submissions(limit: Optional[int] = 10, db=Depends(get_db)):
                 "question_title": row.question_title,
                 "is_correct": row.is_correct,
                 "execution_time": row.execution_time,
+                "cpu_time": row.cpu_time,
+                "peak_memory": row.peak_memory,
                 "created_at": row.created_at.strftime('%Y-%m-%d %H:%M:%S')
             })
 
@@ -1897,7 +2569,7 @@ Yanıtını JSON formatında oluştur:
 }}"""
 
         # AI client oluştur ve soru iste
-        client = AIClient(api_provider, api_key, model_name)
+        client = get_ai_client(api_provider, api_key, model_name)
         response = client.chat_completion([
             {"role": "system", "content": "Sen bir Python programlama eğitmenisin ve öğrencilere programlama soruları hazırlıyorsun. SADECE JSON formatında yanıt ver, başka hiçbir açıklama veya metin ekleme. Cevabın geçerli bir JSON nesnesi olmalı."},
             {"role": "user", "content": prompt}
@@ -2192,6 +2864,9 @@ def save_question(question: ProgrammingQuestionCreate, db=Depends(get_db)):
                                     example_output = :example_output,
                                     test_inputs    = :test_inputs,
                                     solution_code  = :solution_code,
+                                    size_generator = COALESCE(:size_generator, size_generator),
+                                    benchmark_sizes = COALESCE(:benchmark_sizes, benchmark_sizes),
+                                    time_tolerance = COALESCE(:time_tolerance, time_tolerance),
                                     updated_at     = NOW()
                                 WHERE id = :id
                                 """)
@@ -2207,7 +2882,10 @@ def save_question(question: ProgrammingQuestionCreate, db=Depends(get_db)):
                 "example_input": question.example_input,
                 "example_output": question.example_output,
                 "test_inputs": question.test_inputs,
-                "solution_code": question.solution_code
+                "solution_code": question.solution_code,
+                "size_generator": question.size_generator,
+                "benchmark_sizes": question.benchmark_sizes,
+                "time_tolerance": question.time_tolerance
             })
 
             question_id = question.id
@@ -2224,9 +2902,11 @@ def save_question(question: ProgrammingQuestionCreate, db=Depends(get_db)):
                                 INSERT INTO programming_question (id, title, description, function_name, difficulty,
                                                                   points, topic,
                                                                   example_input, example_output, test_inputs,
-                                                                  solution_code, created_at, updated_at)
+                                                                  solution_code, size_generator, benchmark_sizes,
+                                                                  time_tolerance, created_at, updated_at)
                                 VALUES (:id, :title, :description, :function_name, :difficulty, :points, :topic,
-                                        :example_input, :example_output, :test_inputs, :solution_code, NOW(), NOW())
+                                        :example_input, :example_output, :test_inputs, :solution_code,
+                                        :size_generator, :benchmark_sizes, :time_tolerance, NOW(), NOW())
                                 """)
 
             db.execute(insert_query, {
@@ -2240,13 +2920,21 @@ def save_question(question: ProgrammingQuestionCreate, db=Depends(get_db)):
                 "example_input": question.example_input,
                 "example_output": question.example_output,
                 "test_inputs": question.test_inputs,
-                "solution_code": question.solution_code
+                "solution_code": question.solution_code,
+                "size_generator": question.size_generator,
+                "benchmark_sizes": question.benchmark_sizes,
+                "time_tolerance": question.time_tolerance
             })
 
             question_id = new_id
             message = "Yeni soru başarıyla eklendi"
 
         db.commit()
+        get_test_plan_cache().invalidate(question_id)
+
+        # Referans çözüm çıktılarını değerlendirmelerde kullanılmak üzere önceden hesapla
+        refresh_expected_outputs(question_id, question.function_name, question.solution_code,
+                                 question.test_inputs, db=db)
         return {"success": True, "message": message, "id": question_id}
 
     except Exception as e:
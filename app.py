@@ -111,6 +111,22 @@ def create_app():
     # Rotaları kaydet
     register_routes(app, socketio)
 
+    # Notebook kataloğunu her depo eşitlemesinden sonra yenile
+    from app.services.notebook_catalog import register_catalog_refresh
+    register_catalog_refresh(app, db)
+
+    # Katalog yenilendikten sonra değişen notebook'ların HTML'ini önceden üret
+    from app.services.notebook_renderer import register_render_warmup
+    register_render_warmup()
+
+    # Arama indeksini değişen notebook'lar için güncelle
+    from app.services.search_index import register_search_refresh
+    register_search_refresh(app, db)
+
+    # Eşitlemeden sonra içeriği değişen notebook'ların özetlerini yenile
+    from app.services.summary_backfill import register_summary_refresh
+    register_summary_refresh(app, db)
+
     # Hata sayfaları
     @app.errorhandler(403)
     def forbidden(error):
@@ -167,6 +183,9 @@ def init_db(app):
     with app.app_context():
         from app.models.notebook_summary import NotebookSummary
         from app.models.programming_question import ProgrammingQuestion
+        from app.models.expected_output import ExpectedOutput
+        from app.models.notebook_catalog import NotebookCatalogEntry
+        from app.models.summary_backfill import SummaryBackfillItem
         from app.models.submission import Submission
         from app.models.badges import Badges
         from app.models.badge_criteria import BadgeCriteria
@@ -177,6 +196,10 @@ def init_db(app):
         # Tabloları oluştur
         db.create_all()
 
+        # Mevcut tablolara sonradan eklenen sütunları ekle
+        from app.utils.schema import add_missing_columns
+        add_missing_columns(db, Submission, ProgrammingQuestion, NotebookSummary, NotebookCatalogEntry)
+
         # Rolleri başlat
         roles = {
             'student': 'Basic access to view notebooks',
@@ -226,84 +249,34 @@ _summaries_loaded = False
 
 def load_summaries_with_app_context(app):
     """
-    Uygulama bağlamında çalışarak bir dizin altındaki Jupyter Notebook dosyalarının özetlerini yükleyen ve bu özetleri
-    veritabanında mevcut olmayanlar için FastAPI üzerinden talep eden bir işlem süreci sağlar.
+    Uygulama bağlamında çalışarak depo kataloğundaki Jupyter Notebook dosyalarından özeti olmayanlar için
+    FastAPI üzerinden özet talep eder.
+
+    İstekler sabit bir bekleme yerine yapılandırılan dakika başına istek/token kotası ve eşzamanlılık
+    sınırı içinde gönderilir; başarısız istekler rastgele dağıtılmış üstel beklemeyle tekrarlanır.
+    İlerleme summary_backfill tablosunda tutulduğundan uygulama yeniden başladığında iş kaldığı
+    yerden devam eder.
 
     Args:
         app: Flask uygulama nesnesi. Uygulama bağlamının yönetilmesi ve loglama işlemleri için gereklidir.
-
-    Raises:
-        requests.RequestException: API isteği sırasında oluşabilecek bir iletişim hatasında.
-        Exception: Genel hatalar için, örneğin veritabanı veya dosya sistemi hataları gibi.
-
-    Functions:
-        - Dizindeki tüm notebook dosyalarını tarayarak bir liste oluşturur.
-        - Henüz özetlenmemiş notebooklar için FastAPI'ye POST talebi oluşturur.
-        - Özet alınabilen dosyaları loglar ve oran sınırlamaları için uyumlu bir bekleme süresi uygular.
     """
+    from app.services.notebook_catalog import get_notebook_catalog
+    from app.services.summary_backfill import get_summary_backfill
+
     with app.app_context():
         from flask import current_app
-        from app.models.notebook_summary import NotebookSummary
-        import requests
-        import os
-        import time
 
-        # Notebooks dizini yolu
-        notebooks_dir = os.path.join(os.getcwd(), 'notebooks_repo')
-        if not os.path.exists(notebooks_dir):
-            current_app.logger.error(f"Notebooks dizini bulunamadı: {notebooks_dir}")
+        # Notebook listesi depo kataloğundan okunur (dosya sistemi taranmaz)
+        catalog = get_notebook_catalog()
+        if not catalog.ensure_loaded(db.session):
+            current_app.logger.error(f"Notebooks dizini bulunamadı: {catalog.repo_dir}")
             return
+        entries = catalog.entries()
 
-        # Tüm notebook dosyalarını bul
-        notebook_files = []
-        for root, _, files in os.walk(notebooks_dir):
-            for file in files:
-                if file.endswith('.ipynb'):
-                    rel_path = os.path.relpath(os.path.join(root, file), notebooks_dir)
-                    notebook_files.append(rel_path)
-
-        current_app.logger.info(f"Toplam {len(notebook_files)} notebook bulundu, özetleri kontrol edilecek")
-
-        # FastAPI servisine istek gönder
-        try:
-            # Direkt FastAPI servisine bağlan
-            fastapi_url = Config.FASTAPI_DOMAIN+":"+Config.FASTAPI_PORT+"/api/notebook-summary"
-
-            for i, notebook_path in enumerate(notebook_files):
-                current_app.logger.info(f"[{i + 1}/{len(notebook_files)}] İşleniyor: {notebook_path}")
-
-                # Veritabanında özet var mı kontrol et
-                existing_summary = NotebookSummary.query.filter_by(notebook_path=notebook_path).first()
-                if existing_summary:
-                    current_app.logger.info(f"  Bu notebook için özet zaten mevcut, atlanıyor: {notebook_path}")
-                    continue
-
-                try:
-                    # FastAPI'ye notebook özet isteği gönder - POST metodunu kullanmalı
-                    response = requests.post(
-                        fastapi_url,
-                        json={"notebook_path": notebook_path},
-                        timeout=None  # Yeterli zaman tanı
-                    )
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get("error"):
-                            current_app.logger.warning(f"  Özet alınırken hata: {data.get('error')}")
-                        else:
-                            current_app.logger.info(f"  Özet başarıyla alındı: {len(data.get('summary', ''))} karakter")
-                    else:
-                        current_app.logger.error(f"  API hatası: {response.status_code} - {response.text}")
-
-                    # Rate limit için bekleme - AI hizmetleri için önemli
-                    if i < len(notebook_files) - 1:
-                        time.sleep(20)  # Her istek arasında 5 saniye bekle
-
-                except requests.RequestException as e:
-                    current_app.logger.error(f"  API isteği başarısız: {str(e)}")
-
-        except Exception as e:
-            current_app.logger.error(f"Notebook özetleri yüklenirken genel hata: {str(e)}")
+    try:
+        get_summary_backfill().run(app, db, entries)
+    except Exception as e:
+        app.logger.error(f"Notebook özetleri yüklenirken genel hata: {str(e)}")
 
 def generate_questions_on_startup(app):
     """
@@ -434,6 +407,14 @@ def run_web_server_and_background_tasks(app, socketio):
     commit_hash, commit_date = get_git_info()
     logger.info(f"Uygulama başlatılıyor - Commit: {commit_hash} ({commit_date})")
 
+    # Notebook deposunu arka planda eşitlemeye başla (ilk eşitleme hemen yapılır)
+    from app.services.repo_sync import get_repo_sync
+    get_repo_sync().start()
+
+    # Notebook kod çalıştırma çekirdeklerini ısıt
+    from app.services.kernel_pool import get_kernel_pool
+    get_kernel_pool().start()
+
     # 1. FastAPI'yi thread olarak başlat
     logger.info("FastAPI thread'i başlatılıyor...")
     fastapi_thread = threading.Thread(target=run_fastapi)
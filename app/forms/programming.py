@@ -1,7 +1,7 @@
 # app/forms/programming.py
 from flask_wtf import FlaskForm
-from wtforms import StringField, TextAreaField, IntegerField, SelectField, SubmitField
-from wtforms.validators import DataRequired, NumberRange, Length
+from wtforms import StringField, TextAreaField, IntegerField, FloatField, SelectField, SubmitField
+from wtforms.validators import DataRequired, NumberRange, Length, Optional, Regexp
 
 class ProgrammingQuestionForm(FlaskForm):
     """
@@ -25,6 +25,11 @@ class ProgrammingQuestionForm(FlaskForm):
         solution_code (TextAreaField): Sorunun çözüm kodunu içeren metin alanı.
         test_inputs (TextAreaField): Sorunun test girdilerini içeren metin alanı;
             belirtilen formatta veri girişi beklenir.
+        size_generator (TextAreaField): Performans soruları için `generate(n)` fonksiyonunu
+            tanımlayan isteğe bağlı kod alanı.
+        benchmark_sizes (StringField): Performans testinde kullanılacak, virgülle ayrılmış
+            girdi boyutları.
+        time_tolerance (FloatField): Referans çözüm süresinin kaç katına izin verileceği.
         submit (SubmitField): Formu kaydetmek için kullanılan düğme.
     """
     title = StringField('Soru Başlığı', validators=[DataRequired(), Length(max=255)])
@@ -56,6 +61,18 @@ class ProgrammingQuestionForm(FlaskForm):
     test_inputs = TextAreaField('Test Girdileri',
                              description='[[arg1, arg2,...], [arg1, arg2,...], ...] formatında 10 test girdisini girin',
                              validators=[DataRequired()])
+    size_generator = TextAreaField('Boyut Üreteci',
+                                   description='Performans sorusu için generate(n) fonksiyonu; n boyutlu '
+                                               'girdinin argüman listesini döndürmelidir',
+                                   validators=[Optional()])
+    benchmark_sizes = StringField('Girdi Boyutları',
+                                  description='Virgülle ayrılmış boyutlar, ör. 1000,2000,4000,8000',
+                                  validators=[Optional(), Length(max=255),
+                                              Regexp(r'^\s*\d+(\s*,\s*\d+)+\s*$',
+                                                     message='En az iki boyut virgülle ayrılarak girilmelidir')])
+    time_tolerance = FloatField('Süre Toleransı',
+                                description='Referans çözüm süresinin en fazla kaç katına izin verilir',
+                                validators=[Optional(), NumberRange(min=1)])
     submit = SubmitField('Kaydet')
 
 class SolutionSubmitForm(FlaskForm):
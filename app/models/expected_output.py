@@ -0,0 +1,35 @@
+# app/models/expected_output.py
+from datetime import datetime
+from .base import db
+
+class ExpectedOutput(db.Model):
+    """
+    Bir programlama sorusunun referans çözümünün test girdilerine verdiği çıktıları saklar.
+
+    Çıktılar yalnızca çözüm kodu veya test girdileri değiştiğinde yeniden hesaplanır;
+    değerlendirme sırasında referans çözüm yerine bu kayıt kullanılır.
+
+    Attributes:
+        id (int): Kayıt için benzersiz tanımlayıcı.
+        question_id (int): Çıktıların ait olduğu sorunun ID değeri.
+        content_hash (str): solution_code ve test_inputs üzerinden hesaplanan SHA-256 özeti.
+        outputs (str): Her test için beklenen değerin repr() metnini (veya hesaplanamadıysa
+            null) içeren JSON listesi.
+        created_at (datetime): Kaydın oluşturulma tarihi ve saati.
+    """
+    __table_args__ = (db.UniqueConstraint('question_id', 'content_hash', name='uq_expected_output_question_hash'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    question_id = db.Column(db.Integer, db.ForeignKey('programming_question.id'), nullable=False, index=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    outputs = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        """
+        ExpectedOutput nesnesini hata ayıklama ve günlük kaydı için metin olarak ifade eder.
+
+        Returns:
+            str: "<ExpectedOutput {question_id}:{content_hash}>" biçiminde bir metin.
+        """
+        return f'<ExpectedOutput {self.question_id}:{self.content_hash[:8]}>'
@@ -0,0 +1,51 @@
+# app/models/notebook_catalog.py
+from datetime import datetime
+from .base import db
+
+class NotebookCatalogEntry(db.Model):
+    """
+    Notebook deposundaki her .ipynb dosyası için önceden hesaplanmış katalog bilgisini saklar.
+
+    Katalog her depo eşitlemesinden sonra yeniden oluşturulur ve uygulama yeniden
+    başladığında dosya sistemi taranmadan bu tablodan yüklenir.
+
+    Attributes:
+        id (int): Kayıt için benzersiz tanımlayıcı.
+        notebook_path (str): Notebook'un depo köküne göre yolu.
+        title (str): İlk başlıktan veya dosya adından türetilen görünen ad.
+        size (int): Dosya boyutu (bayt).
+        mtime (float): Dosyanın son değiştirilme zamanı (Unix zaman damgası, çift duyarlıklı).
+        mtime_ns (Optional[int]): Dosyanın son değiştirilme zamanı (nanosaniye). Değişiklik
+            kontrolünde bu sütun kullanılır; kayan noktalı yuvarlamadan etkilenmez.
+        cell_count (int): Toplam hücre sayısı.
+        code_cell_count (int): Kod hücresi sayısı.
+        markdown_cell_count (int): Markdown hücresi sayısı.
+        first_heading (Optional[str]): İlk markdown başlığının metni.
+        blob_hash (str): Dosya içeriğinin git blob SHA-1 özeti.
+        content_hash (Optional[str]): Hücrelerin normalleştirilmiş içeriğinin SHA-256 özeti.
+        indexed_at (datetime): Kaydın son güncellenme zamanı.
+    """
+    __tablename__ = 'notebook_catalog'
+
+    id = db.Column(db.Integer, primary_key=True)
+    notebook_path = db.Column(db.String(255), unique=True, nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    size = db.Column(db.Integer, nullable=False, default=0)
+    mtime = db.Column(db.Float(precision=53), nullable=False, default=0)
+    mtime_ns = db.Column(db.BigInteger)
+    cell_count = db.Column(db.Integer, nullable=False, default=0)
+    code_cell_count = db.Column(db.Integer, nullable=False, default=0)
+    markdown_cell_count = db.Column(db.Integer, nullable=False, default=0)
+    first_heading = db.Column(db.String(255))
+    blob_hash = db.Column(db.String(40), nullable=False)
+    content_hash = db.Column(db.String(64))
+    indexed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        """
+        NotebookCatalogEntry nesnesini hata ayıklama ve günlük kaydı için metin olarak ifade eder.
+
+        Returns:
+            str: "<NotebookCatalogEntry {notebook_path}>" biçiminde bir metin.
+        """
+        return f'<NotebookCatalogEntry {self.notebook_path}>'
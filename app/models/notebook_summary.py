@@ -19,6 +19,10 @@ class NotebookSummary(db.Model):
         code_explanation (Optional[str]): Notebook'taki kodların açıklamaları. Null olabilir.
         last_updated (datetime): Kaydın son güncelleme zamanı. Varsayılan olarak mevcut zaman atanır.
         error (Optional[str]): Eğer varsa, notebook ile ilgili bir hata mesajı. Null olabilir.
+        content_hash (Optional[str]): Özetin üretildiği notebook içeriğinin (normalleştirilmiş
+            hücrelerin) SHA-256 özeti. Notebook değişmediyse özet yeniden üretilmez.
+        code_sections (Optional[str]): Özetin, her kod hücresi grubunun ve teknik analizin girdi
+            özetlerini ve açıklamalarını içeren JSON. Yalnızca değişen bölümler yeniden üretilir.
     """
     id = db.Column(db.Integer, primary_key=True)
     notebook_path = db.Column(db.String(255), unique=True, nullable=False)
@@ -26,6 +30,8 @@ class NotebookSummary(db.Model):
     code_explanation = db.Column(db.Text, nullable=True)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
     error = db.Column(db.Text, nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True)
+    code_sections = db.Column(db.Text, nullable=True)
 
     def __repr__(self):
         """
@@ -23,6 +23,11 @@ class ProgrammingQuestion(db.Model):
         function_name (str): Sorunun beklediği başlıca fonksiyon ismi.
         solution_code (str): Sorunun çözüm kodu.
         test_inputs (str): Sorunun test giriş verileri.
+        size_generator (str): Performans soruları için `generate(n)` fonksiyonunu tanımlayan
+            kod; n boyutlu girdinin argüman listesini döndürür. Boşsa yalnızca doğruluk kontrol edilir.
+        benchmark_sizes (str): Virgülle ayrılmış girdi boyutları (ör. "1000,2000,4000,8000").
+            Boşsa varsayılan boyutlar kullanılır.
+        time_tolerance (float): Çözümün referans çözüm süresinin en fazla kaç katı sürebileceği.
         created_at (datetime): Sorunun oluşturulma tarihi ve saati.
         updated_at (datetime): Sorunun en son güncellenme tarihi ve saati.
 
@@ -40,6 +45,9 @@ class ProgrammingQuestion(db.Model):
     function_name = db.Column(db.String(100), nullable=False)
     solution_code = db.Column(db.Text, nullable=False)
     test_inputs = db.Column(db.Text)
+    size_generator = db.Column(db.Text)
+    benchmark_sizes = db.Column(db.String(255))
+    time_tolerance = db.Column(db.Float)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
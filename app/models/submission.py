@@ -21,8 +21,13 @@ class Submission(db.Model):
         code: Kullanıcının gönderdiği çözümün kaynak kodu.
         is_correct: Çözümün doğru olup olmadığını belirten bayrak.
         test_results: Çözüm için yapılan testlerin sonuçları. JSON formatındadır.
-        execution_time: Gönderimin testlerde çalıştırılma süresi.
+        execution_time: Kullanıcı kodunun testlerdeki toplam duvar saati süresi (ms).
+        cpu_time: Kullanıcı kodunun testlerdeki toplam CPU süresi (ms).
+        peak_memory: Kullanıcı kodunun testler sırasındaki en yüksek bellek kullanımı (KB).
         error_message: Test sırasında oluşan hata mesajları.
+        code_hash: Normalleştirilmiş kod ve soru sürümünden hesaplanan özet. Aynı kodun
+            tekrar gönderiminde değerlendirme sonucunu yeniden kullanmak için saklanır; sandbox
+            hatası ya da zaman aşımı/yavaşlık içeren sonuçlarda boş bırakılır.
         created_at: Gönderimin oluşturulma tarihi ve saati.
 
     Attributes (Relationships):
@@ -41,7 +46,10 @@ class Submission(db.Model):
     is_correct = db.Column(db.Boolean, default=False)
     test_results = db.Column(db.Text)
     execution_time = db.Column(db.Float)
+    cpu_time = db.Column(db.Float)
+    peak_memory = db.Column(db.Float)
     error_message = db.Column(db.Text)
+    code_hash = db.Column(db.String(64), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # İlişkiler
@@ -0,0 +1,40 @@
+# app/models/summary_backfill.py
+from datetime import datetime
+from .base import db
+
+class SummaryBackfillItem(db.Model):
+    """
+    Notebook özetlerinin toplu olarak oluşturulması sırasında her notebook'un ilerleme durumunu saklar.
+
+    Uygulama yeniden başladığında tamamlanan notebook'lar atlanır, yarıda kalan denemeler
+    kaldığı yerden (deneme sayısı ve bir sonraki deneme zamanı korunarak) devam eder.
+
+    Attributes:
+        id (int): Kayıt için benzersiz tanımlayıcı.
+        notebook_path (str): Notebook'un depo köküne göre yolu.
+        blob_hash (Optional[str]): Kaydın ait olduğu notebook sürümünün git blob özeti.
+        status (str): 'pending', 'done' veya 'failed'.
+        attempts (int): Bu sürüm için yapılan deneme sayısı.
+        last_error (Optional[str]): Son denemede alınan hata.
+        next_attempt_at (Optional[datetime]): Bir sonraki denemenin en erken zamanı.
+        updated_at (datetime): Kaydın son güncellenme zamanı.
+    """
+    __tablename__ = 'summary_backfill'
+
+    id = db.Column(db.Integer, primary_key=True)
+    notebook_path = db.Column(db.String(255), unique=True, nullable=False)
+    blob_hash = db.Column(db.String(40))
+    status = db.Column(db.String(16), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        """
+        SummaryBackfillItem nesnesini hata ayıklama ve günlük kaydı için metin olarak ifade eder.
+
+        Returns:
+            str: "<SummaryBackfillItem {notebook_path} {status}>" biçiminde bir metin.
+        """
+        return f'<SummaryBackfillItem {self.notebook_path} {self.status}>'
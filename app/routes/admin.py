@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
 
 from app.forms.badges import BadgeForm
@@ -8,6 +8,7 @@ from app.models.settings import Setting
 from app.forms.admin import SettingForm
 from app.models.base import db
 from app.models.user import User, Role
+from app.services.test_plans import get_test_plan_cache
 from app.forms import UserForm
 from flask_wtf import FlaskForm
 
@@ -62,6 +63,21 @@ def admin_required(f):
     return decorated_function
 
 
+def _refresh_expected_outputs(question):
+    """
+    Kaydedilen sorunun referans çözüm çıktılarını önbelleğe hesaplar. Önbellek
+    güncellenemezse değerlendirme sırasında çıktılar yeniden hesaplanacağından
+    hata kullanıcıya yansıtılmaz.
+    """
+    from api import refresh_expected_outputs
+
+    try:
+        refresh_expected_outputs(question.id, question.function_name,
+                                 question.solution_code, question.test_inputs)
+    except Exception as e:
+        current_app.logger.warning(f"Beklenen çıktılar hesaplanamadı: {str(e)}")
+
+
 @admin_bp.route('/')
 @admin_required
 def index():
@@ -292,6 +308,87 @@ def question_submissions(id):
                            submissions=submissions)
 
 
+@admin_bp.route('/programming-questions/<int:id>/regrade', methods=['POST'])
+@admin_required
+def regrade_question_submissions(id):
+    """
+    Bir programlama sorusuna ait tüm gönderimleri güncel test girdileri ve çözüm koduna
+    göre yeniden değerlendirir. Gönderimler ortak test planıyla sandbox havuzuna dağıtılır,
+    her gönderimin sonucu veritabanına yazılır ve NDJSON satırı olarak akıtılır.
+
+    Args:
+        id (int): Programlama sorusunun benzersiz kimlik numarası.
+
+    Returns:
+        flask.Response: Her satırı bir gönderimin sonucunu içeren application/x-ndjson yanıtı.
+
+    Raises:
+        werkzeug.exceptions.NotFound: Eğer verilen `id` ile eşleşen bir programlama sorusu bulunamazsa.
+    """
+    import json
+    from api import (evaluate_batch, evaluation_cache_key, is_cacheable_evaluation, BatchEvaluationRequest,
+                     BatchSubmissionItem)
+    from app.events import event_manager
+    from app.events.event_definitions import EventType
+    from app.models.submission import Submission
+    from app.models.programming_question import ProgrammingQuestion
+
+    question = ProgrammingQuestion.query.get_or_404(id)
+    submissions = {submission.id: submission for submission in Submission.query.filter_by(question_id=id).all()}
+
+    batch_request = BatchEvaluationRequest(
+        function_name=question.function_name,
+        test_inputs=question.test_inputs,
+        solution_code=question.solution_code,
+        question_id=question.id,
+        question_version=question.updated_at.isoformat() if question.updated_at else None,
+        size_generator=question.size_generator,
+        benchmark_sizes=question.benchmark_sizes,
+        time_tolerance=question.time_tolerance,
+        submissions=[BatchSubmissionItem(id=submission.id, code=submission.code)
+                     for submission in submissions.values()]
+    )
+
+    def generate():
+        processed = 0
+        for result in evaluate_batch(batch_request):
+            submission = submissions[result["id"]]
+            was_correct = bool(submission.is_correct)
+
+            submission.is_correct = result.get('is_correct', False)
+            submission.test_results = json.dumps(result.get('test_results', {}))
+            submission.execution_time = result.get('execution_time', 0)
+            submission.cpu_time = result.get('cpu_time')
+            submission.peak_memory = result.get('peak_memory')
+            submission.error_message = json.dumps(result.get('errors', []))
+            submission.code_hash = (evaluation_cache_key(submission.code, batch_request)
+                                    if is_cacheable_evaluation(result) else None)
+
+            processed += 1
+            if processed % 20 == 0:
+                db.session.commit()
+
+            if submission.is_correct and not was_correct:
+                event_manager.trigger_event(EventType.QUESTION_SOLVED, {
+                    'user_id': submission.user_id,
+                    'question_id': submission.question_id
+                })
+
+            yield json.dumps({
+                "submission_id": submission.id,
+                "is_correct": submission.is_correct,
+                "was_correct": was_correct,
+                "execution_time": submission.execution_time,
+                "passed_tests": result.get('passed_tests', 0),
+                "failed_tests": result.get('failed_tests', 0),
+                "errors": result.get('errors', [])
+            }, ensure_ascii=False) + "\n"
+
+        db.session.commit()
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @admin_bp.route('/programming-questions')
 @admin_required
 def programming_questions():
@@ -344,11 +441,15 @@ def new_programming_question():
             example_output=form.example_output.data,
             function_name=form.function_name.data,
             solution_code=form.solution_code.data,
-            test_inputs=form.test_inputs.data
+            test_inputs=form.test_inputs.data,
+            size_generator=form.size_generator.data,
+            benchmark_sizes=form.benchmark_sizes.data,
+            time_tolerance=form.time_tolerance.data
         )
 
         db.session.add(question)
         db.session.commit()
+        _refresh_expected_outputs(question)
 
         flash('Programlama sorusu başarıyla oluşturuldu.', 'success')
         return redirect(url_for('admin.programming_questions'))
@@ -387,11 +488,15 @@ def new_ai_programming_question():
             example_output=form.example_output.data,
             function_name=form.function_name.data,
             solution_code=form.solution_code.data,
-            test_inputs=form.test_inputs.data
+            test_inputs=form.test_inputs.data,
+            size_generator=form.size_generator.data,
+            benchmark_sizes=form.benchmark_sizes.data,
+            time_tolerance=form.time_tolerance.data
         )
 
         db.session.add(question)
         db.session.commit()
+        _refresh_expected_outputs(question)
 
         flash('AI programlama sorusu başarıyla oluşturuldu.', 'success')
         return redirect(url_for('admin.programming_questions'))
@@ -432,6 +537,8 @@ def edit_programming_question(id):
     if form.validate_on_submit():
         form.populate_obj(question)
         db.session.commit()
+        get_test_plan_cache().invalidate(question.id)
+        _refresh_expected_outputs(question)
 
         flash('Programlama sorusu başarıyla güncellendi.', 'success')
         return redirect(url_for('admin.programming_questions'))
@@ -460,11 +567,14 @@ def delete_programming_question(id):
 
     # Önce soruyla ilişkili gönderileri temizle
     from app.models.submission import Submission
+    from app.models.expected_output import ExpectedOutput
     Submission.query.filter_by(question_id=id).delete()
+    ExpectedOutput.query.filter_by(question_id=id).delete()
 
     # Sonra soruyu sil
     db.session.delete(question)
     db.session.commit()
+    get_test_plan_cache().invalidate(id)
 
     flash('Programlama sorusu başarıyla silindi.', 'success')
     return redirect(url_for('admin.programming_questions'))
@@ -528,13 +638,18 @@ def test_programming_question(id):
                 "code": test_code,
                 "function_name": question.function_name,
                 "test_inputs": question.test_inputs,
-                "solution_code": question.solution_code
+                "solution_code": question.solution_code,
+                "question_id": question.id,
+                "question_version": question.updated_at.isoformat() if question.updated_at else None,
+                "size_generator": question.size_generator,
+                "benchmark_sizes": question.benchmark_sizes,
+                "time_tolerance": question.time_tolerance
             }
 
             response = requests.post(
                 Config.FASTAPI_DOMAIN+":"+Config.FASTAPI_PORT+"/api/evaluate",
                 json=evaluation_request,
-                timeout=5
+                timeout=30
             )
 
             if response.status_code == 200:
@@ -1,9 +1,9 @@
 from flask import Blueprint, render_template, redirect, url_for, session, request, flash
 from flask_login import login_required, current_user
 from flask import send_from_directory
-import os
-import subprocess
-import shutil
+from app.models.base import db
+from app.services.notebook_catalog import get_notebook_catalog
+from app.services.repo_sync import get_repo_sync
 
 main_bp = Blueprint('main', __name__)
 
@@ -11,36 +11,14 @@ def clone_repo():
     """
     Repository'yi klonlayan veya mevcut ise güncelleyen bir fonksiyon.
 
-    Bu fonksiyon, belirtilen bir URL'den bir GitHub repository'sini çalışma
-    dizinine indirir ya da halihazırda dizinde bulunuyorsa güncellemeye çalışır.
-    Eğer güncelleme işlemi başarısız olursa, mevcut repository dizinini siler ve
-    temiz bir şekilde yeniden klonlar.
+    Eşitleme RepoSyncService üzerinden yapılır; başka bir eşitleme sürüyorsa yeni bir
+    `git pull` başlatılmaz, süren eşitlemenin sonucu beklenir.
 
     Returns:
         str: Klonlanan veya güncellenen repository'nin dizin yolu. Eğer işlem
         başarısız olursa None döndürülür.
     """
-    repo_url = 'https://github.com/msy-bilecik/ist204_2025'
-    repo_dir = os.path.join(os.getcwd(), 'notebooks_repo')
-
-    if os.path.exists(repo_dir):
-        print(f"{repo_dir} dizinindeki repo güncelleniyor")
-        try:
-            # En son değişiklikleri çek
-            subprocess.run(['git', 'pull'], cwd=repo_dir, check=True)
-            return repo_dir
-        except subprocess.CalledProcessError:
-            print("Repo güncellenirken hata oluştu, yeniden klonlanıyor")
-            # Çekme başarısız olursa, temiz bir şekilde klonla
-            shutil.rmtree(repo_dir, ignore_errors=True)
-
-    print(f"Repository {repo_dir} dizinine klonlanıyor")
-    try:
-        subprocess.run(['git', 'clone', repo_url, repo_dir], check=True)
-        return repo_dir
-    except subprocess.CalledProcessError as e:
-        print(f"Repository klonlanırken hata: {str(e)}")
-        return None
+    return get_repo_sync().sync()
 
 
 @main_bp.route('/')
@@ -61,41 +39,24 @@ def index():
         Exception: Repository klonlama işlemi sırasında oluşan hatalar
                     iletilir.
     """
-    # Notebook dosyalarını kontrol et
-    repo_dir = os.path.join(os.getcwd(), 'notebooks_repo')
-    notebooks = []
+    # Notebook listesi bellek içi katalogdan okunur; katalog her depo eşitlemesinde yenilenir
+    catalog = get_notebook_catalog()
     error_message = None
 
-    # Repo dizini var mı kontrol et
-    if os.path.exists(repo_dir):
-        # Tüm ipynb dosyalarını listele
-        for root, dirs, files in os.walk(repo_dir):
-            for file in files:
-                if file.endswith('.ipynb'):
-                    rel_path = os.path.relpath(os.path.join(root, file), repo_dir)
-                    notebooks.append(rel_path)
-
-        if not notebooks:
-            error_message = "Henüz notebook mevcut değil."
-    else:
+    if not catalog.ensure_loaded(db.session):
         # Repo yoksa, oluşturma girişimi yap
         try:
-            repo_dir = clone_repo()
-            if repo_dir and os.path.exists(repo_dir):
-                # Yeniden notebook listesini dene
-                for root, dirs, files in os.walk(repo_dir):
-                    for file in files:
-                        if file.endswith('.ipynb'):
-                            rel_path = os.path.relpath(os.path.join(root, file), repo_dir)
-                            notebooks.append(rel_path)
-
-                if not notebooks:
-                    error_message = "Henüz notebook mevcut değil."
+            if get_repo_sync().ensure_checkout():
+                catalog.ensure_loaded(db.session)
             else:
                 error_message = "Repository klonlanamadı."
         except Exception as e:
             error_message = f"Repository işlemi sırasında hata: {str(e)}"
 
+    notebooks = catalog.paths()
+    if not notebooks and not error_message:
+        error_message = "Henüz notebook mevcut değil."
+
     return render_template('index.html', notebooks=notebooks, error_message=error_message)
 
 @main_bp.route('/<path:path>')
@@ -1,5 +1,13 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+import os
+from datetime import datetime, timezone
+
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, abort, make_response, current_app
 from flask_login import login_required, current_user
+from flask_socketio import join_room
+from app.services.evaluation_jobs import user_room
+from app.services.notebook_cache import notebook_version
+from app.services.notebook_catalog import get_notebook_catalog
+from app.services.notebook_renderer import get_notebook_renderer
 from app.services.notebook_service import NotebookService
 
 notebook_bp = Blueprint('notebook', __name__)
@@ -21,12 +29,67 @@ def view(notebook_path):
         Response: Eğer not defteri başarıyla yüklenirse not defteri görüntüleyici şablonunu döner. Aksi halde kullanıcı,
         hata mesajı ile ana sayfaya yönlendirilir.
     """
-    notebook = notebook_service.get_notebook(notebook_path)
-    if not notebook:
+    # Hücreler burada ayrıştırılmaz; görüntüleyici önceden üretilmiş HTML'i /rendered üzerinden yükler
+    repo_dir = notebook_service.ensure_repo_exists()
+    try:
+        if not repo_dir:
+            raise FileNotFoundError(notebook_path)
+        relative_path = notebook_service.resolve_notebook_path(repo_dir, notebook_path)
+    except (ValueError, FileNotFoundError):
         flash('Notebook bulunamadı veya yüklenemedi.', 'error')
         return redirect(url_for('main.index'))
+
+    entry = get_notebook_catalog().get(relative_path)
+    notebook = {
+        'path': relative_path,
+        'name': os.path.basename(relative_path),
+        'title': entry['title'] if entry else None
+    }
     return render_template('notebook_viewer.html', notebook=notebook)
 
+@notebook_bp.route('/rendered/<path:notebook_path>')
+@login_required
+def rendered(notebook_path):
+    """
+    Notebook hücrelerinin önceden üretilmiş HTML parçasını döndürür.
+
+    Yanıt notebook sürümünü ETag, dosyanın değiştirilme zamanını Last-Modified olarak taşır;
+    tarayıcı aynı sürümü tekrar istediğinde içerik üretilmeden 304 döndürülür.
+
+    Args:
+        notebook_path (str): Notebook'un depo köküne göre yolu.
+
+    Returns:
+        Response: HTML parçası, 304 veya notebook bulunamazsa 404.
+    """
+    repo_dir = notebook_service.ensure_repo_exists()
+    try:
+        if not repo_dir:
+            raise FileNotFoundError(notebook_path)
+        relative_path = notebook_service.resolve_notebook_path(repo_dir, notebook_path)
+        stat = os.stat(os.path.join(repo_dir, relative_path))
+    except (ValueError, FileNotFoundError):
+        abort(404)
+
+    version = notebook_version(relative_path, stat)
+    if version in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        try:
+            fragment, version = get_notebook_renderer().render(repo_dir, relative_path, version)
+        except Exception as e:
+            current_app.logger.error(f"Notebook HTML'e dönüştürülemedi: {relative_path}: {str(e)}")
+            abort(500)
+        response = make_response(fragment)
+        response.mimetype = 'text/html'
+
+    response.set_etag(version)
+    response.last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+    # Tarayıcı yanıtı saklar ama her görüntülemede ETag ile doğrular
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
 @notebook_bp.route('/run', methods=['POST'])
 @login_required
 def run():
@@ -59,9 +122,10 @@ def register_socketio_handlers(socketio):
     Decorator-based event handlers:
 
     'run_code': Kullanıcıdan gelen kod çalıştırma isteğini işler ve kodun gerekli hizmete gönderilmesini sağlar.
-    'input_response': Kullanıcıdan gelen giriş yanıtlarını işler ve belirtilen değerleri kaydeder.
+    'input_response': Kullanıcıdan gelen giriş yanıtlarını aynı oturumda bekleyen input() çağrısına iletir.
     'connect': Socket.IO bağlantısı sırasında kullanıcı kimlik doğrulamasını kontrol eder ve
     gerekli oturum başlatma işlemlerini yapar.
+    'disconnect': Kapanan oturumun süren çalıştırmasını sonlandırır.
 
     Raises:
         ValueError: Args veya fire edilen event'teki eksik veya hatalı verilerden dolayı gerçekleşebilir.
@@ -78,7 +142,7 @@ def register_socketio_handlers(socketio):
         """
         code = data['code']
         user_id = current_user.id
-        notebook_service.handle_socket_run_code(code, user_id, socketio)
+        notebook_service.handle_socket_run_code(code, user_id, socketio, session_id=request.sid)
 
     @socketio.on('input_response')
     def handle_input_response(data):
@@ -90,10 +154,12 @@ def register_socketio_handlers(socketio):
         Args:
             socketio: Flask-SocketIO nesnesi. Olay işleyicilerinin kaydedileceği nesne.
         """
-        notebook_service.set_input_response(data['value'])
+        # Yanıt yalnızca aynı oturumun bekleyen input() isteğine iletilir
+        notebook_service.set_input_response(current_user.id, data['value'],
+                                            session_id=request.sid, request_id=data.get('request_id'))
 
     @socketio.on('connect')
-    def handle_connect():
+    def handle_connect(auth=None):
         """
         Socket.IO bağlantı işleyicilerini kayıt eder.
 
@@ -113,7 +179,21 @@ def register_socketio_handlers(socketio):
             `notebook_service.reset_namespace` çağrısı başarısız olabilir.
         """
         if current_user.is_authenticated:
-            notebook_service.reset_namespace(current_user.id)
+            # Arka plan değerlendirme sonuçları kullanıcıya özel odaya gönderilir
+            join_room(user_room(current_user.id))
+
+            # Yalnızca değerlendirme sonucu bekleyen bağlantılar notebook oturumunu sıfırlamaz
+            if not (auth or {}).get('evaluation_only'):
+                notebook_service.reset_namespace(current_user.id)
+
+    @socketio.on('disconnect')
+    def handle_disconnect():
+        """
+        Kapanan oturumun süren kod çalıştırmasını (ör. input() yanıtı bekleyen) sonlandırır;
+        böylece çekirdek hiçbir zaman gelmeyecek bir yanıtı beklemez.
+        """
+        if current_user.is_authenticated:
+            notebook_service.cancel_session(current_user.id, request.sid)
 
 
 @notebook_bp.route('/summary/<path:notebook_path>')
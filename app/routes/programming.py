@@ -5,13 +5,14 @@ import requests
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app
 from flask_login import login_required, current_user
 
-from api import evaluate_solution, EvaluationRequest
+from api import evaluate_solution, evaluation_cache_key, is_cacheable_evaluation, EvaluationRequest
 from app.events import event_manager
 from app.events.event_definitions import EventType
 from app.forms.programming import SolutionSubmitForm, CodeEvaluationForm
 from app.models.base import db
 from app.models.programming_question import ProgrammingQuestion
 from app.models.submission import Submission
+from app.services.evaluation_jobs import get_evaluation_queue
 from config import Config
 
 programming_bp = Blueprint('programming', __name__)
@@ -167,6 +168,71 @@ def question(id):
                            question=question,
                            default_code=default_code)
 
+def grade_submission(question_id, user_id, code):
+    """
+    Bir çözümü değerlendirir, sonucu Submission olarak kaydeder ve gerekli olayları tetikler.
+
+    Hem senkron gönderimde hem de arka plan değerlendirme işlerinde kullanılır; bu nedenle
+    istek bağlamına (current_user, url_for) ihtiyaç duymaz, yalnızca uygulama bağlamı yeterlidir.
+
+    Args:
+        question_id (int): Sorunun kimlik numarası.
+        user_id (int): Gönderimi yapan kullanıcının kimlik numarası.
+        code (str): Gönderilen çözüm kodu.
+
+    Returns:
+        dict: 'submission_id', 'is_correct', 'passed_tests', 'failed_tests' ve
+        'execution_time' anahtarlarını içeren özet.
+    """
+    question = ProgrammingQuestion.query.get(question_id)
+
+    evaluation_request = EvaluationRequest(
+        code=code,
+        function_name=question.function_name,
+        test_inputs=question.test_inputs,
+        solution_code=question.solution_code,
+        question_id=question.id,
+        question_version=question.updated_at.isoformat() if question.updated_at else None,
+        size_generator=question.size_generator,
+        benchmark_sizes=question.benchmark_sizes,
+        time_tolerance=question.time_tolerance
+    )
+    result = evaluate_solution(evaluation_request)
+
+    # Başarı durumu ve sonuçları kaydetme
+    submission = Submission(
+        user_id=user_id,
+        question_id=question.id,
+        code=code,
+        is_correct=result.get('is_correct', False),
+        test_results=json.dumps(result.get('test_results', [])),  # JSON formatında sakla
+        execution_time=result.get('execution_time', 0),
+        cpu_time=result.get('cpu_time'),
+        peak_memory=result.get('peak_memory'),
+        error_message=json.dumps(result.get('errors', [])),
+        # Yalnızca yeniden kullanılabilir sonuçlar kalıcı önbellek için işaretlenir
+        code_hash=evaluation_cache_key(code, evaluation_request) if is_cacheable_evaluation(result) else None
+    )
+
+    db.session.add(submission)
+    db.session.commit()
+
+    # Bildirim veya rozet kontrolleri
+    if submission.is_correct:
+        event_manager.trigger_event(EventType.QUESTION_SOLVED, {
+            'user_id': submission.user_id,
+            'question_id': submission.question_id
+        })
+
+    return {
+        "submission_id": submission.id,
+        "is_correct": bool(submission.is_correct),
+        "passed_tests": result.get('passed_tests', 0),
+        "failed_tests": result.get('failed_tests', 0),
+        "execution_time": submission.execution_time
+    }
+
+
 # submit_solution route'u güncellenir
 @programming_bp.route('/questions/<int:id>/submit', methods=['POST'])
 @login_required
@@ -176,6 +242,10 @@ def submit_solution(id):
     Kullanıcıdan gelen çözüm kodunu, ilgili sorunun işlev ismini ve test verilerini değerlendirerek,
     sonuçları veritabanına kaydeder ve başarı durumuna göre kullanıcıyı bilgilendirir ya da hata mesajları döner.
 
+    İstek JSON ise değerlendirme arka plan iş kuyruğuna alınır ve hemen bir iş kimliği
+    döndürülür (202). Sonuç Socket.IO 'evaluation_finished' olayıyla gönderilir ve
+    submission_job_status üzerinden yoklanabilir.
+
     Args:
         id (int): Değerlendirilecek sorunun kimlik numarası.
 
@@ -183,49 +253,42 @@ def submit_solution(id):
         None.
 
     Returns:
-        Werkzeug Response: Gönderme işlemini tamamladıktan sonra kullanıcıyı uygun bir sayfaya yönlendiren cevap.
+        Werkzeug Response: Gönderme işlemini tamamladıktan sonra kullanıcıyı uygun bir sayfaya yönlendiren cevap
+        veya JSON isteklerinde iş kimliğini içeren yanıt.
 
     """
     question = ProgrammingQuestion.query.get_or_404(id)
     form = SolutionSubmitForm()
 
+    # AJAX isteği için form verisini JSON gövdesinden al
+    if request.is_json:
+        form.code.data = request.get_json().get('code')
+
     if form.validate_on_submit():
         code = form.code.data
 
-        # Doğru çağrı:
-        request = EvaluationRequest(
-            code=code,
-            function_name=question.function_name,
-            test_inputs=question.test_inputs,
-            solution_code=question.solution_code
-        )
-        result = evaluate_solution(request)
-
-        # Başarı durumu ve sonuçları kaydetme
-        submission = Submission(
-            user_id=current_user.id,
-            question_id=question.id,
-            code=code,
-            is_correct=result.get('is_correct', False),
-            test_results=json.dumps(result.get('test_results', [])),  # JSON formatında sakla
-            execution_time=result.get('execution_time', 0),
-            error_message=json.dumps(result.get('error_message', []))
-        )
-
-        db.session.add(submission)
-        db.session.commit()
-
-        # Bildirim veya rozet kontrolleri
-        if result.get('is_correct', False):
-            event_manager.trigger_event(EventType.QUESTION_SOLVED, {
-                'user_id': submission.user_id,
-                'question_id': submission.question_id
-            })
+        if request.is_json:
+            job_id = get_evaluation_queue().submit(
+                current_app._get_current_object(), current_user.id, grade_submission,
+                question.id, current_user.id, code
+            )
+            return jsonify({
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": url_for('programming.submission_job_status', job_id=job_id)
+            }), 202
+
+        summary = grade_submission(question.id, current_user.id, code)
+
+        if summary["is_correct"]:
             flash('Tebrikler! Çözümünüz doğru.', 'success')
         else:
             flash('Çözümünüzde hatalar var.', 'error')
 
-        return redirect(url_for('programming.submission', id=submission.id))
+        return redirect(url_for('programming.submission', id=summary["submission_id"]))
+
+    if request.is_json:
+        return jsonify({"error": "Geçersiz form verileri", "errors": form.errors}), 400
 
     # Form doğrulama hatası kısmı
     for field, errors in form.errors.items():
@@ -235,6 +298,32 @@ def submit_solution(id):
     return redirect(url_for('programming.question', id=id))
 
 
+@programming_bp.route('/submissions/jobs/<job_id>')
+@login_required
+def submission_job_status(job_id):
+    """
+    Arka planda değerlendirilen bir gönderim işinin durumunu döndürür.
+
+    Args:
+        job_id (str): submit_solution tarafından döndürülen iş kimliği.
+
+    Returns:
+        flask.Response: 'status' (queued, running, done, failed), tamamlandıysa 'result'
+        ve hata varsa 'error' alanlarını içeren JSON yanıtı. İş bulunamazsa veya başka
+        bir kullanıcıya aitse 404 döner.
+    """
+    job = get_evaluation_queue().get(job_id)
+    if not job or job["user_id"] != current_user.id:
+        return jsonify({"error": "İş bulunamadı"}), 404
+
+    return jsonify({
+        "job_id": job["id"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"]
+    })
+
+
 @programming_bp.route('/submissions/<int:id>')
 @login_required
 def submission(id):
@@ -325,7 +414,15 @@ def evaluate_code(id):
                 "code": code,
                 "function_name": question.function_name,
                 "test_inputs": question.test_inputs,
-                "solution_code": question.solution_code
+                "solution_code": question.solution_code,
+                "question_id": question.id,
+                "question_version": question.updated_at.isoformat() if question.updated_at else None,
+                "size_generator": question.size_generator,
+                "benchmark_sizes": question.benchmark_sizes,
+                "time_tolerance": question.time_tolerance,
+                # Hızlı deneme: ilk hatada dur, küçük girdilerden başla
+                "fail_fast": True,
+                "cheapest_first": True
             }
 
             response = requests.post(
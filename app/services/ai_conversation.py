@@ -0,0 +1,47 @@
+# app/services/ai_conversation.py
+"""
+Sohbet mesajlarını AI sağlayıcılarının beklediği istek biçimine dönüştüren yardımcılar.
+
+Uygulama içindeki konuşmalar OpenAI tarzı {'role', 'content'} sözlükleri olarak tutulur;
+bu modül bunları sağlayıcıya özgü biçime çevirir.
+"""
+
+# Konuşmada hiç kullanıcı/model mesajı yoksa gönderilen varsayılan soru
+DEFAULT_PROMPT = "Notebook hakkında bilgi verir misiniz?"
+
+
+def gemini_contents(messages):
+    """
+    Mesajları tek bir generate_content isteğinde gönderilecek Gemini konuşmasına dönüştürür.
+
+    'assistant' mesajları 'model', diğerleri 'user' rolüne eşlenir ve art arda gelen aynı
+    roldeki mesajlar tek bir turda birleştirilir. Gemini ayrı bir sistem rolü almadığından
+    (son) sistem mesajı ilk kullanıcı turunun başına 'SYSTEM: ' önekiyle eklenir.
+
+    Args:
+        messages (list): 'role' ve 'content' anahtarlarını içeren mesaj sözlükleri.
+
+    Returns:
+        list: 'role' ve 'parts' anahtarlarını içeren Gemini içerikleri; en az bir tur içerir.
+    """
+    system_prompt = None
+    contents = []
+    for msg in messages:
+        if msg["role"] == "system":
+            system_prompt = msg["content"]
+            continue
+        role = "model" if msg["role"] == "assistant" else "user"
+        # Art arda gelen aynı roldeki mesajlar tek bir tura birleştirilir
+        if contents and contents[-1]["role"] == role:
+            contents[-1]["parts"].append(msg["content"])
+        else:
+            contents.append({"role": role, "parts": [msg["content"]]})
+
+    if system_prompt:
+        if contents and contents[0]["role"] == "user":
+            contents[0]["parts"].insert(0, f"SYSTEM: {system_prompt}")
+        else:
+            contents.insert(0, {"role": "user", "parts": [f"SYSTEM: {system_prompt}"]})
+    if not contents:
+        contents.append({"role": "user", "parts": [DEFAULT_PROMPT]})
+    return contents
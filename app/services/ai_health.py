@@ -0,0 +1,185 @@
+# app/services/ai_health.py
+"""
+AI sağlayıcılarının erişilebilirliğini gerçek çağrıların sonuçlarından izleyen sağlık monitörü.
+
+Her sağlayıcı/API anahtarı için bir devre kesici (circuit breaker) tutulur: art arda
+belirli sayıda başarısız çağrıdan sonra devre açılır ve reset_timeout süresince
+sağlayıcıya istek gönderilmez. Süre dolduğunda tek bir deneme çağrısına izin verilir;
+deneme başarılıysa devre kapanır, değilse yeniden açılır. Böylece istekler öncesinde
+ayrı bir bağlantı testi yapmaya gerek kalmaz. Son başarılı çağrının zamanı ttl
+süresince canlılık bilgisi olarak kullanılır.
+"""
+import hashlib
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def health_key(api_provider, api_key):
+    """
+    Sağlayıcı ve API anahtarı için monitör anahtarı üretir (anahtarın kendisi saklanmaz).
+
+    Args:
+        api_provider (str): AI sağlayıcısının adı.
+        api_key (str): API anahtarı.
+
+    Returns:
+        tuple: (sağlayıcı, anahtar özeti)
+    """
+    return api_provider, hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:12]
+
+
+class ProviderHealthMonitor:
+    """
+    Sağlayıcı başına devre kesici ve önbelleğe alınmış canlılık bilgisi tutan iş parçacığı güvenli monitör.
+
+    Attributes:
+        ttl (float): Başarılı bir çağrının sağlayıcıyı canlı saymak için geçerli kaldığı süre (saniye).
+        failure_threshold (int): Devreyi açan art arda başarısız çağrı sayısı.
+        reset_timeout (float): Açık devrenin deneme çağrısına izin vermeden önce beklediği süre (saniye).
+    """
+
+    def __init__(self, ttl=60, failure_threshold=3, reset_timeout=60, clock=time.monotonic):
+        self.ttl = ttl
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._providers = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        provider = self._providers.get(key)
+        if provider is None:
+            provider = self._providers[key] = {
+                'state': CLOSED, 'failures': 0, 'last_error': None,
+                'opened_at': None, 'last_success': None
+            }
+        return provider
+
+    def available(self, key):
+        """
+        Sağlayıcıya çağrı yapılabilecek durumda olup olmadığını durumu değiştirmeden bildirir.
+
+        Args:
+            key (tuple): health_key ile üretilen anahtar.
+
+        Returns:
+            tuple: (kullanılabilir mi, devre açıksa son hata)
+        """
+        with self._lock:
+            provider = self._get(key)
+            if provider['state'] == CLOSED:
+                return True, None
+            if provider['state'] == OPEN and self._clock() - provider['opened_at'] >= self.reset_timeout:
+                return True, None
+            return False, provider['last_error']
+
+    def allow(self, key):
+        """
+        Bir çağrının yapılıp yapılamayacağına karar verir. Açık devrenin bekleme süresi
+        dolduysa devre yarı açık duruma geçer ve yalnızca bu çağrıya izin verilir.
+
+        Args:
+            key (tuple): health_key ile üretilen anahtar.
+
+        Returns:
+            tuple: (çağrı yapılabilir mi, reddedildiyse son hata)
+        """
+        with self._lock:
+            provider = self._get(key)
+            if provider['state'] == CLOSED:
+                return True, None
+            if provider['state'] == OPEN and self._clock() - provider['opened_at'] >= self.reset_timeout:
+                provider['state'] = HALF_OPEN
+                return True, None
+            return False, provider['last_error']
+
+    def record_success(self, key):
+        """Başarılı bir çağrıyı kaydeder ve devreyi kapatır."""
+        with self._lock:
+            provider = self._get(key)
+            provider.update(state=CLOSED, failures=0, opened_at=None, last_success=self._clock())
+
+    def record_failure(self, key, error):
+        """
+        Başarısız bir çağrıyı kaydeder. Eşik aşıldıysa veya deneme çağrısı başarısız olduysa
+        devre açılır.
+
+        Args:
+            key (tuple): health_key ile üretilen anahtar.
+            error (str): Çağrının hata mesajı.
+        """
+        with self._lock:
+            provider = self._get(key)
+            provider['failures'] += 1
+            provider['last_error'] = error
+            if provider['state'] == HALF_OPEN or provider['failures'] >= self.failure_threshold:
+                provider.update(state=OPEN, opened_at=self._clock())
+
+    def is_alive(self, key):
+        """
+        Sağlayıcının son ttl saniye içinde başarılı bir çağrı yapıp yapmadığını döndürür.
+
+        Returns:
+            Optional[bool]: Yakın zamanda başarılı çağrı varsa True, devre açıksa False,
+            bilgi yoksa None.
+        """
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is None:
+                return None
+            if provider['state'] == OPEN:
+                return False
+            if provider['last_success'] is not None and self._clock() - provider['last_success'] < self.ttl:
+                return True
+            return None
+
+    def status(self):
+        """
+        Tüm sağlayıcıların devre durumunu döndürür.
+
+        Returns:
+            list: 'provider', 'state', 'alive', 'failures' ve 'last_error' anahtarlarını içeren sözlükler.
+        """
+        with self._lock:
+            keys = list(self._providers)
+        results = []
+        for key in keys:
+            alive = self.is_alive(key)
+            with self._lock:
+                provider = self._providers[key]
+                results.append({
+                    'provider': key[0],
+                    'state': provider['state'],
+                    'alive': alive,
+                    'failures': provider['failures'],
+                    'last_error': provider['last_error']
+                })
+        return results
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_ai_health_monitor():
+    """
+    Uygulama genelinde paylaşılan ProviderHealthMonitor örneğini döndürür.
+
+    Returns:
+        ProviderHealthMonitor: Config'teki ayarlarla oluşturulmuş monitör.
+    """
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                from config import Config
+                _monitor = ProviderHealthMonitor(
+                    ttl=Config.AI_HEALTH_TTL,
+                    failure_threshold=Config.AI_CIRCUIT_FAILURE_THRESHOLD,
+                    reset_timeout=Config.AI_CIRCUIT_RESET_TIMEOUT
+                )
+    return _monitor
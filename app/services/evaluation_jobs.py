@@ -0,0 +1,177 @@
+# app/services/evaluation_jobs.py
+"""
+Çözüm gönderimlerinin arka planda değerlendirilmesini sağlayan iş kuyruğu.
+
+Web isteği yalnızca bir iş kimliği alıp hemen döner; değerlendirme bir iş parçacığı
+havuzunda yürütülür. Sonuç hazır olduğunda kullanıcının Socket.IO odasına
+('user_<id>') 'evaluation_finished' olayı gönderilir, ayrıca iş durumu yoklama
+(polling) ile de sorgulanabilir.
+
+Değerlendirme iş parçacıkları Socket.IO'ya doğrudan yazmaz: eventlet gibi yeşil iş
+parçacığı (greenlet) tabanlı sunucularda yerel bir iş parçacığından emit güvenli
+değildir. Bildirimler iş parçacığı güvenli bir kuyruğa eklenir ve socketio.start_background_task
+ile sunucunun kendi döngüsünde başlatılan bir görev tarafından gönderilir.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# İş durumları
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+def user_room(user_id):
+    """Kullanıcıya özel Socket.IO oda adını döndürür."""
+    return f"user_{user_id}"
+
+
+class EvaluationJobQueue:
+    """
+    Değerlendirme işlerini arka planda çalıştıran ve durumlarını bellekte tutan kuyruk.
+
+    Attributes:
+        max_workers (int): Aynı anda çalışan değerlendirme sayısı.
+        ttl (int): Tamamlanan işlerin bellekte tutulma süresi (saniye).
+        notify_interval (float): Bildirim kuyruğunun boşaltılma aralığı (saniye).
+    """
+
+    def __init__(self, max_workers=4, ttl=3600, notify_interval=0.2):
+        self.max_workers = max(1, int(max_workers))
+        self.ttl = ttl
+        self.notify_interval = notify_interval
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='evaluation-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._notifications = deque()
+        self._notifier = None
+
+    def submit(self, app, user_id, grader, *args):
+        """
+        Yeni bir değerlendirme işini kuyruğa ekler.
+
+        Args:
+            app (Flask): İşin çalıştırılacağı uygulama bağlamını sağlayan Flask nesnesi.
+            user_id (int): İşin sahibi olan kullanıcı.
+            grader (Callable): Uygulama bağlamında çağrılacak, değerlendirmeyi yapıp
+                sonucu (JSON uyumlu sözlük) döndüren fonksiyon.
+            *args: grader'a iletilecek argümanlar.
+
+        Returns:
+            str: İş kimliği.
+        """
+        self._purge_expired()
+        self._start_notifier(app)
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id,
+                "user_id": user_id,
+                "status": JOB_QUEUED,
+                "result": None,
+                "error": None,
+                "created_at": time.time(),
+                "finished_at": None
+            }
+        self._executor.submit(self._run, app, job_id, grader, args)
+        return job_id
+
+    def get(self, job_id):
+        """İş durumunun bir kopyasını döndürür; iş yoksa None."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+            return dict(self._jobs[job_id])
+
+    def _run(self, app, job_id, grader, args):
+        """İşi uygulama bağlamında çalıştırır, sonucu kaydeder ve kullanıcıya bildirir."""
+        self._update(job_id, status=JOB_RUNNING)
+        with app.app_context():
+            try:
+                job = self._update(job_id, status=JOB_DONE, result=grader(*args), finished_at=time.time())
+            except Exception as e:
+                logger.exception(f"Değerlendirme işi başarısız oldu: {job_id}")
+                job = self._update(job_id, status=JOB_FAILED, error=str(e), finished_at=time.time())
+            self._notify(job)
+
+    def _notify(self, job):
+        """İş sonucunu bildirim kuyruğuna ekler; gönderim _drain_notifications görevinde yapılır."""
+        if self._notifier is None:
+            return
+        self._notifications.append((user_room(job["user_id"]), {
+            "job_id": job["id"],
+            "status": job["status"],
+            "result": job["result"],
+            "error": job["error"]
+        }))
+
+    def _start_notifier(self, app):
+        """
+        Bildirim kuyruğunu boşaltan görevi (henüz başlatılmadıysa) Socket.IO'nun arka plan
+        görevi olarak başlatır. İstek işleyicisinden, yani sunucunun kendi döngüsünden çağrılır.
+        """
+        socketio = app.extensions.get('socketio')
+        if socketio is None:
+            return
+        with self._lock:
+            if self._notifier is not None:
+                return
+            self._notifier = socketio
+        socketio.start_background_task(self._drain_notifications, socketio)
+
+    def _drain_notifications(self, socketio):
+        """Kuyruktaki bildirimleri ilgili kullanıcı odalarına gönderir."""
+        while True:
+            while self._notifications:
+                room, payload = self._notifications.popleft()
+                try:
+                    socketio.emit('evaluation_finished', payload, room=room)
+                except Exception as e:
+                    logger.warning(f"Değerlendirme sonucu gönderilemedi: {str(e)}")
+            socketio.sleep(self.notify_interval)
+
+    def _purge_expired(self):
+        """Süresi dolmuş tamamlanmış işleri bellekten siler."""
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job["finished_at"] and now - job["finished_at"] > self.ttl]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def shutdown(self):
+        """Yürütücüyü kapatır; çalışan işlerin bitmesini bekler."""
+        self._executor.shutdown(wait=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_evaluation_queue():
+    """
+    Uygulama genelinde paylaşılan EvaluationJobQueue örneğini döndürür.
+
+    Returns:
+        EvaluationJobQueue: Paylaşılan kuyruk örneği.
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                from config import Config
+                _queue = EvaluationJobQueue(max_workers=Config.EVALUATION_JOB_WORKERS,
+                                            ttl=Config.EVALUATION_JOB_TTL)
+    return _queue
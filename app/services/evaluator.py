@@ -0,0 +1,700 @@
+# app/services/evaluator.py
+"""
+Öğrenci kodunun sandbox işçi süreçleri içinde çalıştırılmasını sağlayan yardımcılar.
+
+Bu modül yalnızca standart kütüphaneye bağımlıdır; böylece forkserver tarafından
+önceden yüklenebilir ve her işçi süreç hazır bir yorumlayıcı ile başlar.
+"""
+import ast
+import builtins
+import copy
+import io
+import json
+import marshal
+import math
+import random
+import signal
+import sys
+import time
+import traceback
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Test sonucu durumları
+STATUS_PASSED = "passed"
+STATUS_FAILED = "failed"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_MEMORY_EXCEEDED = "memory_exceeded"
+STATUS_OUTPUT_LIMIT = "output_limit"
+STATUS_TOO_SLOW = "too_slow"
+
+# Performans testinde bu süreden kısa farklar ölçüm gürültüsü sayılır
+BENCHMARK_TIME_FLOOR_NS = 1_000_000
+
+# run_tests sonucunda performans testinin anahtarı
+BENCHMARK_KEY = "benchmark"
+
+# Büyüme üssünün hesaplanabilmesi için performans testinde gereken en az boyut sayısı
+MIN_BENCHMARK_SIZES = 2
+
+# Kullanıcı kodu çalışmadan önceki builtins; çözüm bunlarla çalıştırılır ve her işten sonra geri yüklenir
+_PRISTINE_BUILTINS = dict(builtins.__dict__)
+
+
+class TestTimeout(BaseException):
+    """Tek bir test çağrısının duvar saati veya CPU süresi sınırını aştığını belirtir."""
+
+
+class OutputLimitExceeded(BaseException):
+    """Kullanıcı kodunun izin verilen çıktı boyutunu aştığını belirtir."""
+
+
+class BoundedOutput(io.TextIOBase):
+    """
+    Yazılan metni belleğe toplayan, belirlenen karakter sınırı aşıldığında
+    OutputLimitExceeded fırlatan bir stdout/stderr yerine geçen nesne.
+
+    Args:
+        limit (Optional[int]): İzin verilen en fazla karakter sayısı. None ise sınırsız.
+    """
+
+    def __init__(self, limit=None):
+        super().__init__()
+        self.limit = limit
+        self.size = 0
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self.size += len(text)
+        if self.limit is not None and self.size > self.limit:
+            raise OutputLimitExceeded(f"Çıktı boyutu sınırı ({self.limit} karakter) aşıldı")
+        self._parts.append(text)
+        return len(text)
+
+    def getvalue(self):
+        return ''.join(self._parts)
+
+    def reset(self):
+        self.size = 0
+        self._parts = []
+
+
+def _raise_test_timeout(signum, frame):
+    """SIGALRM/SIGPROF sinyallerini test çağrısını kesen bir istisnaya dönüştürür."""
+    if signum == getattr(signal, 'SIGPROF', None):
+        raise TestTimeout("CPU süresi sınırı aşıldı")
+    raise TestTimeout("Süre sınırı aşıldı")
+
+
+def _start_test_timers(limits):
+    """Test başına duvar saati (ITIMER_REAL) ve CPU (ITIMER_PROF) zamanlayıcılarını kurar."""
+    if not limits or not hasattr(signal, 'setitimer'):
+        return False
+    wall = limits.get('test_timeout')
+    cpu = limits.get('test_cpu_limit')
+    if wall:
+        signal.signal(signal.SIGALRM, _raise_test_timeout)
+        signal.setitimer(signal.ITIMER_REAL, wall)
+    if cpu:
+        signal.signal(signal.SIGPROF, _raise_test_timeout)
+        signal.setitimer(signal.ITIMER_PROF, cpu)
+    return bool(wall or cpu)
+
+
+def _stop_test_timers():
+    """Kurulu test zamanlayıcılarını iptal eder."""
+    signal.setitimer(signal.ITIMER_REAL, 0)
+    signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+def _current_address_space():
+    """Sürecin mevcut sanal bellek boyutunu bayt cinsinden döndürür (yalnızca Linux)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def set_memory_limit(megabytes):
+    """
+    İşçi sürecin adres alanını mevcut kullanımın `megabytes` MB üzerine sınırlar.
+
+    Sınır aşıldığında kullanıcı kodu MemoryError alır ve test memory_exceeded
+    durumuyla işaretlenir.
+
+    Args:
+        megabytes (Optional[int]): İzin verilen ek adres alanı. None/0 ise önceki sınır kaldırılır.
+    """
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if not megabytes:
+        resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+        return
+    soft = _current_address_space() + int(megabytes) * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def _safe_value(value):
+    """
+    Bir test girdisi veya çıktısını süreçler arası taşınabilir hale getirir.
+
+    JSON'a dönüştürülebilen değerler olduğu gibi bırakılır, diğerleri (örneğin
+    kullanıcı tanımlı sınıf örnekleri) repr() metnine çevrilir.
+
+    Args:
+        value: Dönüştürülecek değer.
+
+    Returns:
+        Any: JSON uyumlu değer.
+    """
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def encode_expected(value):
+    """
+    Referans çıktıyı önbellekte saklanabilecek repr() metnine çevirir.
+
+    Yalnızca ast.literal_eval ile aynı türde ve eşit değere geri dönüştürülebilen
+    değerler kodlanır; diğerleri için None döner ve çıktı her seferinde yeniden hesaplanır.
+
+    Args:
+        value: Referans çözümün döndürdüğü değer.
+
+    Returns:
+        Optional[str]: Değerin repr() metni veya None.
+    """
+    try:
+        encoded = repr(value)
+        decoded = ast.literal_eval(encoded)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return None
+    if type(decoded) is not type(value) or decoded != value:
+        return None
+    return encoded
+
+
+def _call_with_limits(function, args, limits, metrics=None):
+    """
+    Fonksiyonu test başına zaman sınırları altında çağırır.
+
+    Args:
+        function (Callable): Çağrılacak fonksiyon.
+        args (list): Fonksiyon argümanları.
+        limits (Optional[dict]): Test başına sınırlar.
+        metrics (Optional[dict]): Verilirse çağrının duvar saati süresi ('wall_ns'), CPU
+            süresi ('cpu_ns') ve tracemalloc açıksa tepe bellek kullanımı
+            ('peak_memory_bytes') bu sözlüğe yazılır. Çağrı hata verse de doldurulur.
+    """
+    timers_started = _start_test_timers(limits)
+    tracing = metrics is not None and tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+    cpu_start = time.process_time_ns()
+    wall_start = time.perf_counter_ns()
+    try:
+        return function(*args)
+    finally:
+        wall_ns = time.perf_counter_ns() - wall_start
+        cpu_ns = time.process_time_ns() - cpu_start
+        if timers_started:
+            _stop_test_timers()
+        if metrics is not None:
+            metrics["wall_ns"] = wall_ns
+            metrics["cpu_ns"] = cpu_ns
+            if tracing:
+                metrics["peak_memory_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+
+
+def run_tests(user_function, solution_function, test_inputs, limits=None, output=None, expected_outputs=None,
+              fail_fast=False, order=None, benchmark=None):
+    """
+    Test girişlerine göre fonksiyonu çalıştırır ve sonuçları değerlendirir.
+
+    Args:
+        user_function (Callable): Öğrencinin fonksiyonu.
+        solution_function (Callable): Referans çözüm fonksiyonu.
+        test_inputs (list): Test girdileri.
+        limits (Optional[dict]): 'test_timeout' ve 'test_cpu_limit' (saniye) sınırları.
+            Verilmezse çağrılar sınırsız çalışır.
+        output (Optional[BoundedOutput]): Kullanıcı çıktısının yakalandığı nesne. Verilirse
+            her testin çıktısı sonuca eklenir.
+        expected_outputs (Optional[list]): Önbellekten gelen, encode_expected ile kodlanmış
+            beklenen çıktılar. Dolu olan testlerde referans çözüm çağrılmaz; boş (None)
+            yuvalar, kullanıcı fonksiyonundan önce girdinin kopyasıyla hesaplanan değerin
+            kodlanmış haliyle doldurulur.
+        fail_fast (bool): True ise ilk başarısız testte durulur; kalan testler çalıştırılmaz.
+        order (Optional[list]): Testlerin çalıştırılacağı indis sırası. Sonuçlar yine
+            özgün sıraya göre (test_1, test_2, ...) döndürülür.
+        benchmark (Optional[dict]): Performans testi ayarları (bkz. run_benchmark). Verilirse
+            tüm testler geçtikten sonra çalıştırılır ve sonucu 'benchmark' anahtarıyla
+            ek bir test olarak eklenir.
+
+    Her test sonucu, yalnızca kullanıcı fonksiyonunun çağrısını kapsayan 'metrics'
+    sözlüğünü (wall_ns, cpu_ns, peak_memory_bytes) içerir; referans çözümün süresi
+    bu ölçümlere dahil değildir.
+
+    Returns:
+        tuple: (test_results, passed_tests, failed_tests, all_correct, error_messages)
+    """
+    all_correct = True
+    passed_tests = 0
+    failed_tests = 0
+    test_results = {}
+    error_messages = []
+
+    for i in (order if order is not None else range(len(test_inputs))):
+        test_input = test_inputs[i]
+
+        # Test girişlerinin liste olduğundan emin ol
+        if not isinstance(test_input, list):
+            test_input = [test_input]
+
+        test_key = f"test_{i + 1}"
+        metrics = {}
+        test_results[test_key] = {"input": test_input, "passed": False, "status": STATUS_FAILED,
+                                  "metrics": metrics}
+        if output is not None:
+            output.reset()
+
+        try:
+            # Referans sonuç, kullanıcı kodu girdiyi değiştiremeden önce girdinin bir kopyasıyla hesaplanır
+            if expected_outputs is not None and expected_outputs[i] is not None:
+                expected_result = ast.literal_eval(expected_outputs[i])
+            else:
+                expected_result = solution_function(*copy.deepcopy(test_input))
+                if expected_outputs is not None:
+                    expected_outputs[i] = encode_expected(expected_result)
+            # Yalnızca kullanıcı çağrısı ölçülür
+            user_result = _call_with_limits(user_function, test_input, limits, metrics)
+
+            # Sonuçları karşılaştır
+            if user_result != expected_result:
+                all_correct = False
+                failed_tests += 1
+                test_results[test_key]["passed"] = False
+                test_results[test_key]["expected"] = _safe_value(expected_result)
+                test_results[test_key]["actual"] = _safe_value(user_result)
+                error_messages.append(
+                    f"Test başarısız: Girdi: {test_input}, Beklenen: {expected_result}, Alınan: {user_result}")
+            else:
+                passed_tests += 1
+                test_results[test_key]["passed"] = True
+                test_results[test_key]["status"] = STATUS_PASSED
+
+        except TestTimeout as e:
+            failed_tests += 1
+            test_results[test_key]["status"] = STATUS_TIMEOUT
+            test_results[test_key]["error"] = str(e)
+            error_messages.append(f"Zaman aşımı: Girdi: {test_input}, {str(e)}")
+            all_correct = False
+
+        except MemoryError:
+            failed_tests += 1
+            test_results[test_key]["status"] = STATUS_MEMORY_EXCEEDED
+            test_results[test_key]["error"] = "Bellek sınırı aşıldı"
+            error_messages.append(f"Bellek sınırı aşıldı: Girdi: {test_input}")
+            all_correct = False
+
+        except OutputLimitExceeded as e:
+            failed_tests += 1
+            test_results[test_key]["status"] = STATUS_OUTPUT_LIMIT
+            test_results[test_key]["error"] = str(e)
+            error_messages.append(f"Çıktı sınırı aşıldı: Girdi: {test_input}")
+            all_correct = False
+
+        except TypeError as e:
+            error_msg = str(e)
+            failed_tests += 1
+            test_results[test_key]["passed"] = False
+            test_results[test_key]["status"] = STATUS_ERROR
+            test_results[test_key]["error"] = error_msg
+
+            if "'builtin_function_or_method' object is not subscriptable" in error_msg:
+                # Hata konumunu bul
+                tb = traceback.extract_tb(e.__traceback__)
+                line_number = None
+
+                for frame in tb:
+                    if frame.filename == "<string>":
+                        line_number = frame.lineno
+                        break
+
+                line_info = f"Satır {line_number}: " if line_number else ""
+                error_messages.append(
+                    f"{line_info}Yerleşik fonksiyon/metot indeks notasyonu ile kullanılamaz. "
+                    "Örnek: 'max[0]' yerine 'max(liste)' kullanmalısınız."
+                )
+            else:
+                error_messages.append(f"Tip hatası: {error_msg}")
+            all_correct = False
+
+        except Exception as e:
+            failed_tests += 1
+            test_results[test_key]["passed"] = False
+            test_results[test_key]["status"] = STATUS_ERROR
+            test_results[test_key]["error"] = str(e)
+            error_messages.append(f"Çalışma zamanı hatası: {str(e)}")
+            all_correct = False
+
+        if output is not None and output.getvalue():
+            test_results[test_key]["output"] = output.getvalue()
+
+        if fail_fast and not all_correct:
+            break
+
+    if order is not None:
+        test_results = {f"test_{i + 1}": test_results[f"test_{i + 1}"]
+                        for i in range(len(test_inputs)) if f"test_{i + 1}" in test_results}
+
+    # Performans testi yalnızca doğru çalışan çözümler için anlamlıdır
+    if benchmark and all_correct:
+        benchmark_result = run_benchmark(user_function, solution_function, benchmark, limits)
+        test_results[BENCHMARK_KEY] = benchmark_result
+        if benchmark_result["passed"]:
+            passed_tests += 1
+        else:
+            failed_tests += 1
+            all_correct = False
+            error_messages.append(f"Performans testi başarısız: {benchmark_result['error']}")
+
+    return test_results, passed_tests, failed_tests, all_correct, error_messages
+
+
+def _fit_growth(sizes, times_ns):
+    """
+    Ölçülen sürelere log-log uzayında en küçük kareler doğrusu uydurur.
+
+    Args:
+        sizes (list): Girdi boyutları.
+        times_ns (list): Her boyut için ölçülen süreler (nanosaniye).
+
+    Returns:
+        float: Büyüme üssü k (süre ~ n^k). O(n) için ~1, O(n log n) için ~1.1, O(n²) için ~2.
+    """
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1)) for t in times_ns]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def _best_time(function, args, limits, repeats):
+    """Fonksiyonu girdinin kopyalarıyla `repeats` kez çağırır ve en kısa CPU süresini döndürür."""
+    best = None
+    for _ in range(max(1, repeats)):
+        metrics = {}
+        _call_with_limits(function, copy.deepcopy(args), limits, metrics)
+        best = metrics["cpu_ns"] if best is None else min(best, metrics["cpu_ns"])
+    return best
+
+
+def parse_benchmark_sizes(value):
+    """
+    Virgülle ayrılmış performans testi boyutlarını ayrıştırır.
+
+    Args:
+        value (str): Ör. "1000,2000,4000,8000".
+
+    Returns:
+        list: Pozitif tamsayı boyutlar.
+
+    Raises:
+        ValueError: Boyutlardan biri pozitif bir tamsayı değilse veya MIN_BENCHMARK_SIZES'tan
+            az boyut verildiyse.
+    """
+    parts = [part.strip() for part in (value or '').split(',')]
+    if not all(part.isdigit() and int(part) > 0 for part in parts) or len(parts) < MIN_BENCHMARK_SIZES:
+        raise ValueError(f"Girdi boyutları virgülle ayrılmış en az {MIN_BENCHMARK_SIZES} pozitif "
+                         f"tamsayı olmalıdır: {value!r}")
+    return [int(part) for part in parts]
+
+
+def run_benchmark(user_function, solution_function, benchmark, limits=None):
+    """
+    Kullanıcı fonksiyonunu büyüyen girdilerde referans çözümle karşılaştırır.
+
+    Her boyut için girdiler sorunun boyut üretecinden (sabit seed ile) elde edilir ve iki
+    fonksiyon da aynı girdinin kopyalarıyla çalıştırılır. Kullanıcı süresi her boyutta
+    referans süresinin `tolerance` katını aşarsa veya ölçülen büyüme üssü referansınkinden
+    `growth_tolerance` kadar fazlaysa (ör. O(n log n) beklenirken O(n²)) test başarısız olur.
+
+    Args:
+        user_function (Callable): Öğrencinin fonksiyonu.
+        solution_function (Callable): Referans çözüm fonksiyonu.
+        benchmark (dict): 'size_generator' (generate(n) fonksiyonunu tanımlayan kod),
+            'sizes', 'tolerance', 'growth_tolerance' ve 'repeats' ayarları.
+        limits (Optional[dict]): Kullanıcı çağrılarına uygulanacak test başına sınırlar.
+
+    Returns:
+        dict: 'passed', 'status', ölçülen süreler (ms), büyüme üsleri ve varsa 'error'
+        anahtarlarını içeren test sonucu.
+    """
+    sizes = sorted(int(n) for n in benchmark["sizes"])
+    tolerance = benchmark["tolerance"]
+    repeats = benchmark.get("repeats", 3)
+    entry = {"input": f"n = {', '.join(str(n) for n in sizes)}", "passed": False,
+             "status": STATUS_TOO_SLOW, "sizes": sizes}
+    if len(sizes) < MIN_BENCHMARK_SIZES:
+        entry.update(status=STATUS_ERROR, error=f"En az {MIN_BENCHMARK_SIZES} girdi boyutu gereklidir")
+        return entry
+
+    # Ölçümler tracemalloc yükünden etkilenmesin
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    generator_namespace = {}
+    try:
+        exec(benchmark["size_generator"], generator_namespace)
+        generate = generator_namespace["generate"]
+    except Exception as e:
+        entry.update(status=STATUS_ERROR, error=f"Boyut üreteci yüklenemedi: {str(e)}")
+        return entry
+
+    user_times = []
+    reference_times = []
+    for n in sizes:
+        try:
+            random.seed(n)
+            args = generate(n)
+            if not isinstance(args, (list, tuple)):
+                args = [args]
+            reference_ns = _best_time(solution_function, args, None, repeats)
+        except Exception as e:
+            entry.update(status=STATUS_ERROR, error=f"n={n} için referans ölçümü yapılamadı: {str(e)}")
+            return entry
+
+        try:
+            user_ns = _best_time(user_function, args, limits, repeats)
+        except TestTimeout as e:
+            entry.update(status=STATUS_TIMEOUT, error=f"n={n} boyutunda {str(e).lower()}")
+            return entry
+        except MemoryError:
+            entry.update(status=STATUS_MEMORY_EXCEEDED, error=f"n={n} boyutunda bellek sınırı aşıldı")
+            return entry
+        except Exception as e:
+            entry.update(status=STATUS_ERROR, error=f"n={n} boyutunda çalışma zamanı hatası: {str(e)}")
+            return entry
+
+        user_times.append(user_ns)
+        reference_times.append(reference_ns)
+        entry["user_times"] = [round(t / 1e6, 3) for t in user_times]
+        entry["reference_times"] = [round(t / 1e6, 3) for t in reference_times]
+
+        if user_ns > tolerance * reference_ns + BENCHMARK_TIME_FLOOR_NS:
+            entry["error"] = (f"n={n} boyutunda süre {user_ns / 1e6:.2f} ms, izin verilen "
+                              f"{tolerance} × {reference_ns / 1e6:.2f} ms")
+            return entry
+
+    entry["user_growth"] = round(_fit_growth(sizes, user_times), 2)
+    entry["reference_growth"] = round(_fit_growth(sizes, reference_times), 2)
+
+    # Çok kısa süren çözümlerde büyüme üssü gürültüden ibarettir
+    if (user_times[-1] > BENCHMARK_TIME_FLOOR_NS
+            and entry["user_growth"] > entry["reference_growth"] + benchmark["growth_tolerance"]):
+        entry["error"] = (f"süre girdiyle n^{entry['user_growth']} oranında büyüyor, "
+                          f"beklenen en fazla n^{entry['reference_growth']}")
+        return entry
+
+    entry.update(passed=True, status=STATUS_PASSED)
+    return entry
+
+
+def summarize_metrics(test_results):
+    """
+    Test başına ölçümleri gönderim geneli özet değerlere dönüştürür.
+
+    Args:
+        test_results (dict): run_tests tarafından döndürülen test sonuçları.
+
+    Returns:
+        dict: 'execution_time' ve 'cpu_time' (kullanıcı kodunun toplam süreleri, milisaniye)
+        ile 'peak_memory' (testler arasındaki en yüksek tepe bellek, KB; ölçülmediyse None).
+    """
+    metrics = [test.get("metrics") or {} for key, test in test_results.items() if key != BENCHMARK_KEY]
+    peaks = [m["peak_memory_bytes"] for m in metrics if "peak_memory_bytes" in m]
+    return {
+        "execution_time": round(sum(m.get("wall_ns", 0) for m in metrics) / 1e6, 3),
+        "cpu_time": round(sum(m.get("cpu_ns", 0) for m in metrics) / 1e6, 3),
+        "peak_memory": round(max(peaks) / 1024, 1) if peaks else None
+    }
+
+
+def _solution_source(job):
+    """İşteki önceden derlenmiş çözüm kodunu, yoksa kaynak metnini döndürür."""
+    if job.get('solution_bytecode'):
+        return marshal.loads(job['solution_bytecode'])
+    return job['solution_code']
+
+
+def execute_submission(job):
+    """
+    Sandbox işçisinde tek bir değerlendirme işini yürütür.
+
+    Kullanıcı kodu ve çözüm kodu ayrı namespace'lerde çalıştırılır, ardından testler
+    koşturulur. Dönen sözlük yalnızca JSON uyumlu değerler içerir, bu sayede üst
+    sürece güvenle gönderilebilir.
+
+    Args:
+        job (dict): 'code', 'solution_code', 'function_name' ve 'test_inputs'
+            anahtarlarını içeren iş tanımı. Kodlar girinti kontrolü ve seed
+            enjeksiyonu yapılmış halde gelmelidir. İsteğe bağlı 'limits' sözlüğü
+            'test_timeout', 'test_cpu_limit', 'memory_limit_mb' ve 'output_limit'
+            sınırlarını içerebilir. İsteğe bağlı 'expected_outputs' listesi önbellekteki
+            beklenen çıktıları, 'solution_bytecode' ise marshal ile serileştirilmiş
+            derlenmiş çözüm kodunu taşır. 'fail_fast', 'order' ve 'benchmark'
+            run_tests'e iletilir.
+
+    Returns:
+        dict: 'test_results', 'passed_tests', 'failed_tests', 'is_correct',
+        'errors', 'execution_time' (kullanıcı kodunun testlerdeki toplam duvar saati
+        süresi, milisaniye), 'cpu_time' (milisaniye) ve 'peak_memory' (KB)
+        anahtarlarını içeren sonuç. Öğrenci kodunun çalıştığı süreçte hesaplanan
+        beklenen çıktılar yalnızca bu değerlendirmede kullanılır, dışarı verilmez.
+    """
+    limits = job.get('limits') or {}
+    set_memory_limit(limits.get('memory_limit_mb'))
+
+    # Tepe bellek ölçümü için tracemalloc yalnızca istenirse açılır (ek yük getirir)
+    if limits.get('trace_memory') and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not limits.get('trace_memory') and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    # Kullanıcı çıktısı sınırlı bir tampona yönlendirilir
+    output = BoundedOutput(limits.get('output_limit'))
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    sys.stdout = sys.stderr = output
+    try:
+        return _execute(job, limits, output)
+    finally:
+        sys.stdout, sys.stderr = original_stdout, original_stderr
+        _restore_builtins()
+
+
+def _restore_builtins():
+    """Kullanıcı kodunun builtins üzerinde yaptığı değişiklikleri geri alır (işçi süreçleri yeniden kullanılır)."""
+    namespace = builtins.__dict__
+    for name in [name for name in namespace if name not in _PRISTINE_BUILTINS]:
+        del namespace[name]
+    for name, value in _PRISTINE_BUILTINS.items():
+        if namespace.get(name) is not value:
+            namespace[name] = value
+
+
+def _execute(job, limits, output):
+    """execute_submission'ın çıktı yönlendirmesi altında çalışan asıl gövdesi."""
+    function_name = job['function_name']
+    result = {
+        "test_results": {},
+        "passed_tests": 0,
+        "failed_tests": 0,
+        "is_correct": False,
+        "errors": [],
+        "execution_time": 0,
+        "cpu_time": 0,
+        "peak_memory": None
+    }
+
+    test_inputs = job['test_inputs']
+    expected_outputs = list(job.get('expected_outputs') or [])
+    if len(expected_outputs) != len(test_inputs):
+        expected_outputs = [None] * len(test_inputs)
+
+    # Çözüm fonksiyonunu çalıştırma (tüm çıktılar önbellekteyse ve performans testi yoksa gerek yok).
+    # Kullanıcı kodunun modül düzeyindeki değişiklikleri çözümü etkilemesin diye önce tanımlanır.
+    solution_function = None
+    if job.get('benchmark') or any(expected is None for expected in expected_outputs):
+        # Çözüm, kullanıcı kodunun builtins üzerinde yapacağı değişikliklerden etkilenmemesi için
+        # builtins'in özgün halinin bir kopyasıyla çalıştırılır
+        solution_namespace = {'__builtins__': dict(_PRISTINE_BUILTINS)}
+        exec(_solution_source(job), solution_namespace)
+        solution_function = solution_namespace.get(function_name)
+
+        if not solution_function:
+            result["errors"].append("Çözüm fonksiyonu bulunamadı")
+            return result
+
+    # Kullanıcı fonksiyonunu çalıştırma
+    user_namespace = {}
+    exec(job['code'], user_namespace)
+    user_function = user_namespace.get(function_name)
+
+    if user_function is None:
+        result["errors"].append(f"'{function_name}' adında bir fonksiyon bulunamadı")
+        return result
+
+    if not callable(user_function):
+        result["errors"].append(f"'{function_name}' çağrılabilir bir fonksiyon değil")
+        return result
+
+    # Testleri çalıştır ve değerlendir
+    test_results, passed, failed, is_all_correct, error_messages = run_tests(
+        user_function, solution_function, test_inputs, limits=limits, output=output,
+        expected_outputs=expected_outputs, fail_fast=job.get('fail_fast', False), order=job.get('order'),
+        benchmark=job.get('benchmark')
+    )
+
+    result["test_results"] = test_results
+    result["passed_tests"] = passed
+    result["failed_tests"] = failed
+    result["is_correct"] = is_all_correct
+    result["errors"].extend(error_messages)
+    result.update(summarize_metrics(test_results))
+    return result
+
+
+def compute_expected_outputs(job):
+    """
+    Referans çözümü test girdileriyle çalıştırıp kodlanmış beklenen çıktıları üretir.
+
+    Args:
+        job (dict): 'solution_code', 'function_name' ve 'test_inputs' anahtarlarını
+            içeren iş tanımı.
+
+    Returns:
+        dict: 'expected_outputs' listesi ve varsa 'errors' mesajları.
+    """
+    solution_namespace = {}
+    exec(_solution_source(job), solution_namespace)
+    solution_function = solution_namespace.get(job['function_name'])
+    if not solution_function:
+        return {"expected_outputs": None, "errors": ["Çözüm fonksiyonu bulunamadı"]}
+
+    outputs = []
+    errors = []
+    for test_input in job['test_inputs']:
+        if not isinstance(test_input, list):
+            test_input = [test_input]
+        try:
+            outputs.append(encode_expected(solution_function(*test_input)))
+        except Exception as e:
+            outputs.append(None)
+            errors.append(f"Çözüm fonksiyonu hata verdi: Girdi: {test_input}, {str(e)}")
+    return {"expected_outputs": outputs, "errors": errors}
+
+
+# Sandbox işçisinin çalıştırabileceği iş türleri
+TASKS = {
+    "evaluate": execute_submission,
+    "expected_outputs": compute_expected_outputs,
+}
@@ -0,0 +1,89 @@
+# app/services/expected_outputs.py
+"""
+Referans çözüm çıktılarının kalıcı önbelleği.
+
+Beklenen çıktılar (question id, sha256(solution_code + test_inputs)) anahtarı ile
+expected_output tablosunda tutulur. Fonksiyonlar hem FastAPI (SessionLocal) hem de
+Flask-SQLAlchemy (db.session) oturumlarıyla çalışabilmesi için ham SQL kullanır.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(solution_code, test_inputs):
+    """
+    Çözüm kodu ve test girdileri için önbellek anahtarı olarak kullanılan özeti hesaplar.
+
+    Args:
+        solution_code (str): Referans çözüm kodu.
+        test_inputs (str): JSON formatındaki test girdileri.
+
+    Returns:
+        str: 64 karakterlik SHA-256 özeti.
+    """
+    digest = hashlib.sha256()
+    digest.update((solution_code or '').encode('utf-8'))
+    digest.update(b'\0')
+    digest.update((test_inputs or '').encode('utf-8'))
+    return digest.hexdigest()
+
+
+def get_expected_outputs(session, question_id, solution_code, test_inputs):
+    """
+    Önbellekteki beklenen çıktıları döndürür.
+
+    Args:
+        session: SQLAlchemy oturumu.
+        question_id (int): Soru ID değeri.
+        solution_code (str): Referans çözüm kodu.
+        test_inputs (str): JSON formatındaki test girdileri.
+
+    Returns:
+        Optional[list]: Her test için repr() metni veya None içeren liste; kayıt yoksa None.
+    """
+    row = session.execute(text("""
+                               SELECT outputs
+                               FROM expected_output
+                               WHERE question_id = :question_id
+                                 AND content_hash = :content_hash
+                               """), {
+        "question_id": question_id,
+        "content_hash": content_hash(solution_code, test_inputs)
+    }).first()
+    if not row:
+        return None
+    try:
+        return json.loads(row.outputs)
+    except (TypeError, ValueError):
+        return None
+
+
+def store_expected_outputs(session, question_id, solution_code, test_inputs, outputs):
+    """
+    Sorunun beklenen çıktılarını kaydeder. Soruya ait eski kayıtlar silinir.
+
+    Args:
+        session: SQLAlchemy oturumu.
+        question_id (int): Soru ID değeri.
+        solution_code (str): Referans çözüm kodu.
+        test_inputs (str): JSON formatındaki test girdileri.
+        outputs (list): Her test için repr() metni veya None içeren liste.
+    """
+    session.execute(text("DELETE FROM expected_output WHERE question_id = :question_id"),
+                    {"question_id": question_id})
+    session.execute(text("""
+                         INSERT INTO expected_output (question_id, content_hash, outputs, created_at)
+                         VALUES (:question_id, :content_hash, :outputs, :created_at)
+                         """), {
+        "question_id": question_id,
+        "content_hash": content_hash(solution_code, test_inputs),
+        "outputs": json.dumps(outputs),
+        "created_at": datetime.utcnow()
+    })
+    session.commit()
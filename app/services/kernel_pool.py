@@ -0,0 +1,676 @@
+# app/services/kernel_pool.py
+"""
+Etkileşimli notebook çalıştırması için kullanıcı başına ayrı çekirdek (kernel) süreçleri.
+
+Her kullanıcının değişkenleri (namespace) web sürecinde değil, kendisine ait bir çekirdek
+sürecinde yaşar. Kod bir Pipe üzerinden çekirdeğe gönderilir; çekirdek stdout'a yazılanları
+kısa aralıklarla birleştirerek ve input() isteklerini aynı Pipe üzerinden geri yollar. Böylece eşzamanlı
+çalıştırmalar birbirinin çıktısını karıştırmaz, web sürecinin global sys.stdout ve
+builtins.input değerlerine dokunulmaz ve çalıştırmalar farklı çekirdeklere dağılır.
+
+Havuz, atama bekleyen birkaç ısıtılmış yedek çekirdek tutar, belirli süre kullanılmayan
+çekirdekleri kapatır ve kapasite dolduğunda en uzun süredir boşta olan çekirdeği
+sonlandırır. Her çekirdeğin bellek kullanımı (RSS) ölçülür; her çekirdek kendi bellek
+sınırıyla çalışır ve toplam kullanım bellek bütçesini aştığında boşta olan çekirdekler
+en az yakın zamanda kullanılandan başlayarak kapatılır.
+"""
+import ast
+import atexit
+import builtins
+import io
+import logging
+import multiprocessing
+import os
+import select
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from eventlet.hubs import trampoline
+except ImportError:  # eventlet olmadan (testler, FastAPI iş parçacıkları) select kullanılır
+    trampoline = None
+
+logger = logging.getLogger(__name__)
+
+# Çekirdeklerin başlangıçta içe aktaracağı modüller
+PRELOAD_MODULES = [
+    'app.services.kernel_pool',
+    'collections', 'itertools', 'functools', 'math', 'random', 'string', 're', 'json',
+]
+
+
+class KernelBusy(Exception):
+    """Kullanıcının çekirdeği önceki bir çalıştırmayla meşgul."""
+
+
+class KernelUnavailable(Exception):
+    """Kapasite dolu ve sonlandırılabilecek boşta bir çekirdek yok."""
+
+
+class KernelDied(Exception):
+    """Çekirdek süreci çalıştırma sırasında beklenmedik şekilde sonlandı."""
+
+
+class _ReadTimeout(Exception):
+    pass
+
+
+def wait_readable(conn, timeout=None):
+    """
+    Bağlantıda okunacak veri olana kadar bekler. eventlet kuruluysa yalnızca çağıran
+    greenlet bekler, diğer Socket.IO istemcileri çalışmaya devam eder.
+
+    Args:
+        conn: multiprocessing Connection nesnesi.
+        timeout (Optional[float]): Saniye cinsinden en uzun bekleme süresi.
+
+    Returns:
+        bool: Veri geldiyse True, süre dolduysa False.
+    """
+    if trampoline is not None:
+        try:
+            trampoline(conn.fileno(), read=True, timeout=timeout, timeout_exc=_ReadTimeout)
+            return True
+        except _ReadTimeout:
+            return False
+    readable, _, _ = select.select([conn.fileno()], [], [], timeout)
+    return bool(readable)
+
+
+def process_memory(pid):
+    """
+    Sürecin fiziksel bellek kullanımını (RSS) bayt cinsinden döndürür.
+
+    Args:
+        pid (int): Süreç kimliği.
+
+    Returns:
+        int: RSS; ölçülemezse 0.
+    """
+    try:
+        if psutil is not None:
+            return psutil.Process(pid).memory_info().rss
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except Exception:
+        return 0
+
+
+class StreamWriter(io.TextIOBase):
+    """
+    Çekirdekte sys.stdout yerine geçer ve çıktıyı parçalar halinde üst sürece gönderir.
+
+    Yazılanlar tamponda biriktirilir; tampon `chunk_size` karaktere ulaştığında veya ilk
+    yazmanın üzerinden `flush_interval` saniye geçtiğinde tek bir mesaj olarak gönderilir.
+    Böylece çok sayıda küçük print() çağrısı tek tek mesaja dönüşmez, uzun süren kodların
+    ilk çıktısı da en geç `flush_interval` sonra görünür. Gönderim Pipe'a yazıldığı için
+    üst süreç okumayı yavaşlatırsa kullanıcı kodu da yavaşlar (backpressure).
+    """
+
+    def __init__(self, conn, flush_interval=0.05, chunk_size=4096):
+        self._conn = conn
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+        self._buffer = []
+        self._size = 0
+        self._first_write = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        threading.Thread(target=self._run_flusher, name='stdout-flusher', daemon=True).start()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if not text:
+            return 0
+        with self._lock:
+            self._buffer.append(text)
+            self._size += len(text)
+            if self._first_write is None:
+                self._first_write = time.monotonic()
+                self._wakeup.set()
+            if self._size >= self.chunk_size:
+                self._flush_locked()
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def send(self, message):
+        """Bekleyen çıktıyı gönderdikten sonra bir kontrol mesajı (input isteği, bitiş) gönderir."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.send(message)
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        text = ''.join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        self._first_write = None
+        self._conn.send({"type": "stream", "text": text})
+
+    def _run_flusher(self):
+        """Tamponda `flush_interval` süresinden uzun bekleyen çıktıyı gönderir."""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while True:
+                with self._lock:
+                    if self._first_write is None:
+                        break
+                    remaining = self._first_write + self.flush_interval - time.monotonic()
+                    if remaining <= 0:
+                        try:
+                            self._flush_locked()
+                        except (EOFError, OSError):
+                            return
+                        break
+                time.sleep(remaining)
+
+
+def execute_code(code, namespace):
+    """
+    Kodu verilen namespace'te çalıştırır. Son deyim bir ifadeyse değeri, notebook
+    davranışına uygun olarak repr() ile yazdırılır.
+
+    Args:
+        code (str): Çalıştırılacak Python kodu.
+        namespace (dict): Kullanıcının global değişkenleri.
+    """
+    try:
+        parsed = ast.parse(code)
+    except SyntaxError:
+        # Hata mesajının kullanıcıya iletilmesi için normal şekilde çalıştır
+        exec(code, namespace)
+        return
+
+    last_expression = None
+    if parsed.body and isinstance(parsed.body[-1], ast.Expr):
+        last_expression = ast.Expression(parsed.body.pop().value)
+
+    if parsed.body:
+        exec(compile(parsed, '<string>', 'exec'), namespace)
+    if last_expression is not None:
+        result = eval(compile(last_expression, '<string>', 'eval'), namespace)
+        if result is not None:
+            print(repr(result))
+
+
+def _kernel_main(conn, memory_limit_mb=None, flush_interval=0.05, chunk_size=4096):
+    """
+    Çekirdek sürecin ana döngüsü. Kullanıcının namespace'i bu süreç boyunca korunur.
+
+    Args:
+        conn: Üst süreçle iletişim için kullanılan Pipe ucu.
+        memory_limit_mb (Optional[int]): Kullanıcı kodunun ayırabileceği ek bellek (MB).
+        flush_interval (float): Çıktının en fazla bekletileceği süre (saniye).
+        chunk_size (int): Tek mesajda gönderilecek çıktı boyutu (karakter).
+    """
+    from app.services.evaluator import set_memory_limit
+
+    set_memory_limit(memory_limit_mb)
+    namespace = {'__builtins__': builtins, '__name__': '__main__'}
+
+    stdout = StreamWriter(conn, flush_interval, chunk_size)
+
+    def kernel_input(prompt=''):
+        stdout.send({"type": "input_request", "prompt": str(prompt)})
+        while True:
+            message = conn.recv()
+            if message and message.get("type") == "input_reply":
+                return message.get("value", '')
+
+    namespace['input'] = kernel_input
+    sys.stdout = stdout
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        if message.get("type") != "execute":
+            continue
+
+        try:
+            execute_code(message["code"], namespace)
+        except MemoryError:
+            stdout.write("Bellek sınırı aşıldı")
+        except BaseException as e:
+            stdout.write(str(e))
+        sys.stdout = stdout
+        stdout.send({"type": "done"})
+
+
+class Kernel:
+    """
+    Bir kullanıcıya atanmış çekirdek süreci ve Pipe bağlantısı.
+
+    Attributes:
+        user_id: Çekirdeğin atandığı kullanıcı; yedekteyken None.
+        busy (bool): Çekirdekte bir çalıştırma sürüyorsa True.
+        session_id (Optional[str]): Süren çalıştırmayı başlatan Socket.IO oturumu.
+        pending_input (Optional[int]): Yanıt bekleyen input() isteğinin numarası.
+        last_used (float): Son kullanım zamanı (time.monotonic).
+        memory_bytes (int): Son ölçülen bellek kullanımı (RSS).
+    """
+
+    def __init__(self, context, memory_limit_mb=None, flush_interval=0.05, chunk_size=4096):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_kernel_main,
+                                       args=(child_conn, memory_limit_mb, flush_interval, chunk_size),
+                                       daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.user_id = None
+        self.busy = False
+        self.session_id = None
+        self.pending_input = None
+        self._input_requests = 0
+        self.last_used = time.monotonic()
+        self.memory_bytes = 0
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def measure(self):
+        """Çekirdeğin güncel bellek kullanımını ölçer ve döndürür."""
+        self.memory_bytes = process_memory(self.pid) if self.is_alive() else 0
+        return self.memory_bytes
+
+    def execute(self, code, on_output, on_input_request, session_id=None):
+        """
+        Kodu çekirdekte çalıştırır ve bitene kadar gelen mesajları geri çağırmalara iletir.
+
+        Args:
+            code (str): Çalıştırılacak Python kodu.
+            on_output (Callable[[str], None]): Her stdout parçası için çağrılır.
+            on_input_request (Callable[[str, int], None]): Kod input() çağırdığında istem metni ve
+                istek numarasıyla çağrılır; yanıt KernelPool.send_input ile gönderilir.
+            session_id (Optional[str]): Çalıştırmayı başlatan oturum. Verilirse input() yanıtları
+                yalnızca bu oturumdan kabul edilir.
+
+        Raises:
+            KernelDied: Çekirdek süreci çalıştırma sırasında sonlanırsa.
+        """
+        self.session_id = session_id
+        try:
+            self.conn.send({"type": "execute", "code": code})
+            while True:
+                wait_readable(self.conn)
+                message = self.conn.recv()
+                message_type = message.get("type")
+                if message_type == "stream":
+                    on_output(message["text"])
+                elif message_type == "input_request":
+                    self._input_requests += 1
+                    self.pending_input = self._input_requests
+                    on_input_request(message["prompt"], self.pending_input)
+                elif message_type == "done":
+                    return
+        except (EOFError, OSError) as e:
+            raise KernelDied("Çalışma ortamı beklenmedik şekilde sonlandı, değişkenler sıfırlandı.") from e
+        finally:
+            self.pending_input = None
+            self.session_id = None
+
+    def send_input(self, value, session_id=None, request_id=None):
+        """
+        Bekleyen input() çağrısına yanıt gönderir. Yanıt başka bir oturumdan geliyorsa veya
+        artık beklenmeyen (eski) bir isteğe aitse yok sayılır.
+
+        Args:
+            value (str): Kullanıcının girdiği değer.
+            session_id (Optional[str]): Yanıtı gönderen oturum.
+            request_id (Optional[int]): Yanıtlanan input() isteğinin numarası.
+
+        Returns:
+            bool: Yanıt bekleyen input() çağrısına iletildiyse True.
+        """
+        if self.pending_input is None:
+            return False
+        if self.session_id is not None and session_id != self.session_id:
+            return False
+        if request_id is not None and request_id != self.pending_input:
+            return False
+        self.pending_input = None
+        try:
+            self.conn.send({"type": "input_reply", "value": value})
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def stop(self, kill=False):
+        """Çekirdeği durdurur. `kill` True ise beklemeden sonlandırır."""
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1)
+        self.conn.close()
+
+
+class KernelPool:
+    """
+    Kullanıcılara çekirdek atayan, boşta kalanları kapatan ve yedek çekirdekleri ısıtan havuz.
+
+    Attributes:
+        max_kernels (int): Aynı anda kullanıcılara atanmış en fazla çekirdek sayısı.
+        idle_timeout (float): Bu süre (saniye) kullanılmayan çekirdekler kapatılır.
+        spares (int): Atanmayı bekleyen ısıtılmış çekirdek sayısı.
+        cull_interval (float): Boşta çekirdek ve bellek kontrolünün yapılma aralığı (saniye).
+        memory_limit_mb (Optional[int]): Tek bir çekirdekte kullanıcı kodunun ayırabileceği ek bellek (MB).
+        memory_budget (int): Tüm çekirdeklerin toplam RSS bütçesi (bayt). 0 ise sınırsız.
+        flush_interval (float): Çekirdek çıktısının en fazla bekletileceği süre (saniye).
+        chunk_size (int): Çekirdek çıktısının tek mesajda gönderilecek boyutu (karakter).
+    """
+
+    def __init__(self, max_kernels=32, idle_timeout=900, spares=2, cull_interval=30,
+                 memory_limit_mb=None, memory_budget_mb=0, flush_interval=0.05, chunk_size=4096):
+        self.max_kernels = max(1, int(max_kernels))
+        self.idle_timeout = idle_timeout
+        self.spares = max(0, int(spares))
+        self.cull_interval = cull_interval
+        self.memory_limit_mb = memory_limit_mb
+        self.memory_budget = int(memory_budget_mb or 0) * 1024 * 1024
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+        self._context = self._create_context()
+        self._kernels = {}
+        self._spares = []
+        self._evictions = {"idle": 0, "capacity": 0, "memory": 0}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    @staticmethod
+    def _create_context():
+        """Mümkünse forkserver, değilse spawn tabanlı multiprocessing bağlamı oluşturur."""
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(PRELOAD_MODULES)
+            return context
+        return multiprocessing.get_context('spawn')
+
+    def start(self):
+        """Bakım iş parçacığını (yedek ısıtma ve boşta çekirdek kapatma) başlatır."""
+        with self._lock:
+            if self._closed or (self._thread and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run_maintenance, name='kernel-pool', daemon=True)
+            self._thread.start()
+
+    def _run_maintenance(self):
+        while not self._closed:
+            self._replenish()
+            self.cull_idle()
+            self.enforce_memory_budget()
+            self._wakeup.wait(self.cull_interval)
+            self._wakeup.clear()
+
+    def _replenish(self):
+        """Yedek çekirdek sayısını hedefe tamamlar."""
+        while True:
+            with self._lock:
+                if self._closed or len(self._spares) >= self.spares:
+                    return
+            kernel = self._new_kernel()
+            with self._lock:
+                if not self._closed:
+                    self._spares.append(kernel)
+                    continue
+            kernel.stop(kill=True)
+            return
+
+    def _new_kernel(self):
+        return Kernel(self._context, self.memory_limit_mb, self.flush_interval, self.chunk_size)
+
+    def acquire(self, user_id):
+        """
+        Kullanıcının çekirdeğini çalıştırma için ayırır; yoksa yedekten veya yeni bir
+        süreçle atar. Kapasite doluysa en uzun süredir boşta olan çekirdek kapatılır.
+
+        Args:
+            user_id: Kullanıcı kimliği.
+
+        Returns:
+            Kernel: Meşgul olarak işaretlenmiş çekirdek; işi bitince release ile bırakılmalıdır.
+
+        Raises:
+            KernelBusy: Kullanıcının önceki çalıştırması sürüyorsa.
+            KernelUnavailable: Kapasite dolu ve tüm çekirdekler meşgulse.
+        """
+        self.start()
+        evicted = []
+        with self._lock:
+            kernel = self._kernels.get(user_id)
+            if kernel is not None and not kernel.is_alive():
+                del self._kernels[user_id]
+                evicted.append(kernel)
+                kernel = None
+            if kernel is not None and kernel.busy:
+                raise KernelBusy("Önceki kod hâlâ çalışıyor")
+
+            if kernel is None:
+                if len(self._kernels) >= self.max_kernels:
+                    idle = [k for k in self._kernels.values() if not k.busy]
+                    if not idle:
+                        raise KernelUnavailable("Şu anda tüm çalışma ortamları dolu, lütfen biraz sonra tekrar deneyin")
+                    victim = min(idle, key=lambda k: k.last_used)
+                    del self._kernels[victim.user_id]
+                    evicted.append(victim)
+                    self._evictions["capacity"] += 1
+                kernel = None
+                while self._spares and kernel is None:
+                    kernel = self._spares.pop()
+                    if not kernel.is_alive():
+                        evicted.append(kernel)
+                        kernel = None
+                kernel = kernel or self._new_kernel()
+                kernel.user_id = user_id
+                self._kernels[user_id] = kernel
+                self._wakeup.set()
+
+            kernel.busy = True
+            kernel.last_used = time.monotonic()
+
+        for victim in evicted:
+            victim.stop(kill=True)
+        return kernel
+
+    def release(self, kernel):
+        """
+        Çalıştırması biten çekirdeği boşta olarak işaretler ve belleğini ölçer; süreci ölmüşse
+        havuzdan çıkarır. Toplam bellek bütçeyi aşıyorsa bakım iş parçacığı hemen uyandırılır.
+        """
+        kernel.measure()
+        if self.memory_budget and self.memory_bytes() > self.memory_budget:
+            self._wakeup.set()
+        with self._lock:
+            kernel.busy = False
+            kernel.last_used = time.monotonic()
+            if not kernel.is_alive() and self._kernels.get(kernel.user_id) is kernel:
+                del self._kernels[kernel.user_id]
+            else:
+                kernel = None
+        if kernel is not None:
+            kernel.stop(kill=True)
+
+    def send_input(self, user_id, value, session_id=None, request_id=None):
+        """
+        Kullanıcının bekleyen input() çağrısına yanıt gönderir. Kanal kullanıcı ve oturum
+        ile belirlenir; aynı kullanıcının başka bir sekmesi bekleyen isteği yanıtlayamaz.
+
+        Returns:
+            bool: Yanıt bekleyen input() çağrısına iletildiyse True.
+        """
+        kernel = self._kernels.get(user_id)
+        return kernel.send_input(value, session_id, request_id) if kernel is not None else False
+
+    def cancel(self, user_id, session_id):
+        """
+        Oturum kapandığında o oturumun başlattığı çalıştırmayı (ör. input() bekleyen veya
+        sonsuz döngüdeki kodu) çekirdeği kapatarak sonlandırır.
+
+        Returns:
+            bool: Sonlandırılan bir çalıştırma varsa True.
+        """
+        with self._lock:
+            kernel = self._kernels.get(user_id)
+            if kernel is None or not kernel.busy or kernel.session_id != session_id:
+                return False
+            del self._kernels[user_id]
+        kernel.stop(kill=True)
+        return True
+
+    def reset(self, user_id):
+        """Kullanıcının çekirdeğini kapatır; sonraki çalıştırma boş bir namespace ile başlar."""
+        with self._lock:
+            kernel = self._kernels.pop(user_id, None)
+        if kernel is not None:
+            kernel.stop(kill=True)
+
+    def cull_idle(self):
+        """
+        idle_timeout süresinden uzun süredir kullanılmayan çekirdekleri kapatır.
+
+        Returns:
+            int: Kapatılan çekirdek sayısı.
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle = [kernel for kernel in self._kernels.values()
+                    if not kernel.busy and (now - kernel.last_used > self.idle_timeout or not kernel.is_alive())]
+            for kernel in idle:
+                del self._kernels[kernel.user_id]
+            self._evictions["idle"] += len(idle)
+        for kernel in idle:
+            kernel.stop(kill=True)
+        if idle:
+            logger.info(f"{len(idle)} boşta çekirdek kapatıldı")
+        return len(idle)
+
+    def memory_bytes(self):
+        """Kullanıcılara atanmış çekirdeklerin son ölçülen toplam bellek kullanımını döndürür."""
+        return sum(kernel.memory_bytes for kernel in list(self._kernels.values()))
+
+    def enforce_memory_budget(self):
+        """
+        Tüm çekirdeklerin belleğini ölçer; toplam bütçeyi aşıyorsa boşta olan çekirdekleri en
+        az yakın zamanda kullanılandan başlayarak kapatır. Çalışan çekirdeklere dokunulmaz.
+
+        Returns:
+            int: Kapatılan çekirdek sayısı.
+        """
+        for kernel in list(self._kernels.values()):
+            kernel.measure()
+        if not self.memory_budget:
+            return 0
+
+        with self._lock:
+            total = sum(kernel.memory_bytes for kernel in self._kernels.values())
+            victims = []
+            for kernel in sorted(self._kernels.values(), key=lambda k: k.last_used):
+                if total <= self.memory_budget:
+                    break
+                if kernel.busy:
+                    continue
+                del self._kernels[kernel.user_id]
+                victims.append(kernel)
+                total -= kernel.memory_bytes
+            self._evictions["memory"] += len(victims)
+        for kernel in victims:
+            kernel.stop(kill=True)
+        if victims:
+            logger.warning(f"Bellek bütçesi aşıldı, {len(victims)} boşta çekirdek kapatıldı")
+        return len(victims)
+
+    def status(self):
+        """
+        Havuzun durumunu döndürür.
+
+        Returns:
+            dict: 'kernels', 'busy', 'spares', 'max_kernels', 'memory_bytes', 'memory_budget_bytes',
+            'evictions' (kapatılma nedenine göre sayılar) ve 'users' (kullanıcı başına bellek
+            kullanımı, büyükten küçüğe) anahtarları.
+        """
+        now = time.monotonic()
+        with self._lock:
+            kernels = sorted(self._kernels.values(), key=lambda k: k.memory_bytes, reverse=True)
+            return {
+                "kernels": len(kernels),
+                "busy": sum(1 for kernel in kernels if kernel.busy),
+                "spares": len(self._spares),
+                "max_kernels": self.max_kernels,
+                "memory_bytes": sum(kernel.memory_bytes for kernel in kernels),
+                "memory_budget_bytes": self.memory_budget,
+                "evictions": dict(self._evictions),
+                "users": [{
+                    "user_id": kernel.user_id,
+                    "memory_bytes": kernel.memory_bytes,
+                    "idle_seconds": 0 if kernel.busy else round(now - kernel.last_used, 1),
+                    "busy": kernel.busy
+                } for kernel in kernels]
+            }
+
+    def shutdown(self):
+        """Tüm çekirdek süreçleri durdurur."""
+        with self._lock:
+            self._closed = True
+            kernels = list(self._kernels.values()) + self._spares
+            self._kernels = {}
+            self._spares = []
+        self._wakeup.set()
+        for kernel in kernels:
+            kernel.stop(kill=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_kernel_pool():
+    """
+    Uygulama genelinde paylaşılan KernelPool örneğini döndürür, yoksa Config ayarlarıyla oluşturur.
+
+    Returns:
+        KernelPool: Paylaşılan havuz örneği.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from config import Config
+                _pool = KernelPool(
+                    max_kernels=Config.NOTEBOOK_KERNEL_MAX,
+                    idle_timeout=Config.NOTEBOOK_KERNEL_IDLE_TIMEOUT,
+                    spares=Config.NOTEBOOK_KERNEL_SPARES,
+                    memory_limit_mb=Config.NOTEBOOK_KERNEL_MEMORY_LIMIT_MB,
+                    memory_budget_mb=Config.NOTEBOOK_KERNEL_MEMORY_BUDGET_MB,
+                    flush_interval=Config.NOTEBOOK_OUTPUT_FLUSH_MS / 1000,
+                    chunk_size=Config.NOTEBOOK_OUTPUT_CHUNK_KB * 1024
+                )
+                atexit.register(_pool.shutdown)
+    return _pool
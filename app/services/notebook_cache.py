@@ -0,0 +1,91 @@
+# app/services/notebook_cache.py
+"""
+Ayrıştırılmış notebook'ların (NotebookNode) süreç içi LRU önbelleği.
+
+Notebook görüntüleme, özet sayfası ve /api/notebook-summary aynı önbelleği paylaşır;
+böylece bir notebook her istekte yeniden ayrıştırılmaz. Kayıtlar notebook yolu ile
+saklanır ve dosyanın sürümüyle (katalogdaki git blob özeti, katalog güncel değilse
+değiştirilme zamanı ve boyut) doğrulanır; dosya değişmişse yeniden okunur.
+Döndürülen NotebookNode nesneleri paylaşıldığı için çağıranlar tarafından
+değiştirilmemelidir.
+"""
+import hashlib
+import os
+import threading
+
+import nbformat
+
+from app.services.notebook_catalog import get_notebook_catalog, is_current
+from app.utils.cache import LRUCache
+
+
+def notebook_version(notebook_path, stat):
+    """
+    Notebook dosyasının sürüm anahtarını döndürür.
+
+    Katalogdaki kayıt dosyanın mevcut boyutu ve değiştirilme zamanıyla eşleşiyorsa git
+    blob özeti, aksi halde değiştirilme zamanı, boyut ve yolun özetinden oluşan bir anahtar
+    kullanılır. Yol özeti, aynı anda yazılmış aynı boyuttaki farklı notebook'ların (ör. tek
+    bir git checkout ile gelenler) HTML disk önbelleğinde çakışmasını önler.
+
+    Args:
+        notebook_path (str): Notebook'un depo köküne göre yolu.
+        stat (os.stat_result): Dosyanın güncel bilgisi.
+
+    Returns:
+        str: Sürüm anahtarı.
+    """
+    entry = get_notebook_catalog().get(notebook_path)
+    if is_current(entry, stat):
+        return entry['blob_hash']
+    path_hash = hashlib.sha1(notebook_path.encode('utf-8')).hexdigest()[:12]
+    return f"{stat.st_mtime_ns}-{stat.st_size}-{path_hash}"
+
+
+def load_notebook(repo_dir, notebook_path):
+    """
+    Notebook'u önbellekten döndürür; önbellekte yoksa veya dosya değişmişse bir kez
+    ayrıştırıp önbelleğe ekler.
+
+    Args:
+        repo_dir (str): Depo kök dizini.
+        notebook_path (str): Notebook'un depo köküne göre yolu.
+
+    Returns:
+        tuple: (NotebookNode, sürüm anahtarı)
+
+    Raises:
+        FileNotFoundError: Dosya mevcut değilse.
+    """
+    full_path = os.path.join(repo_dir, notebook_path)
+    version = notebook_version(notebook_path, os.stat(full_path))
+
+    cache = get_notebook_cache()
+    cached = cache.get(notebook_path)
+    if cached is not None and cached[0] == version:
+        return cached[1], version
+
+    with open(full_path, 'r', encoding='utf-8') as f:
+        notebook = nbformat.read(f, as_version=4)
+    cache.set(notebook_path, (version, notebook))
+    return notebook, version
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_notebook_cache():
+    """
+    Uygulama genelinde paylaşılan notebook önbelleğini döndürür.
+
+    Returns:
+        LRUCache: Notebook yolu -> (sürüm, NotebookNode) önbelleği.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from config import Config
+                _cache = LRUCache(max_size=Config.NOTEBOOK_CACHE_SIZE)
+    return _cache
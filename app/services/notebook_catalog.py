@@ -0,0 +1,336 @@
+# app/services/notebook_catalog.py
+"""
+Notebook deposunun bellek içi kataloğu.
+
+Katalog her depo eşitlemesinden sonra bir kez oluşturulur; ana sayfa listesi ve özet
+doldurma işlemleri dosya sistemini taramak yerine bu katalogdan okur. Değişmeyen
+dosyalar (boyut ve değiştirilme zamanı aynı) yeniden okunmaz. Her kayıt, hücrelerin
+normalleştirilmiş içeriğinin özetini (content_hash) de taşır; notebook özetleri bu
+değerle eskiyip eskimediklerine karar verir. Katalog ayrıca
+notebook_catalog tablosuna yazılır, böylece uygulama yeniden başladığında depo
+taranmadan yüklenebilir. Tablo işlemleri hem FastAPI hem Flask-SQLAlchemy
+oturumlarıyla çalışabilmesi için ham SQL kullanır.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+_HEADING_PATTERN = re.compile(r'^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$')
+
+# Katalog kaydındaki alanlar (notebook_catalog tablosunun sütunlarıyla aynı)
+FIELDS = ('notebook_path', 'title', 'size', 'mtime', 'mtime_ns', 'cell_count', 'code_cell_count',
+          'markdown_cell_count', 'first_heading', 'blob_hash', 'content_hash')
+
+
+def is_current(entry, stat):
+    """
+    Katalog kaydının dosyanın güncel boyutu ve nanosaniye duyarlıklı değiştirilme zamanıyla
+    eşleşip eşleşmediğini döndürür. mtime_ns sütunu eklenmeden önce yazılmış kayıtlar
+    güncel sayılmaz.
+
+    Args:
+        entry (Optional[dict]): Katalog kaydı.
+        stat (os.stat_result): Dosyanın güncel bilgisi.
+
+    Returns:
+        bool: Kayıt dosyanın bu sürümüne aitse True.
+    """
+    return bool(entry) and entry['size'] == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns
+
+
+def git_blob_hash(data):
+    """
+    İçeriğin git blob SHA-1 özetini hesaplar (`git hash-object` ile aynı değer).
+
+    Args:
+        data (bytes): Dosya içeriği.
+
+    Returns:
+        str: 40 karakterlik onaltılık özet.
+    """
+    digest = hashlib.sha1(f"blob {len(data)}\0".encode('ascii'))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def content_hash(cells):
+    """
+    Hücrelerin türü ve kaynak koduyla hesaplanan içerik özetini döndürür. Çıktılar, çalıştırma
+    sayıları ve metadata dahil edilmez, satır sonları ve baştaki/sondaki boşluklar
+    normalleştirilir; böylece yalnızca yeniden çalıştırılan bir notebook'un özeti değişmez.
+
+    Args:
+        cells (list): Hücre sözlükleri (ham JSON veya nbformat hücreleri).
+
+    Returns:
+        str: 64 karakterlik SHA-256 özeti.
+    """
+    digest = hashlib.sha256()
+    for cell in cells:
+        source = cell.get('source') or ''
+        if isinstance(source, list):
+            source = ''.join(source)
+        digest.update((cell.get('cell_type') or '').encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(source.replace('\r\n', '\n').strip().encode('utf-8'))
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+def _first_heading(cells):
+    """Markdown hücrelerindeki ilk başlığın metnini döndürür, yoksa None."""
+    for cell in cells:
+        if cell.get('cell_type') != 'markdown':
+            continue
+        source = cell.get('source') or ''
+        if isinstance(source, list):
+            source = ''.join(source)
+        for line in source.splitlines():
+            match = _HEADING_PATTERN.match(line)
+            if match:
+                return match.group(1)[:255]
+    return None
+
+
+def read_cells(data, notebook_path=''):
+    """
+    Notebook dosyasının içeriğinden hücre listesini nbformat 4 biçiminde çıkarır.
+
+    nbformat 4 dosyalarının hücreleri doğrudan JSON'dan okunur. nbformat 3 dosyaları
+    (kod hücrelerinde 'input', ayrı 'heading' hücreleri) nbformat ile 4'e dönüştürülür;
+    böylece content_hash, notebook'u nbformat.read(as_version=4) ile okuyan yerlerle
+    aynı hücreler üzerinden hesaplanır.
+
+    Args:
+        data (bytes): Dosya içeriği.
+        notebook_path (str): Uyarı mesajında kullanılacak notebook yolu.
+
+    Returns:
+        list: Hücre sözlükleri; içerik ayrıştırılamazsa boş liste.
+    """
+    try:
+        text_data = data.decode('utf-8')
+        cells = json.loads(text_data).get('cells')
+        if cells is None:  # nbformat 3 (nbformat yalnızca bu nadir durumda gerekir)
+            import nbformat
+            cells = nbformat.reads(text_data, as_version=4).cells
+        return cells
+    except Exception:
+        logger.warning(f"Notebook ayrıştırılamadı: {notebook_path}")
+        return []
+
+
+def read_entry(repo_dir, notebook_path, stat=None):
+    """
+    Tek bir notebook dosyasını okuyup katalog kaydını oluşturur.
+
+    Args:
+        repo_dir (str): Depo kök dizini.
+        notebook_path (str): Notebook'un depo köküne göre yolu.
+        stat (Optional[os.stat_result]): Önceden alınmış dosya bilgisi.
+
+    Returns:
+        dict: FIELDS anahtarlarını içeren katalog kaydı.
+    """
+    full_path = os.path.join(repo_dir, notebook_path)
+    stat = stat or os.stat(full_path)
+    with open(full_path, 'rb') as f:
+        data = f.read()
+
+    cells = read_cells(data, notebook_path)
+    first_heading = _first_heading(cells)
+    return {
+        'notebook_path': notebook_path,
+        'title': first_heading or os.path.splitext(os.path.basename(notebook_path))[0],
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'mtime_ns': stat.st_mtime_ns,
+        'cell_count': len(cells),
+        'code_cell_count': sum(1 for cell in cells if cell.get('cell_type') == 'code'),
+        'markdown_cell_count': sum(1 for cell in cells if cell.get('cell_type') == 'markdown'),
+        'first_heading': first_heading,
+        'blob_hash': git_blob_hash(data),
+        'content_hash': content_hash(cells)
+    }
+
+
+class NotebookCatalog:
+    """
+    Depodaki notebook'ların iş parçacığı güvenli, bellek içi kataloğu.
+
+    Attributes:
+        repo_dir (str): Depo kök dizini.
+        version (int): Katalog her yeniden oluşturulduğunda veya yüklendiğinde artar.
+    """
+
+    def __init__(self, repo_dir):
+        self.repo_dir = repo_dir
+        self.version = 0
+        self._entries = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        """Kataloğun bellekte olup olmadığını döndürür."""
+        return self._entries is not None
+
+    def entries(self):
+        """Katalog kayıtlarını yola göre sıralı bir liste olarak döndürür."""
+        entries = self._entries or {}
+        return [entries[path] for path in sorted(entries)]
+
+    def paths(self):
+        """Katalogdaki notebook yollarını sıralı olarak döndürür."""
+        return sorted(self._entries or {})
+
+    def get(self, notebook_path):
+        """Bir notebook'un katalog kaydını döndürür, yoksa None."""
+        return (self._entries or {}).get(notebook_path)
+
+    def rebuild(self):
+        """
+        Depoyu bir kez tarayarak kataloğu yeniden oluşturur. Boyutu ve değiştirilme zamanı
+        değişmeyen dosyalar için önceki kayıt yeniden kullanılır.
+
+        Returns:
+            int: Yeniden okunan (yeni veya değişmiş) notebook sayısı.
+        """
+        with self._lock:
+            previous = self._entries or {}
+            entries = {}
+            changed = 0
+            for root, dirs, files in os.walk(self.repo_dir):
+                dirs[:] = [d for d in dirs if d != '.git']
+                for file in files:
+                    if not file.endswith('.ipynb'):
+                        continue
+                    full_path = os.path.join(root, file)
+                    notebook_path = os.path.relpath(full_path, self.repo_dir)
+                    try:
+                        stat = os.stat(full_path)
+                        entry = previous.get(notebook_path)
+                        if not is_current(entry, stat) or not entry.get('content_hash'):
+                            entry = read_entry(self.repo_dir, notebook_path, stat)
+                            changed += 1
+                    except OSError as e:
+                        logger.warning(f"Notebook okunamadı: {notebook_path}: {str(e)}")
+                        continue
+                    entries[notebook_path] = entry
+
+            self._entries = entries
+            self.version += 1
+        logger.info(f"Notebook kataloğu oluşturuldu: {len(entries)} notebook, {changed} yeniden okundu")
+        return changed
+
+    def load(self, session):
+        """
+        Kataloğu notebook_catalog tablosundan yükler.
+
+        Args:
+            session: SQLAlchemy oturumu.
+
+        Returns:
+            bool: Tabloda kayıt bulunduysa True.
+        """
+        rows = session.execute(text(f"SELECT {', '.join(FIELDS)} FROM notebook_catalog")).fetchall()
+        if not rows:
+            return False
+        with self._lock:
+            self._entries = {row.notebook_path: {field: getattr(row, field) for field in FIELDS} for row in rows}
+            self.version += 1
+        return True
+
+    def persist(self, session):
+        """
+        Bellekteki kataloğu notebook_catalog tablosuna yazar (tablo tamamen yenilenir).
+
+        Args:
+            session: SQLAlchemy oturumu. İşlem bu fonksiyon içinde commit edilir.
+        """
+        entries = self.entries()
+        now = datetime.utcnow()
+        try:
+            session.execute(text("DELETE FROM notebook_catalog"))
+            if entries:
+                session.execute(text(f"""
+                    INSERT INTO notebook_catalog ({', '.join(FIELDS)}, indexed_at)
+                    VALUES ({', '.join(':' + field for field in FIELDS)}, :indexed_at)
+                """), [dict(entry, indexed_at=now) for entry in entries])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Notebook kataloğu kaydedilemedi: {str(e)}")
+
+    def refresh(self, session):
+        """Kataloğu depodan yeniden oluşturur ve tabloya yazar."""
+        self.rebuild()
+        self.persist(session)
+
+    def ensure_loaded(self, session):
+        """
+        Katalog bellekte yoksa önce tablodan, tablo boşsa depodan yükler.
+
+        Args:
+            session: SQLAlchemy oturumu.
+
+        Returns:
+            bool: Katalog kullanılabilir durumdaysa True; depo henüz yoksa False.
+        """
+        if self.loaded:
+            return True
+        try:
+            if self.load(session):
+                return True
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Notebook kataloğu tablodan yüklenemedi: {str(e)}")
+        if not os.path.isdir(self.repo_dir):
+            return False
+        self.refresh(session)
+        return True
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_notebook_catalog():
+    """
+    Uygulama genelinde paylaşılan NotebookCatalog örneğini döndürür.
+
+    Returns:
+        NotebookCatalog: Paylaşılan katalog örneği.
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                from app.services.repo_sync import get_repo_sync
+                _catalog = NotebookCatalog(get_repo_sync().repo_dir)
+    return _catalog
+
+
+def register_catalog_refresh(app, db):
+    """
+    Her başarılı depo eşitlemesinden sonra kataloğun uygulama bağlamında yeniden
+    oluşturulup kaydedilmesini sağlar.
+
+    Args:
+        app (Flask): Uygulama bağlamını sağlayan Flask nesnesi.
+        db: Flask-SQLAlchemy nesnesi.
+    """
+    from app.services.repo_sync import get_repo_sync
+
+    def refresh(repo_dir):
+        with app.app_context():
+            get_notebook_catalog().refresh(db.session)
+
+    get_repo_sync().add_listener(refresh)
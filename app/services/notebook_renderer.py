@@ -0,0 +1,226 @@
+# app/services/notebook_renderer.py
+"""
+Notebook hücrelerinin önceden HTML'e dönüştürülmesi ve sürüm bazında önbelleğe alınması.
+
+Markdown hücreleri ve hücre çıktıları nbconvert filtreleriyle sunucu tarafında HTML'e
+çevrilir. Üretilen parça notebook'un sürümüyle (git blob özeti) adlandırılarak diskte
+saklanır ve ayrıca bellekte tutulur; depo eşitlemesinden sonra değişen notebook'lar
+arka planda yeniden oluşturulur. Böylece görüntüleme isteği yalnızca hazır bir
+dosyayı döndürür ve ETag ile tarayıcı önbelleğinden karşılanabilir.
+"""
+import base64
+import html
+import logging
+import os
+import threading
+
+from nbconvert.filters import ansi2html, markdown2html
+
+from app.services.notebook_cache import load_notebook
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Üretilen HTML'in yapısı değiştiğinde artırılır; eski dosyalar kullanılmaz
+RENDER_FORMAT_VERSION = 1
+
+_CELL_CLASSES = {
+    'code': 'mb-6 pl-4 border-l-4 border-blue-500',
+    'markdown': 'mb-6 pl-4 border-l-4 border-green-500',
+}
+
+
+def _source(value):
+    """nbformat kaynak alanını (metin veya satır listesi) metne çevirir."""
+    return ''.join(value) if isinstance(value, list) else (value or '')
+
+
+def _render_output(output):
+    """Tek bir hücre çıktısını HTML'e çevirir."""
+    output_type = output.get('output_type')
+    if output_type == 'stream':
+        return f'<pre class="nb-stream text-gray-800 dark:text-gray-200">{ansi2html(_source(output.get("text")))}</pre>'
+    if output_type == 'error':
+        traceback = '\n'.join(output.get('traceback') or [])
+        return f'<pre class="nb-error text-red-700 dark:text-red-300">{ansi2html(traceback)}</pre>'
+
+    data = output.get('data') or {}
+    if 'text/html' in data:
+        return f'<div class="nb-html overflow-x-auto">{_source(data["text/html"])}</div>'
+    for mime in ('image/png', 'image/jpeg', 'image/gif'):
+        if mime in data:
+            image = _source(data[mime]).replace('\n', '')
+            return f'<img class="nb-image max-w-full" src="data:{mime};base64,{image}" alt="">'
+    if 'image/svg+xml' in data:
+        svg = base64.b64encode(_source(data['image/svg+xml']).encode('utf-8')).decode('ascii')
+        return f'<img class="nb-image max-w-full" src="data:image/svg+xml;base64,{svg}" alt="">'
+    if 'text/plain' in data:
+        return f'<pre class="text-gray-800 dark:text-gray-200">{html.escape(_source(data["text/plain"]))}</pre>'
+    return ''
+
+
+def render_cells(notebook, run_label='Çalıştır'):
+    """
+    Notebook hücrelerini görüntüleyicide kullanılacak HTML parçasına dönüştürür.
+
+    Kod hücrelerinin kaynağı `<code>` içinde kaçışlanmış olarak, çalıştırma düğmesi ise
+    `data-cell-index` özniteliğiyle birlikte üretilir; görüntüleyici tıklamaları bu
+    öznitelik üzerinden yakalar.
+
+    Args:
+        notebook (NotebookNode): Ayrıştırılmış notebook.
+        run_label (str): Çalıştırma düğmesinin metni.
+
+    Returns:
+        str: HTML parçası.
+    """
+    parts = []
+    for index, cell in enumerate(notebook.cells):
+        cell_type = cell.get('cell_type')
+        source = _source(cell.get('source'))
+        css_class = _CELL_CLASSES.get(cell_type, _CELL_CLASSES['markdown'])
+
+        if cell_type == 'code':
+            outputs = ''.join(_render_output(output) for output in cell.get('outputs') or [])
+            if outputs:
+                outputs = ('<div class="mt-2 bg-gray-50 dark:bg-gray-700 p-4 rounded-md '
+                           f'border-l-4 border-yellow-500">{outputs}</div>')
+            parts.append(
+                f'<div class="nb-cell {css_class}" data-cell-index="{index}">'
+                f'<pre class="bg-gray-50 dark:bg-gray-700 p-4 rounded-md overflow-x-auto">'
+                f'<code class="nb-source">{html.escape(source)}</code></pre>'
+                f'<button type="button" class="nb-run mt-2 bg-blue-600 hover:bg-blue-700 text-white py-1 px-4 '
+                f'rounded text-sm" data-cell-index="{index}">{html.escape(run_label)}</button>'
+                f'{outputs}</div>'
+            )
+        elif cell_type == 'markdown':
+            parts.append(
+                f'<div class="nb-cell {css_class}" data-cell-index="{index}">'
+                f'<div class="markdown-content prose dark:prose-invert">{markdown2html(source)}</div></div>'
+            )
+        else:
+            parts.append(
+                f'<div class="nb-cell {css_class}" data-cell-index="{index}">'
+                f'<pre class="whitespace-pre-wrap">{html.escape(source)}</pre></div>'
+            )
+    return '\n'.join(parts)
+
+
+class NotebookRenderer:
+    """
+    Notebook HTML parçalarını sürüm bazında bellekte ve diskte saklayan önbellek.
+
+    Attributes:
+        cache_dir (str): Üretilen HTML dosyalarının saklandığı dizin.
+    """
+
+    def __init__(self, cache_dir, max_size=64):
+        self.cache_dir = cache_dir
+        self._memory = LRUCache(max_size=max_size)
+
+    def _file_path(self, version):
+        return os.path.join(self.cache_dir, f"{version}-v{RENDER_FORMAT_VERSION}.html")
+
+    def render(self, repo_dir, notebook_path, version=None):
+        """
+        Notebook'un HTML parçasını döndürür; bu sürüm için daha önce üretilmişse yeniden
+        oluşturmaz.
+
+        Args:
+            repo_dir (str): Depo kök dizini.
+            notebook_path (str): Notebook'un depo köküne göre yolu.
+            version (Optional[str]): Bilinen sürüm anahtarı. Verilmezse notebook yüklenerek bulunur.
+
+        Returns:
+            tuple: (HTML parçası, sürüm anahtarı)
+
+        Raises:
+            FileNotFoundError: Notebook mevcut değilse.
+        """
+        if version:
+            cached = self._memory.get(notebook_path)
+            if cached is not None and cached[0] == version:
+                return cached[1], version
+            try:
+                with open(self._file_path(version), 'r', encoding='utf-8') as f:
+                    fragment = f.read()
+                self._memory.set(notebook_path, (version, fragment))
+                return fragment, version
+            except OSError:
+                pass
+
+        notebook, version = load_notebook(repo_dir, notebook_path)
+        cached = self._memory.get(notebook_path)
+        if cached is not None and cached[0] == version:
+            return cached[1], version
+
+        fragment = render_cells(notebook)
+        self._write(version, fragment)
+        self._memory.set(notebook_path, (version, fragment))
+        return fragment, version
+
+    def _write(self, version, fragment):
+        """Parçayı önce geçici dosyaya yazıp atomik olarak yerine taşır."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self._file_path(version)}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(fragment)
+            os.replace(temp_path, self._file_path(version))
+        except OSError as e:
+            logger.warning(f"Notebook HTML önbelleğe yazılamadı: {str(e)}")
+
+    def warm(self, repo_dir, entries):
+        """
+        Katalogdaki notebook'ların henüz üretilmemiş sürümlerini oluşturur.
+
+        Args:
+            repo_dir (str): Depo kök dizini.
+            entries (list): Notebook katalog kayıtları.
+
+        Returns:
+            int: Yeniden oluşturulan notebook sayısı.
+        """
+        rendered = 0
+        for entry in entries:
+            if os.path.exists(self._file_path(entry['blob_hash'])):
+                continue
+            try:
+                self.render(repo_dir, entry['notebook_path'])
+                rendered += 1
+            except Exception as e:
+                logger.warning(f"Notebook HTML'e dönüştürülemedi: {entry['notebook_path']}: {str(e)}")
+        return rendered
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_notebook_renderer():
+    """
+    Uygulama genelinde paylaşılan NotebookRenderer örneğini döndürür.
+
+    Returns:
+        NotebookRenderer: Paylaşılan örnek.
+    """
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                from config import Config
+                _renderer = NotebookRenderer(Config.NOTEBOOK_RENDER_DIR, max_size=Config.NOTEBOOK_CACHE_SIZE)
+    return _renderer
+
+
+def register_render_warmup():
+    """Her depo eşitlemesinden sonra değişen notebook'ların HTML parçalarını arka planda üretir."""
+    from app.services.notebook_catalog import get_notebook_catalog
+    from app.services.repo_sync import get_repo_sync
+
+    def warm(repo_dir):
+        count = get_notebook_renderer().warm(repo_dir, get_notebook_catalog().entries())
+        if count:
+            logger.info(f"{count} notebook HTML'e dönüştürüldü")
+
+    get_repo_sync().add_listener(warm)
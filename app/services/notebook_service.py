@@ -1,15 +1,48 @@
 import os
-import json
-import nbformat
 import subprocess
 import sys
-import io
-import shutil
 import uuid
-import builtins
 from flask import current_app
 from flask_socketio import emit
-import threading
+from app.services.kernel_pool import KernelBusy, KernelDied, KernelUnavailable, get_kernel_pool
+from app.services.notebook_cache import load_notebook
+from app.services.repo_sync import get_repo_sync
+from config import Config
+
+# İstemci bu süre içinde onay vermezse bekleyen parçalar kaybolmuş sayılır
+OUTPUT_ACK_TIMEOUT = 5
+
+
+class OutputStream:
+    """
+    Çalışan kodun çıktı parçalarını 'partial_output' olayıyla gönderir ve istemcinin
+    onaylamadığı parça sayısını `window` ile sınırlar. Pencere dolduğunda onay gelene kadar
+    beklenir; bu sırada çekirdekten okuma yapılmadığı için kullanıcı kodu da yavaşlar.
+
+    Attributes:
+        window (int): Onay beklenen en fazla parça sayısı.
+        pending (int): Gönderilmiş ama henüz onaylanmamış parça sayısı.
+    """
+
+    def __init__(self, socketio, window):
+        self.window = max(1, int(window))
+        self.pending = 0
+        self._acked = socketio.server.eio.create_event()
+
+    def _ack(self, *args):
+        self.pending = max(0, self.pending - 1)
+        self._acked.set()
+
+    def write(self, text):
+        while True:
+            self._acked.clear()
+            if self.pending < self.window:
+                break
+            if not self._acked.wait(OUTPUT_ACK_TIMEOUT):
+                # Onaylar gelmiyor (eski istemci veya kopan bağlantı); pencere sıfırlanır
+                self.pending = 0
+        self.pending += 1
+        emit('partial_output', {'output': text}, callback=self._ack)
 
 class NotebookService:
     """
@@ -17,69 +50,42 @@ class NotebookService:
     çıktıları paylaşmak için araçlar sağlar.
 
     Bu sınıf, bir repository yönetimi yaparak notebook dosyalarını indirebilir veya
-    güncelleyebilir. Ayrıca, bir kullanıcı için kod çalıştırma ortamını simule eder
+    güncelleyebilir. Ayrıca, her kullanıcının kodunu ona ait bir çekirdek sürecinde çalıştırır
     ve Socket.IO entegrasyonu ile etkileşimli çıktı sunabilir. Seçenek olarak, kodu
     direkt olarak çalıştırma ve çıktısını döndürme yeteneklerine de sahiptir.
     """
     def __init__(self):
         # Repository URL ve klasör yolunu tanımla
-        self.repo_url = 'https://github.com/msy-bilecik/ist204_2025'
-        self.repo_dir = os.path.join(os.getcwd(), 'notebooks_repo')
-        self.lock = threading.Lock()
-        self.user_namespaces = {}  # Kullanıcı başına çalıştırma ortamları
-        self.input_response = None  # Input için global değişken
+        self.repo_url = get_repo_sync().repo_url
+        self.repo_dir = get_repo_sync().repo_dir
 
     def ensure_repo_exists(self):
         """
-        ensure_repo_exists fonksiyonu, bir Git reposunun belirtilen dizinde mevcut
-        olup olmadığını kontrol eder ve mevcut değilse klonlama işlemi yapar. Eğer
-        repo zaten mevcutsa, güncelleme işlemi gerçekleştirilir. Güncelleme sırasında
-        hata oluşması durumunda repo yeniden sıfırdan klonlanır. İşlem sonunda
-        klonlanan veya güncellenen repo dizininin yolunu döndürür.
+        Yerel notebook deposunun yolunu döndürür. Depo güncellemesi (git pull) burada
+        yapılmaz; RepoSyncService tarafından arka planda ve /refresh_repo ile yapılır.
+        Yerel kopya hiç yoksa yalnızca bir kez klonlanır.
 
         Arguments:
             None
 
         Returns:
-            str: Klonlanan veya güncellenmiş olan repo dizininin yolu. Eğer hata oluşursa None döner.
+            str: Yerel repo dizininin yolu. Depo klonlanamadıysa None döner.
         """
-        if not os.path.exists(self.repo_dir):
-            print(f"Repository {self.repo_dir} dizinine klonlanıyor")
-            try:
-                subprocess.run(['git', 'clone', self.repo_url, self.repo_dir], check=True)
-            except subprocess.CalledProcessError as e:
-                print(f"Repository klonlanırken hata: {str(e)}")
-                return None
-        else:
-            print(f"{self.repo_dir} dizinindeki repo güncelleniyor")
-            try:
-                # En son değişiklikleri çek
-                subprocess.run(['git', 'pull'], cwd=self.repo_dir, check=True)
-            except subprocess.CalledProcessError:
-                print("Repo güncellenirken hata oluştu, yeniden klonlanıyor")
-                # Çekme başarısız olursa, temiz bir şekilde klonla
-                shutil.rmtree(self.repo_dir, ignore_errors=True)
-                try:
-                    subprocess.run(['git', 'clone', self.repo_url, self.repo_dir], check=True)
-                except subprocess.CalledProcessError as e:
-                    print(f"Repository yeniden klonlanırken hata: {str(e)}")
-                    return None
-
-        return self.repo_dir
+        return get_repo_sync().ensure_checkout()
 
     def get_notebook(self, notebook_path):
         """
         Belirtilen yolda bulunan Jupyter not defterini yükleyen ve içeriğini bir sözlük yapısında
         dönen bir yöntem. Girdi olarak gelen not defteri dosyasının güvenlik önlemleriyle kontrolü
-        sağlanır, ardından JSON biçiminde yüklenerek nbformat kütüphanesi yardımıyla doğrulanır
-        ve okunur.
+        sağlanır, ardından nbformat ile okunur. Ayrıştırılmış notebook'lar dosya sürümüne göre
+        önbellekte tutulur; dönen içerik paylaşıldığı için değiştirilmemelidir.
 
         Arguments:
             notebook_path (str): Yüklenmek istenen Jupyter not defterinin yolu.
 
         Returns:
-            Optional[dict]: Başarıyla yüklenen not defteri dosyasının içerik bilgilerini içeren bir
-            sözlük. Eğer yükleme başarısız olursa None döner.
+            Optional[dict]: Başarıyla yüklenen not defteri dosyasının içerik bilgilerini ve sürüm
+            anahtarını ('version') içeren bir sözlük. Eğer yükleme başarısız olursa None döner.
 
         Raises:
             ValueError: Geçersiz bir yol belirtilmişse veya path traversal güvenlik hatası oluşmuşsa.
@@ -93,33 +99,50 @@ class NotebookService:
         if notebook_path.startswith('view/'):
             notebook_path = notebook_path[5:]
 
-        full_path = os.path.normpath(os.path.join(repo_dir, notebook_path))
-
-        # Güvenlik kontrolü - path traversal önleme
-        if not full_path.startswith(repo_dir):
-            raise ValueError("Geçersiz notebook yolu")
-
-        if not os.path.exists(full_path):
-            raise FileNotFoundError(f"Notebook bulunamadı: {notebook_path}")
+        relative_path = self.resolve_notebook_path(repo_dir, notebook_path)
 
         try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                notebook_content = json.load(f)
-
-            # nbformat ile notebook'u doğrula ve oku
-            notebook = nbformat.reads(json.dumps(notebook_content), as_version=4)
+            # Ayrıştırılmış notebook önbellekten gelir; dosya değiştiyse yeniden okunur
+            notebook, version = load_notebook(repo_dir, relative_path)
 
             # Ayrıca cells erişimini kolaylaştırmak için
             return {
                 'path': notebook_path,
                 'name': os.path.basename(notebook_path),
                 'content': notebook,
-                'cells': notebook.cells  # cells doğrudan erişilebilir olsun
+                'cells': notebook.cells,  # cells doğrudan erişilebilir olsun
+                'version': version
             }
         except Exception as e:
             print(f"Notebook yüklenirken hata: {str(e)}")
             return None
 
+    def resolve_notebook_path(self, repo_dir, notebook_path):
+        """
+        Notebook yolunu doğrular ve depo köküne göre normalleştirilmiş yolunu döndürür.
+
+        Args:
+            repo_dir (str): Depo kök dizini.
+            notebook_path (str): İstekte gelen notebook yolu.
+
+        Returns:
+            str: Depo köküne göre notebook yolu.
+
+        Raises:
+            ValueError: Yol depo dizininin dışını gösteriyorsa (path traversal).
+            FileNotFoundError: Belirtilen dosya mevcut değilse.
+        """
+        full_path = os.path.normpath(os.path.join(repo_dir, notebook_path))
+
+        # Güvenlik kontrolü - path traversal önleme
+        if not full_path.startswith(os.path.join(repo_dir, '')):
+            raise ValueError("Geçersiz notebook yolu")
+
+        if not os.path.isfile(full_path):
+            raise FileNotFoundError(f"Notebook bulunamadı: {notebook_path}")
+
+        return os.path.relpath(full_path, repo_dir)
+
     def run_code(self, code, user_id=None):
         """
         Belirtilen kodun bir alt işlemde çalıştırılmasını ve kodun çıktısını döndürmeyi amaçlayan bir fonksiyon.
@@ -155,12 +178,13 @@ class NotebookService:
             current_app.logger.error(f"Error running code: {str(e)}")
             return {'success': False, 'error': 'An internal error has occurred.'}
 
-    def handle_socket_run_code(self, code, user_id, socketio=None):
+    def handle_socket_run_code(self, code, user_id, socketio=None, session_id=None):
         """
-        Kullanıcı tarafından gönderilen Python kodunu bir "sandbox" ortamında çalıştıran, çıktılarını
-        gerçek zamanlı olarak bir Socket.IO bağlantısı üzerinden ileten ve gerektiğinde kullanıcıdan
-        input alarak yürütmeyi sürdüren bir işlevdir. Kullanıcıların kod çalıştırma süreçlerini izleyebilmesine
-        ve dışarıdan gelen inputlarla yönlendirebilmesine imkan tanır.
+        Kullanıcı tarafından gönderilen Python kodunu kullanıcıya ait çekirdek sürecinde çalıştıran,
+        çıktılarını gerçek zamanlı olarak bir Socket.IO bağlantısı üzerinden ileten ve gerektiğinde
+        kullanıcıdan input alarak yürütmeyi sürdüren bir işlevdir. Kod web sürecinde çalışmadığı için
+        eşzamanlı kullanıcıların çıktıları birbirine karışmaz. Çıktı çekirdekte kısa aralıklarla
+        birleştirilip parçalar halinde gelir ve istemcinin onayladığı hızda gönderilir.
 
         Parameters:
             code: str
@@ -169,6 +193,9 @@ class NotebookService:
                 Kullanıcının kimliğini belirten bir tanıtıcı.
             socketio: SocketIO, optional
                 Socket.IO bağlantı nesnesi. Varsayılan olarak None.
+            session_id: str, optional
+                Kodu gönderen Socket.IO oturumu (request.sid). input() yanıtları yalnızca bu
+                oturumdan kabul edilir.
 
         Returns:
             dict
@@ -176,142 +203,70 @@ class NotebookService:
                 Örneğin:
                 {'success': True} başarılı işlem sonrası döndürülür.
                 {'success': False, 'error': 'Hata mesajı'} hata durumunda döndürülür.
-
-        Raises:
-            Exception
-                Gönderilen kodun yürütülmesi sırasında oluşabilecek tüm istisnalar yakalanır
-                ve Socket.IO bağlantısına bir hata çıktısı olarak iletilir.
         """
         if not socketio:
             return {'success': False, 'error': 'Socket.IO bağlantısı bulunamadı'}
 
-        # Kullanıcı namespace'i oluştur
-        if user_id not in self.user_namespaces:
-            self.user_namespaces[user_id] = {'__builtins__': builtins}
-
-        user_namespace = self.user_namespaces[user_id]
-
-        # Çıktıyı yakalamak için StringIO kullan
-        old_stdout = sys.stdout
-        redirected_output = io.StringIO()
-        sys.stdout = redirected_output
-
-        # Takip edilen çıktı konumu
-        last_output_position = 0
-
-        # Özel input fonksiyonu
-        def custom_input(prompt=''):
-            """
-            NotebookService sınıfı, bir kullanıcıdan bir kod parçasını çalıştırma talebi alarak bu süreci yönetir
-            ve sonuçları istemciye uygun bir şekilde iletir. Kodu yürütme sırasında gerektiğinde kullanıcıdan
-            girdi almayı destekler ve istemciye parçalı çıktı gönderebilir.
-
-            Metotlar:
-                - handle_socket_run_code: Gelen kod çalıştırma taleplerini işler, çıktıları gerekirse parçalı şekilde iletir.
-
-            Metotların detaylı açıklamaları aşağıda verilmiştir.
-            """
-            # Bekleyen çıktıyı önce gönder
-            nonlocal last_output_position
-            current_output = redirected_output.getvalue()[last_output_position:]
-            if current_output:
-                emit('partial_output', {'output': current_output})
-                last_output_position = len(redirected_output.getvalue())
-
-            # Input iste
-            self.input_response = None
-            emit('input_request', {'prompt': prompt})
-
-            # input_response ayarlanması için bekle
-            while self.input_response is None:
-                socketio.sleep(0.1)
-
-            response = self.input_response
-            self.input_response = None
-            return response
-
-        old_input = builtins.input
-        user_namespace['input'] = custom_input
+        pool = get_kernel_pool()
+        try:
+            kernel = pool.acquire(user_id)
+        except (KernelBusy, KernelUnavailable) as e:
+            emit('partial_output', {'output': str(e)})
+            emit('code_output', {'output': ''})
+            return {'success': False, 'error': str(e)}
 
+        output = OutputStream(socketio, Config.NOTEBOOK_OUTPUT_WINDOW)
         try:
-            # Basit ifade mi kontrolü
-            is_simple_expression = False
-            try:
-                compiled_code = compile(code, '<string>', 'eval')
-                is_simple_expression = True
-            except SyntaxError:
-                pass
-
-            if is_simple_expression:
-                # Basit ifade - değerlendir ve sonucu göster
-                result = eval(compiled_code, user_namespace)
-                if result is not None:
-                    print(repr(result))
-            else:
-                # AST kullanarak son ifadenin değerini kontrol et
-                import ast
-                try:
-                    parsed = ast.parse(code)
-                    if parsed.body:
-                        last_stmt = parsed.body[-1]
-                        if isinstance(last_stmt, ast.Expr):
-                            # Son ifade dışındaki tüm kod
-                            lines = code.splitlines()
-                            last_line_index = last_stmt.lineno - 1  # ast satır numaraları 1-indeksli
-
-                            if len(lines) == 1:
-                                exec(code, user_namespace)
-                            else:
-                                # Son ifade hariç tümünü çalıştır
-                                exec('\n'.join(lines[:last_line_index]), user_namespace)
-                                # Son ifadeyi değerlendir ve sonucunu göster
-                                last_expr = lines[last_line_index]
-                                result = eval(last_expr, user_namespace)
-                                if result is not None:
-                                    print(repr(result))
-                        else:
-                            # İfade değil, normal çalıştır
-                            exec(code, user_namespace)
-                    else:
-                        # Boş kod
-                        exec(code, user_namespace)
-                except SyntaxError:
-                    # AST ayrıştırma başarısız olursa, normal çalıştır
-                    exec(code, user_namespace)
-
-            # Kalan çıktıyı gönder
-            final_output = redirected_output.getvalue()[last_output_position:]
-            if final_output:
-                emit('partial_output', {'output': final_output})
-        except Exception as e:
+            kernel.execute(
+                code,
+                on_output=output.write,
+                on_input_request=lambda prompt, request_id: emit(
+                    'input_request', {'prompt': prompt, 'request_id': request_id}),
+                session_id=session_id
+            )
+        except KernelDied as e:
             emit('partial_output', {'output': str(e)})
         finally:
-            # Orijinal stdout'u geri yükle
-            sys.stdout = old_stdout
-            builtins.input = old_input
+            pool.release(kernel)
 
         emit('code_output', {'output': ''})  # Tamamlandı sinyali
         return {'success': True}
 
-    def set_input_response(self, value):
+    def set_input_response(self, user_id, value, session_id=None, request_id=None):
         """
-        Fonksiyon bir değer alır ve bu değeri input_response niteliğine atar.
+        Kullanıcının çalışan kodundaki bekleyen input() çağrısına yanıtı iletir. Bekleyen
+        çalıştırma yoklama yapmadan bu yanıtla hemen devam eder.
 
         Args:
-            value: Atanacak değer. Parametre tipi belirtilmediğinden
-                   çağrıyla bu sorumluluk geliştiriciye bırakılmıştır.
+            user_id: Yanıtı gönderen kullanıcının kimliği.
+            value (str): Kullanıcının girdiği değer.
+            session_id (Optional[str]): Yanıtı gönderen Socket.IO oturumu.
+            request_id (Optional[int]): Yanıtlanan input_request olayının numarası.
 
         Returns:
-            None
+            bool: Yanıt bekleyen input() çağrısına iletildiyse True.
+        """
+        return get_kernel_pool().send_input(user_id, value, session_id, request_id)
+
+    def cancel_session(self, user_id, session_id):
+        """
+        Kapanan bir Socket.IO oturumunun süren çalıştırmasını sonlandırır.
+
+        Args:
+            user_id: Kullanıcı kimliği.
+            session_id (str): Kapanan oturum (request.sid).
+
+        Returns:
+            bool: Sonlandırılan bir çalıştırma varsa True.
         """
-        self.input_response = value
+        return get_kernel_pool().cancel(user_id, session_id)
 
     def reset_namespace(self, user_id):
         """
-        Kullanıcıya ait ad alanını varsayılan değerlerine sıfırlayan bir fonksiyon.
+        Kullanıcıya ait çalışma ortamını sıfırlayan bir fonksiyon.
 
-        Bu fonksiyon, kullanıcının mevcut ad alanını temizler ve varsayılan '__builtins__' ile yeniden
-        başlatır. Kullanıcının kimliğini temel alarak ad alanını günceller ya da oluşturur.
+        Kullanıcının çekirdek süreci kapatılır; sonraki çalıştırma boş bir namespace ile
+        yeni bir çekirdekte başlar.
 
         Args:
             user_id (str): Ad alanı sıfırlanacak kullanıcının benzersiz kimlik numarası.
@@ -319,4 +274,4 @@ class NotebookService:
         Returns:
             None
         """
-        self.user_namespaces[user_id] = {'__builtins__': builtins}
\ No newline at end of file
+        get_kernel_pool().reset(user_id)
@@ -0,0 +1,239 @@
+# app/services/repo_sync.py
+"""
+Notebook deposunun (notebooks_repo) arka planda güncel tutulmasını sağlayan servis.
+
+Notebook okuma işlemleri yalnızca yerel çalışma kopyasına dokunur; `git pull`
+belirli aralıklarla çalışan tek bir arka plan iş parçacığından veya yöneticinin
+/refresh_repo tetiklemesinden yapılır. Aynı anda yalnızca bir eşitleme çalışır
+(single-flight); eşitleme sürerken gelen istekler yeni bir `git pull` başlatmak
+yerine süren eşitlemenin sonucunu bekler. Başarılı bir eşitlemeden sonra dinleyiciler
+(katalog, HTML ön üretimi, arama indeksi...) eşitleme kilidi bırakıldıktan sonra ayrı
+bir arka plan iş parçacığında sırayla çalıştırılır; böylece bekleyen istekler ve bir
+sonraki eşitleme dinleyicileri beklemez.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RepoSyncService:
+    """
+    Notebook deposunu klonlayan ve periyodik olarak güncelleyen servis.
+
+    Attributes:
+        repo_url (str): Klonlanacak deponun URL'si.
+        repo_dir (str): Yerel çalışma kopyasının yolu.
+        interval (float): Zamanlanmış eşitlemeler arasındaki süre (saniye). 0 ise
+            zamanlanmış eşitleme yapılmaz, yalnızca açık tetiklemeler çalışır.
+        timeout (float): Tek bir git komutu için süre sınırı (saniye).
+        last_sync_at (Optional[float]): Son başarılı eşitlemenin zaman damgası.
+        last_error (Optional[str]): Son başarısız eşitlemenin hata mesajı.
+    """
+
+    def __init__(self, repo_url, repo_dir, interval=300, timeout=120):
+        self.repo_url = repo_url
+        self.repo_dir = repo_dir
+        self.interval = interval
+        self.timeout = timeout
+        self.last_sync_at = None
+        self.last_error = None
+        self._sync_lock = threading.Lock()
+        # _generation ve _sync_lock sahipliği birlikte okunup değiştirilsin diye
+        self._state_lock = threading.Lock()
+        self._generation = 0
+        self._result = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+        self._listeners_pending = False
+        self._listener_thread = None
+
+    def add_listener(self, callback):
+        """
+        Her başarılı eşitlemeden sonra depo dizini ile çağrılacak bir fonksiyon ekler.
+
+        Args:
+            callback (Callable[[str], None]): Eşitleme kilidi bırakıldıktan sonra arka plandaki
+                dinleyici iş parçacığında, eklenme sırasıyla çağrılır.
+        """
+        self._listeners.append(callback)
+
+    def _schedule_listeners(self):
+        """
+        Dinleyicileri arka plan iş parçacığında çalıştırır. Dinleyiciler zaten çalışıyorsa
+        yeni bir iş parçacığı açılmaz; mevcut çalışma bitince dinleyiciler bir kez daha çalışır.
+        """
+        with self._state_lock:
+            self._listeners_pending = True
+            if self._listener_thread is not None:
+                return
+            thread = self._listener_thread = threading.Thread(
+                target=self._run_listeners, name='repo-sync-listeners', daemon=True)
+        thread.start()
+
+    def _run_listeners(self):
+        while True:
+            with self._state_lock:
+                if not self._listeners_pending:
+                    self._listener_thread = None
+                    return
+                self._listeners_pending = False
+            self._notify()
+
+    def _notify(self):
+        for callback in self._listeners:
+            try:
+                callback(self.repo_dir)
+            except Exception as e:
+                logger.error(f"Depo eşitleme dinleyicisi hata verdi: {str(e)}")
+
+    def has_checkout(self):
+        """Yerel çalışma kopyasının mevcut olup olmadığını döndürür."""
+        return os.path.isdir(self.repo_dir)
+
+    def ensure_checkout(self):
+        """
+        Yerel çalışma kopyasının yolunu döndürür; kopya yoksa bir kez klonlar.
+
+        Returns:
+            Optional[str]: Depo dizininin yolu veya klonlama başarısız olduysa None.
+        """
+        if self.has_checkout():
+            return self.repo_dir
+        return self.sync()
+
+    def sync(self):
+        """
+        Depoyu günceller (yoksa klonlar). Başka bir eşitleme sürüyorsa yenisini başlatmaz,
+        onun bitmesini bekleyip sonucunu döndürür.
+
+        Returns:
+            Optional[str]: Güncellenen depo dizininin yolu veya hata durumunda None.
+        """
+        with self._state_lock:
+            generation = self._generation
+            acquired = self._sync_lock.acquire(blocking=False)
+
+        if not acquired:
+            # Süren eşitlemenin bitmesini bekle ve onun sonucunu paylaş
+            with self._sync_lock:
+                if self._generation != generation:
+                    return self._result
+            return self.sync()
+
+        synced_at = self.last_sync_at
+        try:
+            self._result = self._pull_or_clone()
+            return self._result
+        finally:
+            # Nesil, kilit bırakılırken artırılır; bekleyenler bu eşitlemenin sonucunu görür
+            with self._state_lock:
+                self._generation += 1
+                self._sync_lock.release()
+            if self.last_sync_at != synced_at:
+                self._schedule_listeners()
+
+    def _run_git(self, *args, cwd=None):
+        subprocess.run(['git', *args], cwd=cwd, check=True, timeout=self.timeout)
+
+    def _clone(self):
+        """
+        Depoyu geçici bir dizine klonlar ve ardından mevcut kopyanın yerine koyar.
+        Eski kopya önce kenara taşınır, yenisi yerine konduktan sonra silinir; böylece
+        okuyucular yarım kalmış bir dizin görmez ve depo dizininin yokluğu yalnızca iki
+        rename arasındaki çok kısa an ile sınırlı kalır.
+        """
+        staging_dir = f"{self.repo_dir}.staging"
+        old_dir = f"{self.repo_dir}.old"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        self._run_git('clone', self.repo_url, staging_dir)
+        if os.path.isdir(self.repo_dir):
+            os.replace(self.repo_dir, old_dir)
+        os.replace(staging_dir, self.repo_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _pull_or_clone(self):
+        """Depoyu çeker; çekme başarısız olursa temiz bir şekilde yeniden klonlar."""
+        try:
+            if self.has_checkout():
+                logger.info(f"{self.repo_dir} dizinindeki repo güncelleniyor")
+                try:
+                    self._run_git('pull', '--ff-only', cwd=self.repo_dir)
+                except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                    logger.warning("Repo güncellenirken hata oluştu, yeniden klonlanıyor")
+                    self._clone()
+            else:
+                logger.info(f"Repository {self.repo_dir} dizinine klonlanıyor")
+                self._clone()
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+            self.last_error = str(e)
+            logger.error(f"Repository eşitlenirken hata: {str(e)}")
+            return self.repo_dir if self.has_checkout() else None
+
+        self.last_sync_at = time.time()
+        self.last_error = None
+        return self.repo_dir
+
+    def start(self):
+        """Zamanlanmış eşitleme iş parçacığını başlatır. Birden fazla çağrılması güvenlidir."""
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_scheduler, name='repo-sync', daemon=True)
+        self._thread.start()
+        logger.info(f"Notebook deposu {self.interval} saniyede bir eşitlenecek")
+
+    def stop(self):
+        """Zamanlanmış eşitlemeyi durdurur."""
+        self._stop.set()
+
+    def _run_scheduler(self):
+        while not self._stop.is_set():
+            self.sync()
+            self._stop.wait(self.interval)
+
+    def status(self):
+        """
+        Eşitleme durumunu döndürür.
+
+        Returns:
+            dict: 'repo_dir', 'has_checkout', 'syncing', 'last_sync_at' ve 'last_error' anahtarları.
+        """
+        return {
+            "repo_dir": self.repo_dir,
+            "has_checkout": self.has_checkout(),
+            "syncing": self._sync_lock.locked(),
+            "last_sync_at": self.last_sync_at,
+            "last_error": self.last_error
+        }
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_repo_sync():
+    """
+    Uygulama genelinde paylaşılan RepoSyncService örneğini döndürür, yoksa Config ayarlarıyla oluşturur.
+
+    Returns:
+        RepoSyncService: Paylaşılan servis örneği.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from config import Config
+                _service = RepoSyncService(
+                    repo_url=Config.REPO_URL,
+                    repo_dir=os.path.join(os.getcwd(), 'notebooks_repo'),
+                    interval=Config.REPO_SYNC_INTERVAL,
+                    timeout=Config.REPO_SYNC_TIMEOUT
+                )
+    return _service
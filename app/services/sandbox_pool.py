@@ -0,0 +1,257 @@
+# app/services/sandbox_pool.py
+"""
+Kod değerlendirme işlerini önceden başlatılmış işçi süreçlere dağıtan havuz.
+
+Her işçi, forkserver üzerinden (yorumlayıcı ve standart kütüphane önceden yüklenmiş
+halde) başlatılır ve bir Pipe üzerinden iş alır. Duvar saati sınırını aşan işçi
+öldürülüp yerine yenisi başlatılır; CPU süresi sınırı işçinin kendi içinde
+RLIMIT_CPU ile uygulanır. Belirli sayıda işten sonra işçiler yenilenir.
+"""
+import atexit
+import logging
+import multiprocessing
+import queue
+import signal
+import threading
+import traceback
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# İşçilerin başlangıçta içe aktaracağı modüller
+PRELOAD_MODULES = [
+    'app.services.evaluator', 'app.services.sandbox_pool',
+    'collections', 'itertools', 'functools', 'math', 'random', 'string', 're', 'json',
+]
+
+
+class SandboxTimeout(BaseException):
+    """
+    Bir işin CPU süresi sınırını aştığını belirtir.
+
+    Öğrenci kodundaki `except Exception` blokları tarafından yutulmaması için
+    BaseException'dan türetilmiştir.
+    """
+
+
+def _raise_cpu_timeout(signum, frame):
+    """SIGXCPU sinyalini işçi içinde yakalanabilir bir istisnaya dönüştürür."""
+    raise SandboxTimeout("CPU süresi sınırı aşıldı")
+
+
+def _set_cpu_limit(seconds):
+    """
+    İşçi sürecin kalan CPU süresini, şu ana kadar harcanan süre + `seconds` olarak sınırlar.
+
+    RLIMIT_CPU süreç ömrü boyunca birikimli olduğundan her işten önce yeniden ayarlanır.
+    """
+    if resource is None or not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + int(seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, cpu_limit):
+    """
+    İşçi sürecin ana döngüsü. Pipe'tan gelen her işi çalıştırır ve sonucu geri yollar.
+
+    Args:
+        conn: Üst süreçle iletişim için kullanılan Pipe ucu.
+        cpu_limit (int): Her iş için saniye cinsinden CPU süresi sınırı.
+    """
+    from app.services.evaluator import (
+        TASKS, OutputLimitExceeded, TestTimeout,
+        STATUS_MEMORY_EXCEEDED, STATUS_OUTPUT_LIMIT, STATUS_TIMEOUT,
+    )
+
+    if hasattr(signal, 'SIGXCPU'):
+        signal.signal(signal.SIGXCPU, _raise_cpu_timeout)
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        try:
+            _set_cpu_limit(job.pop('cpu_limit', None) or cpu_limit)
+            task = TASKS[job.pop('task', None) or 'evaluate']
+            reply = {"ok": True, "result": task(job)}
+        except (SandboxTimeout, TestTimeout) as e:
+            reply = {"ok": False, "status": STATUS_TIMEOUT, "error": str(e)}
+        except MemoryError:
+            reply = {"ok": False, "status": STATUS_MEMORY_EXCEEDED, "error": "Bellek sınırı aşıldı"}
+        except OutputLimitExceeded as e:
+            reply = {"ok": False, "status": STATUS_OUTPUT_LIMIT, "error": str(e)}
+        except BaseException as e:
+            reply = {"ok": False, "status": "error", "error": str(e),
+                     "traceback": traceback.format_exc()}
+
+        try:
+            conn.send(reply)
+        except (EOFError, OSError):
+            break
+
+
+class _Worker:
+    """Havuzdaki tek bir işçi sürecini ve Pipe bağlantısını temsil eder."""
+
+    def __init__(self, context, cpu_limit):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, cpu_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs_done = 0
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self, kill=False):
+        """İşçiyi durdurur. `kill` True ise beklemeden sonlandırır."""
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1)
+        self.conn.close()
+
+
+class SandboxPool:
+    """
+    Önceden ısıtılmış işçi süreçlerden oluşan değerlendirme havuzu.
+
+    Attributes:
+        size (int): Havuzdaki işçi sayısı.
+        max_jobs_per_worker (int): Bir işçinin yenilenmeden önce çalıştırabileceği iş sayısı.
+        wall_timeout (float): Bir iş için varsayılan duvar saati sınırı (saniye).
+        cpu_limit (int): Bir iş için varsayılan CPU süresi sınırı (saniye).
+    """
+
+    def __init__(self, size, max_jobs_per_worker=100, wall_timeout=10.0, cpu_limit=5):
+        self.size = max(1, int(size))
+        self.max_jobs_per_worker = max(1, int(max_jobs_per_worker))
+        self.wall_timeout = wall_timeout
+        self.cpu_limit = cpu_limit
+        self._context = self._create_context()
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    @staticmethod
+    def _create_context():
+        """Mümkünse forkserver, değilse spawn tabanlı multiprocessing bağlamı oluşturur."""
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(PRELOAD_MODULES)
+            return context
+        return multiprocessing.get_context('spawn')
+
+    def start(self):
+        """İşçi süreçleri başlatır. Birden fazla çağrılması güvenlidir."""
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(_Worker(self._context, self.cpu_limit))
+            self._started = True
+            logger.info(f"Sandbox havuzu {self.size} işçi ile başlatıldı")
+
+    def _release(self, worker):
+        """İşçiyi havuza geri koyar; gerekiyorsa yenisiyle değiştirir."""
+        if self._closed:
+            worker.stop(kill=True)
+            return
+        if not worker.is_alive() or worker.jobs_done >= self.max_jobs_per_worker:
+            worker.stop(kill=not worker.is_alive())
+            worker = _Worker(self._context, self.cpu_limit)
+        self._idle.put(worker)
+
+    def run(self, job, timeout=None, cpu_limit=None):
+        """
+        Bir değerlendirme işini boşta olan ilk işçide çalıştırır ve sonucunu döndürür.
+
+        Args:
+            job (dict): İş tanımı. 'task' anahtarı evaluator.TASKS içinden çalıştırılacak
+                fonksiyonu seçer (varsayılan: 'evaluate', yani execute_submission).
+            timeout (Optional[float]): Duvar saati sınırı. Verilmezse havuz varsayılanı kullanılır.
+            cpu_limit (Optional[int]): CPU süresi sınırı. Verilmezse havuz varsayılanı kullanılır.
+
+        Returns:
+            dict: Başarılıysa {'ok': True, 'result': ...}, aksi halde 'status' ve 'error'
+            anahtarlarını içeren bir sözlük.
+        """
+        self.start()
+        timeout = timeout or self.wall_timeout
+        job = dict(job, cpu_limit=cpu_limit or self.cpu_limit)
+
+        # Tüm işçiler meşgulse sırada bekle
+        worker = self._idle.get()
+        try:
+            worker.conn.send(job)
+            worker.jobs_done += 1
+            if worker.conn.poll(timeout):
+                return worker.conn.recv()
+
+            # Süre aşıldı - işçiyi öldür, yerine yenisi başlatılacak
+            worker.stop(kill=True)
+            return {"ok": False, "status": "timeout",
+                    "error": f"Değerlendirme {timeout} saniyelik süre sınırını aştı"}
+        except (EOFError, OSError) as e:
+            worker.stop(kill=True)
+            return {"ok": False, "status": "crashed", "error": f"Sandbox işçisi beklenmedik şekilde sonlandı: {e}"}
+        finally:
+            self._release(worker)
+
+    def shutdown(self):
+        """Tüm işçi süreçleri durdurur."""
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._idle.get_nowait().stop()
+                except queue.Empty:
+                    break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool():
+    """
+    Uygulama genelinde paylaşılan SandboxPool örneğini döndürür, yoksa Config ayarlarıyla oluşturur.
+
+    Returns:
+        SandboxPool: Paylaşılan havuz örneği.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from config import Config
+                _pool = SandboxPool(
+                    size=Config.EVALUATOR_POOL_SIZE,
+                    max_jobs_per_worker=Config.EVALUATOR_MAX_JOBS_PER_WORKER,
+                    wall_timeout=Config.EVALUATOR_JOB_TIMEOUT,
+                    cpu_limit=Config.EVALUATOR_JOB_CPU_LIMIT
+                )
+                atexit.register(_pool.shutdown)
+    return _pool
@@ -0,0 +1,347 @@
+# app/services/search_index.py
+"""
+Notebook'lar ve notebook özetleri üzerinde süreç içi ters indeks (inverted index).
+
+Her notebook için iki belge tutulur: notebook içeriği (başlık, markdown ve kod hücreleri)
+ve notebook_summary tablosundaki özet metni. Belgeler sürümleriyle (notebook için git
+blob özeti, özet için metnin özeti) saklanır; depo eşitlemesinden sonra yalnızca
+değişen notebook'lar yeniden indekslenir. Sorgular BM25 ile puanlanır ve notebook
+bazında birleştirilir, böylece arama hiçbir notebook dosyasını açmadan yapılır.
+"""
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+from sqlalchemy import text
+
+from app.services.notebook_catalog import read_cells
+
+logger = logging.getLogger(__name__)
+
+NOTEBOOK = 'notebook'
+SUMMARY = 'summary'
+
+# Alan ağırlıkları: başlıktaki eşleşme kod içindeki eşleşmeden daha değerlidir
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'markdown': 1.5,
+    'code': 1.0,
+    'summary': 1.0,
+    'code_explanation': 0.5,
+}
+
+# BM25 parametreleri
+K1 = 1.2
+B = 0.75
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+# Kullanıcılar "giriş" yerine "giris" yazabildiği için Türkçe karakterler sadeleştirilir
+_FOLD_TABLE = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+SNIPPET_LENGTH = 200
+
+
+def tokenize(value):
+    """
+    Metni küçük harfe çevrilmiş ve Türkçe karakterleri sadeleştirilmiş terimlere ayırır.
+    Alt çizgili tanımlayıcılar (read_csv) hem bütün olarak hem de parçalarıyla eklenir.
+
+    Args:
+        value (str): İndekslenecek veya aranacak metin.
+
+    Returns:
+        list: Terimler.
+    """
+    tokens = []
+    folded = (value or '').replace('İ', 'i').lower().translate(_FOLD_TABLE)
+    for token in _TOKEN_PATTERN.findall(folded):
+        token = token.strip('_')
+        if len(token) < 2:
+            continue
+        tokens.append(token)
+        if '_' in token:
+            tokens.extend(part for part in token.split('_') if len(part) >= 2)
+    return tokens
+
+
+def _source(cell):
+    source = cell.get('source') or ''
+    return ''.join(source) if isinstance(source, list) else source
+
+
+class SearchIndex:
+    """
+    Notebook içerikleri ve özetleri için iş parçacığı güvenli ters indeks.
+
+    Attributes:
+        built (bool): İndeksin en az bir kez katalog ve özet tablosundan oluşturulup oluşturulmadığı.
+    """
+
+    def __init__(self):
+        self.built = False
+        self._postings = {}  # terim -> {belge anahtarı: ağırlıklı terim frekansı}
+        self._docs = {}  # (tür, notebook yolu) -> {'version', 'length', 'terms'}
+        self._titles = {}
+        self._snippets = {}
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def version_of(self, kind, notebook_path):
+        """Belgenin indekslenmiş sürümünü döndürür, yoksa None."""
+        doc = self._docs.get((kind, notebook_path))
+        return doc['version'] if doc else None
+
+    def _remove(self, key):
+        doc = self._docs.pop(key, None)
+        if not doc:
+            return
+        self._total_length -= doc['length']
+        for term in doc['terms']:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+
+    def index_document(self, kind, notebook_path, version, fields):
+        """
+        Bir belgeyi indeksler; aynı anahtarla önceki sürüm varsa yerine geçer.
+
+        Args:
+            kind (str): NOTEBOOK veya SUMMARY.
+            notebook_path (str): Notebook'un depo köküne göre yolu.
+            version (str): Belgenin sürüm anahtarı.
+            fields (dict): FIELD_WEIGHTS anahtarlarından alan adı -> metin.
+        """
+        weights = Counter()
+        length = 0
+        for field, value in fields.items():
+            tokens = tokenize(value)
+            length += len(tokens)
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokens:
+                weights[token] += weight
+
+        key = (kind, notebook_path)
+        with self._lock:
+            self._remove(key)
+            for term, weight in weights.items():
+                self._postings.setdefault(term, {})[key] = weight
+            self._docs[key] = {'version': version, 'length': length, 'terms': tuple(weights)}
+            self._total_length += length
+
+    def remove_document(self, kind, notebook_path):
+        """Bir belgeyi indeksten çıkarır."""
+        with self._lock:
+            self._remove((kind, notebook_path))
+
+    def refresh_notebooks(self, repo_dir, entries):
+        """
+        Katalog kayıtlarına göre notebook belgelerini günceller. Sürümü (blob özeti)
+        değişmeyen notebook'lar okunmaz; katalogda artık bulunmayanlar silinir.
+
+        Args:
+            repo_dir (str): Depo kök dizini.
+            entries (list): Notebook katalog kayıtları.
+
+        Returns:
+            int: Yeniden indekslenen notebook sayısı.
+        """
+        changed = 0
+        seen = set()
+        for entry in entries:
+            notebook_path = entry['notebook_path']
+            seen.add(notebook_path)
+            self._titles[notebook_path] = entry['title']
+            if self.version_of(NOTEBOOK, notebook_path) == entry['blob_hash']:
+                continue
+            try:
+                with open(os.path.join(repo_dir, notebook_path), 'rb') as f:
+                    cells = read_cells(f.read(), notebook_path)
+            except OSError as e:
+                logger.warning(f"Notebook indekslenemedi: {notebook_path}: {str(e)}")
+                continue
+            self.index_document(NOTEBOOK, notebook_path, entry['blob_hash'], {
+                'title': entry['title'],
+                'markdown': '\n'.join(_source(cell) for cell in cells if cell.get('cell_type') == 'markdown'),
+                'code': '\n'.join(_source(cell) for cell in cells if cell.get('cell_type') == 'code'),
+            })
+            changed += 1
+
+        with self._lock:
+            for kind, notebook_path in list(self._docs):
+                if kind == NOTEBOOK and notebook_path not in seen:
+                    self._remove((kind, notebook_path))
+                    self._titles.pop(notebook_path, None)
+        return changed
+
+    def update_summary(self, notebook_path, summary, code_explanation=None):
+        """
+        Bir notebook özetini indeksler; metin değişmediyse bir şey yapmaz.
+
+        Args:
+            notebook_path (str): Notebook'un depo köküne göre yolu.
+            summary (str): Özet metni.
+            code_explanation (Optional[str]): Kod açıklaması metni.
+
+        Returns:
+            bool: Özet yeniden indekslendiyse True.
+        """
+        summary = summary or ''
+        code_explanation = code_explanation or ''
+        version = hashlib.sha1(f"{summary}\0{code_explanation}".encode('utf-8')).hexdigest()
+        if self.version_of(SUMMARY, notebook_path) == version:
+            return False
+        self.index_document(SUMMARY, notebook_path, version,
+                            {'summary': summary, 'code_explanation': code_explanation})
+        self._snippets[notebook_path] = summary[:SNIPPET_LENGTH]
+        return True
+
+    def refresh_summaries(self, session):
+        """
+        notebook_summary tablosundaki özetleri indeksle eşitler.
+
+        Args:
+            session: SQLAlchemy oturumu.
+
+        Returns:
+            int: Yeniden indekslenen özet sayısı.
+        """
+        rows = session.execute(text(
+            "SELECT notebook_path, summary, code_explanation FROM notebook_summary"
+        )).fetchall()
+
+        changed = 0
+        seen = set()
+        for row in rows:
+            seen.add(row.notebook_path)
+            if self.update_summary(row.notebook_path, row.summary, row.code_explanation):
+                changed += 1
+
+        with self._lock:
+            for kind, notebook_path in list(self._docs):
+                if kind == SUMMARY and notebook_path not in seen:
+                    self._remove((kind, notebook_path))
+                    self._snippets.pop(notebook_path, None)
+        return changed
+
+    def rebuild(self, session):
+        """
+        İndeksi katalog ve özet tablosuyla eşitler (yalnızca değişen belgeler okunur).
+
+        Args:
+            session: SQLAlchemy oturumu.
+        """
+        from app.services.notebook_catalog import get_notebook_catalog
+
+        with self._build_lock:
+            catalog = get_notebook_catalog()
+            if catalog.ensure_loaded(session):
+                notebooks = self.refresh_notebooks(catalog.repo_dir, catalog.entries())
+            else:
+                notebooks = 0
+            summaries = self.refresh_summaries(session)
+            self.built = True
+        logger.info(f"Arama indeksi güncellendi: {notebooks} notebook, {summaries} özet yeniden indekslendi")
+
+    def ensure_built(self, session):
+        """İndeks henüz oluşturulmadıysa oluşturur."""
+        if not self.built:
+            self.rebuild(session)
+
+    def search(self, query, limit=20):
+        """
+        Sorguyu BM25 ile puanlayıp notebook bazında sıralanmış sonuçları döndürür.
+        Sorgudaki terimlerin daha fazlasını içeren notebook'lar öne çıkar.
+
+        Args:
+            query (str): Arama metni.
+            limit (int): Döndürülecek en fazla sonuç sayısı.
+
+        Returns:
+            list: 'notebook_path', 'title', 'score', 'matched_in' ve 'snippet' anahtarlarını
+            içeren sözlükler.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        scores = Counter()
+        matched_terms = {}
+        matched_in = {}
+        with self._lock:
+            doc_count = len(self._docs)
+            if not doc_count:
+                return []
+            average_length = (self._total_length / doc_count) or 1.0
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    length = self._docs[key]['length']
+                    norm = K1 * (1 - B + B * length / average_length)
+                    kind, notebook_path = key
+                    scores[notebook_path] += idf * frequency * (K1 + 1) / (frequency + norm)
+                    matched_terms.setdefault(notebook_path, set()).add(term)
+                    matched_in.setdefault(notebook_path, set()).add(kind)
+
+            results = []
+            for notebook_path, score in scores.items():
+                # Tüm terimleri içermeyen notebook'lar oransal olarak geriye düşer
+                score *= len(matched_terms[notebook_path]) / len(terms)
+                results.append({
+                    'notebook_path': notebook_path,
+                    'title': self._titles.get(notebook_path) or os.path.splitext(os.path.basename(notebook_path))[0],
+                    'score': round(score, 4),
+                    'matched_in': sorted(matched_in[notebook_path]),
+                    'snippet': self._snippets.get(notebook_path)
+                })
+
+        results.sort(key=lambda result: (-result['score'], result['notebook_path']))
+        return results[:limit]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """
+    Uygulama genelinde paylaşılan SearchIndex örneğini döndürür.
+
+    Returns:
+        SearchIndex: Paylaşılan indeks.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex()
+    return _index
+
+
+def register_search_refresh(app, db):
+    """
+    Her başarılı depo eşitlemesinden sonra (katalog yenilendikten sonra) arama indeksinin
+    değişen notebook'lar için güncellenmesini sağlar.
+
+    Args:
+        app (Flask): Uygulama bağlamını sağlayan Flask nesnesi.
+        db: Flask-SQLAlchemy nesnesi.
+    """
+    from app.services.repo_sync import get_repo_sync
+
+    def refresh(repo_dir):
+        with app.app_context():
+            get_search_index().rebuild(db.session)
+
+    get_repo_sync().add_listener(refresh)
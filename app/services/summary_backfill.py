@@ -0,0 +1,403 @@
+# app/services/summary_backfill.py
+"""
+Özeti olmayan veya içeriği özetinden sonra değişen notebook'lar için /api/notebook-summary
+isteklerini zamanlayan iş.
+
+İstekler sabit bir bekleme yerine sağlayıcının dakika başına istek (RPM) ve token (TPM)
+kotalarını temsil eden iki token kovasıyla sınırlandırılır ve en fazla belirli sayıda
+notebook aynı anda işlenir. Başarısız denemeler üstel ve rastgele dağıtılmış (jitter)
+bekleme ile tekrarlanır. Her notebook'un durumu summary_backfill tablosunda tutulduğu
+için uygulama yeniden başladığında iş kaldığı yerden devam eder. Her depo eşitlemesinden
+sonra iş yeniden çalışır ve yalnızca içerik özeti (content_hash) değişen notebook'ları ele alır.
+"""
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = 'pending'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# /api/notebook-summary bir notebook için özet ve teknik analiz isteklerine ek olarak
+# her CODE_GROUP_SIZE kod hücresi için bir istek yapar
+BASE_REQUESTS = 2
+CODE_GROUP_SIZE = 10
+# Token tahmini: istemlere giren metin en fazla PROMPT_CHAR_LIMIT karakterdir,
+# her isteğin yanıtı için ayrıca OUTPUT_TOKENS_PER_REQUEST token ayrılır
+PROMPT_CHAR_LIMIT = 65000
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKENS_PER_REQUEST = 2000
+
+# Bu HTTP durumları geçici kabul edilir ve tekrar denenir
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def estimate_cost(entry):
+    """
+    Bir notebook'un özetlenmesinin harcayacağı istek ve token miktarını katalog kaydından tahmin eder.
+
+    Args:
+        entry (dict): Notebook katalog kaydı ('size' ve 'code_cell_count' kullanılır).
+
+    Returns:
+        tuple: (istek sayısı, token sayısı)
+    """
+    requests_needed = BASE_REQUESTS + math.ceil((entry.get('code_cell_count') or 0) / CODE_GROUP_SIZE)
+    prompt_tokens = min(entry.get('size') or 0, PROMPT_CHAR_LIMIT) // CHARS_PER_TOKEN
+    return requests_needed, prompt_tokens + requests_needed * OUTPUT_TOKENS_PER_REQUEST
+
+
+def backoff_delay(attempt, base, cap):
+    """
+    Tam rastgele dağıtılmış (full jitter) üstel bekleme süresini hesaplar.
+
+    Args:
+        attempt (int): Başarısız deneme sayısı (1'den başlar).
+        base (float): İlk bekleme süresinin üst sınırı (saniye).
+        cap (float): Bekleme süresinin en büyük değeri (saniye).
+
+    Returns:
+        float: Saniye cinsinden bekleme süresi.
+    """
+    return random.uniform(0, min(cap, base * 2 ** max(attempt - 1, 0)))
+
+
+class TokenBucket:
+    """
+    Dakika başına belirli bir miktarın harcanmasına izin veren iş parçacığı güvenli token kovası.
+
+    Kova doluyken bir dakikalık kota birden harcanabilir; sonrasında harcama dolum hızıyla
+    sınırlanır. Kovanın kapasitesinden büyük istekler kapasiteye indirilir, aksi halde
+    hiçbir zaman karşılanamazlardı.
+
+    Attributes:
+        rate (float): Dakika başına eklenen miktar. 0 ise sınırsız.
+        capacity (float): Kovada biriktirilebilecek en fazla miktar.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic):
+        self.rate = max(0.0, float(rate_per_minute))
+        self.capacity = float(capacity if capacity is not None else self.rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount):
+        """
+        Miktarı kovadan ayırır ve ayrılan miktar kullanılabilir olana kadar beklenmesi
+        gereken süreyi döndürür. Bekleyen çağıranlar sırayla sonraki dolumları ayırır.
+
+        Args:
+            amount (float): Harcanacak miktar.
+
+        Returns:
+            float: Saniye cinsinden beklenecek süre.
+        """
+        if not self.rate:
+            return 0.0
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / 60.0)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens * 60.0 / self.rate
+
+    def acquire(self, amount=1):
+        """Miktar kullanılabilir olana kadar bekler."""
+        delay = self.reserve(amount)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class SummaryBackfill:
+    """
+    Notebook özetlerini kota ve eşzamanlılık sınırları içinde oluşturan iş.
+
+    Attributes:
+        url (str): /api/notebook-summary adresi.
+        concurrency (int): Aynı anda özetlenen en fazla notebook sayısı.
+        max_attempts (int): Bir notebook sürümü için yapılacak en fazla deneme sayısı.
+        backoff_base (float): İlk yeniden deneme beklemesinin üst sınırı (saniye).
+        backoff_max (float): Yeniden deneme beklemesinin en büyük değeri (saniye).
+        timeout (float): Tek bir özet isteği için süre sınırı (saniye).
+        runs (int): Başlatılan çalıştırma sayısı.
+    """
+
+    def __init__(self, url, requests_per_minute=15, tokens_per_minute=250000, concurrency=2,
+                 max_attempts=5, backoff_base=5, backoff_max=300, timeout=900):
+        self.url = url
+        self.concurrency = max(1, int(concurrency))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.running = False
+        self.runs = 0
+        self._counts = {STATUS_DONE: 0, STATUS_FAILED: 0, 'skipped': 0, 'total': 0}
+        self._lock = threading.Lock()
+
+    def status(self):
+        """Son (veya devam eden) çalıştırmanın sayaçlarını döndürür."""
+        with self._lock:
+            return dict(self._counts, running=self.running)
+
+    def _count(self, key):
+        with self._lock:
+            self._counts[key] += 1
+
+    def _post(self, notebook_path):
+        import requests
+        return requests.post(self.url, json={"notebook_path": notebook_path}, timeout=self.timeout)
+
+    def _attempt(self, notebook_path, cost):
+        """
+        Kotadan pay ayırıp tek bir özet isteği yapar.
+
+        Returns:
+            tuple: (sonuç, hata, en erken tekrar deneme süresi). sonuç STATUS_DONE,
+            STATUS_PENDING (geçici hata) veya STATUS_FAILED (kalıcı hata) olur.
+        """
+        requests_needed, tokens_needed = cost
+        self.request_bucket.acquire(requests_needed)
+        self.token_bucket.acquire(tokens_needed)
+        try:
+            response = self._post(notebook_path)
+        except OSError as e:  # requests.RequestException de OSError'dan türer
+            return STATUS_PENDING, f"API isteği başarısız: {str(e)}", 0
+
+        if response.status_code == 200:
+            error = response.json().get("error")
+            if error:
+                return STATUS_PENDING, error, 0
+            return STATUS_DONE, None, 0
+
+        error = f"API hatası: {response.status_code} - {response.text[:500]}"
+        if response.status_code not in RETRY_STATUS_CODES:
+            return STATUS_FAILED, error, 0
+        try:
+            retry_after = float(response.headers.get('Retry-After') or 0)
+        except ValueError:
+            retry_after = 0
+        return STATUS_PENDING, error, retry_after
+
+    def summarize(self, notebook_path, cost, attempts=0, not_before=None, on_progress=None):
+        """
+        Bir notebook'u başarıya ulaşana veya deneme hakkı bitene kadar özetlemeyi dener.
+
+        Args:
+            notebook_path (str): Notebook'un depo köküne göre yolu.
+            cost (tuple): estimate_cost ile tahmin edilen (istek, token) miktarı.
+            attempts (int): Önceki çalıştırmalarda yapılmış deneme sayısı.
+            not_before (Optional[datetime]): İlk denemenin en erken zamanı.
+            on_progress (Optional[Callable]): Her denemeden sonra (durum, deneme sayısı, hata,
+                bir sonraki deneme zamanı) ile çağrılır.
+
+        Returns:
+            str: STATUS_DONE veya STATUS_FAILED.
+        """
+        if not_before:
+            wait = (not_before - datetime.utcnow()).total_seconds()
+            if wait > 0:
+                time.sleep(wait)
+
+        while True:
+            outcome, error, retry_after = self._attempt(notebook_path, cost)
+            attempts += 1
+            next_attempt_at = None
+            if outcome == STATUS_PENDING and attempts >= self.max_attempts:
+                outcome = STATUS_FAILED
+            if outcome == STATUS_PENDING:
+                delay = max(retry_after, backoff_delay(attempts, self.backoff_base, self.backoff_max))
+                next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                logger.warning(f"Özet alınamadı ({notebook_path}, deneme {attempts}/{self.max_attempts}), "
+                               f"{delay:.1f} sn sonra tekrar denenecek: {error}")
+            if on_progress:
+                on_progress(outcome, attempts, error, next_attempt_at)
+            if outcome != STATUS_PENDING:
+                return outcome
+            time.sleep(delay)
+
+    @staticmethod
+    def _save(session, notebook_path, blob_hash, status, attempts, error, next_attempt_at):
+        params = {"path": notebook_path, "blob_hash": blob_hash, "status": status, "attempts": attempts,
+                  "error": error, "next_attempt_at": next_attempt_at, "updated_at": datetime.utcnow()}
+        try:
+            updated = session.execute(text("""
+                UPDATE summary_backfill
+                SET blob_hash = :blob_hash, status = :status, attempts = :attempts, last_error = :error,
+                    next_attempt_at = :next_attempt_at, updated_at = :updated_at
+                WHERE notebook_path = :path
+            """), params)
+            if not updated.rowcount:
+                session.execute(text("""
+                    INSERT INTO summary_backfill
+                        (notebook_path, blob_hash, status, attempts, last_error, next_attempt_at, updated_at)
+                    VALUES (:path, :blob_hash, :status, :attempts, :error, :next_attempt_at, :updated_at)
+                """), params)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Özet ilerlemesi kaydedilemedi ({notebook_path}): {str(e)}")
+
+    def plan(self, session, entries):
+        """
+        Katalog kayıtlarından özetlenecek notebook'ları ve kaldıkları durumu belirler.
+
+        Güncel özeti olan notebook'lar tamamlandı olarak işaretlenir; özeti farklı bir içerik
+        özetiyle (content_hash) üretilmiş notebook'lar yeniden özetlenir. Aynı sürümü için deneme
+        hakkı biten notebook'lar atlanır. Notebook değiştiyse deneme sayısı sıfırlanır.
+
+        Args:
+            session: SQLAlchemy oturumu.
+            entries (list): Notebook katalog kayıtları.
+
+        Returns:
+            list: (katalog kaydı, deneme sayısı, bir sonraki deneme zamanı) demetleri.
+        """
+        summarized = {row.notebook_path: row.content_hash for row in session.execute(text(
+            "SELECT notebook_path, content_hash FROM notebook_summary WHERE summary IS NOT NULL AND LENGTH(summary) > 10"
+        ))}
+        progress = {row.notebook_path: row for row in session.execute(text(
+            "SELECT notebook_path, blob_hash, status, attempts, next_attempt_at FROM summary_backfill"
+        ))}
+
+        jobs = []
+        for entry in entries:
+            notebook_path = entry['notebook_path']
+            row = progress.get(notebook_path)
+            same_version = row is not None and row.blob_hash == entry['blob_hash']
+            # İçerik özeti olmayan eski özetler, istendiklerinde mevcut içeriğe ait kabul edilir
+            summary_hash = summarized.get(notebook_path)
+            if notebook_path in summarized and (summary_hash is None or not entry.get('content_hash')
+                                                or summary_hash == entry['content_hash']):
+                if not same_version or row.status != STATUS_DONE:
+                    self._save(session, notebook_path, entry['blob_hash'], STATUS_DONE,
+                               row.attempts if same_version else 0, None, None)
+                self._count('skipped')
+                continue
+            if same_version and row.status == STATUS_FAILED:
+                self._count('skipped')
+                continue
+            if same_version:
+                jobs.append((entry, row.attempts, row.next_attempt_at))
+            else:
+                jobs.append((entry, 0, None))
+        return jobs
+
+    def run(self, app, db, entries):
+        """
+        Özeti olmayan veya eskimiş notebook'ları sınırlar içinde özetler ve bitene kadar bekler.
+
+        Args:
+            app (Flask): İlerlemenin kaydedileceği uygulama bağlamını sağlayan Flask nesnesi.
+            db: Flask-SQLAlchemy nesnesi.
+            entries (list): Notebook katalog kayıtları.
+        """
+        with self._lock:
+            if self.running:
+                logger.info("Özet oluşturma zaten çalışıyor")
+                return
+            self.running = True
+            self.runs += 1
+            self._counts = {STATUS_DONE: 0, STATUS_FAILED: 0, 'skipped': 0, 'total': len(entries)}
+
+        try:
+            with app.app_context():
+                jobs = self.plan(db.session, entries)
+            logger.info(f"Toplam {len(entries)} notebook bulundu, {len(jobs)} tanesi özetlenecek")
+
+            def work(entry, attempts, not_before):
+                notebook_path = entry['notebook_path']
+
+                def save(status, attempt_count, error, next_attempt_at):
+                    with app.app_context():
+                        self._save(db.session, notebook_path, entry['blob_hash'], status,
+                                   attempt_count, error, next_attempt_at)
+
+                try:
+                    outcome = self.summarize(notebook_path, estimate_cost(entry), attempts, not_before, save)
+                except Exception as e:
+                    logger.error(f"Özet oluşturulamadı ({notebook_path}): {str(e)}")
+                    outcome = STATUS_FAILED
+                self._count(outcome)
+                counts = self.status()
+                logger.info(f"[{counts[STATUS_DONE] + counts[STATUS_FAILED]}/{len(jobs)}] {notebook_path}: {outcome}")
+
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='summary-backfill') as executor:
+                for job in jobs:
+                    executor.submit(work, *job)
+        finally:
+            with self._lock:
+                self.running = False
+        counts = self.status()
+        logger.info(f"Özet oluşturma tamamlandı: {counts[STATUS_DONE]} başarılı, "
+                    f"{counts[STATUS_FAILED]} başarısız, {counts['skipped']} atlandı")
+
+
+_backfill = None
+_backfill_lock = threading.Lock()
+
+
+def get_summary_backfill():
+    """
+    Uygulama genelinde paylaşılan SummaryBackfill örneğini döndürür.
+
+    Returns:
+        SummaryBackfill: Config'teki kota ve eşzamanlılık ayarlarıyla oluşturulmuş iş.
+    """
+    global _backfill
+    if _backfill is None:
+        with _backfill_lock:
+            if _backfill is None:
+                from config import Config
+                _backfill = SummaryBackfill(
+                    Config.FASTAPI_DOMAIN + ":" + Config.FASTAPI_PORT + "/api/notebook-summary",
+                    requests_per_minute=Config.SUMMARY_BACKFILL_RPM,
+                    tokens_per_minute=Config.SUMMARY_BACKFILL_TPM,
+                    concurrency=Config.SUMMARY_BACKFILL_CONCURRENCY,
+                    max_attempts=Config.SUMMARY_BACKFILL_MAX_ATTEMPTS,
+                    backoff_base=Config.SUMMARY_BACKFILL_BACKOFF,
+                    backoff_max=Config.SUMMARY_BACKFILL_BACKOFF_MAX,
+                    timeout=Config.SUMMARY_BACKFILL_TIMEOUT
+                )
+    return _backfill
+
+
+def register_summary_refresh(app, db):
+    """
+    Her başarılı depo eşitlemesinden sonra (katalog yenilendikten sonra) içeriği değişen
+    notebook'ların özetlerinin arka planda yeniden oluşturulmasını sağlar. İlk çalıştırma
+    FastAPI hazır olduğunda uygulama başlangıcında yapıldığından, o zamana kadarki
+    eşitlemeler yok sayılır.
+
+    Args:
+        app (Flask): Uygulama bağlamını sağlayan Flask nesnesi.
+        db: Flask-SQLAlchemy nesnesi.
+    """
+    from app.services.notebook_catalog import get_notebook_catalog
+    from app.services.repo_sync import get_repo_sync
+
+    def refresh(repo_dir):
+        backfill = get_summary_backfill()
+        if not backfill.runs or backfill.running:
+            return
+        thread = threading.Thread(target=backfill.run, args=(app, db, get_notebook_catalog().entries()),
+                                  name='summary-backfill', daemon=True)
+        thread.start()
+
+    get_repo_sync().add_listener(refresh)
@@ -0,0 +1,122 @@
+# app/services/test_plans.py
+"""
+Değerlendirmeler arasında paylaşılan, derlenmiş test planlarının süreç içi LRU önbelleği.
+
+Bir test planı; ayrıştırılmış test girdilerini, seed enjeksiyonu yapılmış çözüm kodunu,
+bu kodun derlenmiş (marshal ile serileştirilmiş) halini ve önbellekteki beklenen
+çıktıları içerir. Planlar (soru ID, updated_at) anahtarıyla saklanır; soru
+güncellendiğinde invalidate() ile düşürülür.
+"""
+import threading
+from collections import OrderedDict
+
+
+class CompiledTestPlan:
+    """
+    Bir soru sürümü için değerlendirmeye hazır test planı.
+
+    Attributes:
+        question_id (Optional[int]): Soru ID değeri.
+        version (Optional[str]): Sorunun updated_at değerinden türetilen sürüm anahtarı.
+        content_hash (str): solution_code, test_inputs ve performans testi ayarlarının
+            özetidir; aynı anahtarla farklı içerik gelirse plan kullanılmaz.
+        test_inputs (list): Ayrıştırılmış test girdileri.
+        solution_code (str): Seed enjeksiyonu yapılmış çözüm kodu.
+        solution_bytecode (Optional[bytes]): Çözüm kodunun marshal ile serileştirilmiş
+            code nesnesi. Derlenemediyse None.
+        expected_outputs (Optional[list]): Önbellekteki beklenen çıktılar.
+        cheapest_first_order (list): Test indislerinin tahmini maliyete (girdi boyutu)
+            göre küçükten büyüğe sıralanmış hali.
+        benchmark (Optional[dict]): Performans sorularında run_benchmark ayarları.
+    """
+
+    def __init__(self, question_id, version, content_hash, test_inputs, solution_code,
+                 solution_bytecode=None, expected_outputs=None, benchmark=None):
+        self.question_id = question_id
+        self.version = version
+        self.content_hash = content_hash
+        self.test_inputs = test_inputs
+        self.solution_code = solution_code
+        self.solution_bytecode = solution_bytecode
+        self.expected_outputs = expected_outputs
+        self.benchmark = benchmark
+        self.cheapest_first_order = sorted(range(len(test_inputs)),
+                                           key=lambda i: len(repr(test_inputs[i])))
+
+    def matches(self, content_hash):
+        """Planın verilen içerik özeti (api.plan_content_hash) için oluşturulup oluşturulmadığını döndürür."""
+        return self.content_hash == content_hash
+
+
+class TestPlanCache:
+    """
+    Boyutu sınırlı, iş parçacığı güvenli LRU test planı önbelleği.
+
+    Attributes:
+        max_size (int): Önbellekte tutulacak en fazla plan sayısı.
+        hits (int): Önbellekten karşılanan istek sayısı.
+        misses (int): Planın yeniden oluşturulduğu istek sayısı.
+    """
+    __test__ = False  # pytest'in bu sınıfı test olarak toplamasını engeller
+
+    def __init__(self, max_size=256):
+        self.max_size = max(1, int(max_size))
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, question_id, version):
+        """Plan önbellekteyse döndürür ve en son kullanılan olarak işaretler, yoksa None."""
+        key = (question_id, version)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, plan):
+        """Planı önbelleğe ekler; sınır aşılırsa en eski planı çıkarır."""
+        key = (plan.question_id, plan.version)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+
+    def invalidate(self, question_id):
+        """Bir soruya ait tüm plan sürümlerini önbellekten çıkarır."""
+        with self._lock:
+            for key in [key for key in self._plans if key[0] == question_id]:
+                del self._plans[key]
+
+    def clear(self):
+        """Önbelleği tamamen temizler."""
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self):
+        return len(self._plans)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_test_plan_cache():
+    """
+    Uygulama genelinde paylaşılan TestPlanCache örneğini döndürür.
+
+    Returns:
+        TestPlanCache: Paylaşılan önbellek örneği.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from config import Config
+                _cache = TestPlanCache(max_size=Config.EVALUATOR_PLAN_CACHE_SIZE)
+    return _cache
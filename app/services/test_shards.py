@@ -0,0 +1,98 @@
+# app/services/test_shards.py
+"""
+Çok sayıda test içeren bir değerlendirmeyi sandbox işçileri arasında bölen yardımcılar.
+
+Test girdileri ardışık parçalara ayrılır; her parça, işin 'order' alanıyla yalnızca
+kendi indislerini çalıştıran ayrı bir iş olarak eşzamanlı yürütülür. Sonuçlar özgün
+test sırasına (test_1, test_2, ...) göre birleştirilir, böylece bölünmüş ve bölünmemiş
+değerlendirmeler aynı biçimde sonuç üretir.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.evaluator import BENCHMARK_KEY, summarize_metrics
+
+
+def split_shards(test_count, shard_count):
+    """
+    Test indislerini en fazla shard_count adet ardışık parçaya böler.
+
+    Args:
+        test_count (int): Test sayısı.
+        shard_count (int): İstenen parça sayısı.
+
+    Returns:
+        list: Her biri test indislerinden oluşan listeler.
+    """
+    indices = list(range(test_count))
+    if not indices:
+        return []
+    size = -(-len(indices) // max(1, shard_count))
+    return [indices[start:start + size] for start in range(0, len(indices), size)]
+
+
+def run_sharded_job(job, shard_count, run_job, benchmark_cost=0):
+    """
+    Test girdilerini ardışık parçalara bölüp her parçayı ayrı bir işçide eşzamanlı çalıştırır
+    ve sonuçları özgün test sırasına göre birleştirir.
+
+    Birleştirilen sonuçta sayaçlar toplanır; 'execution_time' ve 'cpu_time' bölünmemiş
+    değerlendirmede olduğu gibi kullanıcı kodunun tüm testlerdeki toplam süresidir
+    (summarize_metrics), parçaların eşzamanlı geçen duvar saati süresi değildir.
+
+    Args:
+        job (dict): evaluate_with_plan tarafından hazırlanan iş tanımı.
+        shard_count (int): Parça sayısı.
+        run_job (Callable): (iş, test sayısı) alıp SandboxPool.run biçiminde yanıt döndüren fonksiyon.
+        benchmark_cost (int): Performans testinin süre sınırlarına test sayısı cinsinden katkısı.
+
+    Returns:
+        dict: SandboxPool.run ile aynı biçimde yanıt. Parçalardan biri başarısız olursa
+        o parçanın yanıtı döndürülür. Performans testi varsa ayrı bir parçada çalıştırılır
+        ve sonucu 'benchmark' anahtarıyla eklenir.
+    """
+    indices = list(range(len(job["test_inputs"])))
+    shards = split_shards(len(indices), shard_count)
+
+    # Performans testi, test girdisi olmayan ayrı bir parça olarak eşzamanlı çalıştırılır
+    benchmark = job.get("benchmark")
+    shard_jobs = [(dict(job, order=shard, benchmark=None), len(shard)) for shard in shards]
+    if benchmark:
+        shard_jobs.append((dict(job, order=[]), benchmark_cost))
+
+    with ThreadPoolExecutor(max_workers=len(shard_jobs)) as executor:
+        responses = list(executor.map(lambda shard_job: run_job(*shard_job), shard_jobs))
+
+    for response in responses:
+        if not response.get("ok"):
+            return response
+
+    results = [response["result"] for response in responses]
+
+    # Kullanıcı fonksiyonu bulunamadı gibi test öncesi hatalar her parçada aynıdır
+    for shard_result in results:
+        if not shard_result["test_results"] and shard_result["errors"]:
+            return {"ok": True, "result": shard_result}
+
+    # Performans testi sonucu yalnızca tüm testler geçtiyse geçerlidir
+    if benchmark:
+        benchmark_result = results.pop()
+        if all(r["is_correct"] for r in results):
+            results.append(benchmark_result)
+
+    test_results = {}
+    for shard_result in results:
+        test_results.update(shard_result["test_results"])
+    benchmark_entry = test_results.get(BENCHMARK_KEY)
+    test_results = {f"test_{i + 1}": test_results[f"test_{i + 1}"]
+                    for i in indices if f"test_{i + 1}" in test_results}
+    if benchmark_entry is not None:
+        test_results[BENCHMARK_KEY] = benchmark_entry
+
+    return {"ok": True, "result": {
+        "test_results": test_results,
+        "passed_tests": sum(r["passed_tests"] for r in results),
+        "failed_tests": sum(r["failed_tests"] for r in results),
+        "is_correct": all(r["is_correct"] for r in results),
+        "errors": [error for r in results for error in r["errors"]],
+        **summarize_metrics(test_results)
+    }}
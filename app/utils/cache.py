@@ -0,0 +1,69 @@
+# app/utils/cache.py
+"""
+Süreç içi önbellekler için ortak yardımcılar.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Boyutu sınırlı, isteğe bağlı yaşam süreli (TTL), iş parçacığı güvenli LRU önbellek.
+
+    Attributes:
+        max_size (int): Önbellekte tutulacak en fazla kayıt sayısı.
+        ttl (Optional[float]): Bir kaydın geçerli kalacağı süre (saniye). None ise süresizdir.
+        hits (int): Önbellekten karşılanan istek sayısı.
+        misses (int): Önbellekte bulunamayan istek sayısı.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max(1, int(max_size))
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Kayıt varsa ve süresi dolmamışsa döndürür, en son kullanılan olarak işaretler."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._items[key]
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Kaydı ekler; sınır aşılırsa en eski kaydı çıkarır."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Kaydı önbellekten çıkarır ve değerini döndürür."""
+        with self._lock:
+            item = self._items.pop(key, None)
+            return item[0] if item else default
+
+    def clear(self):
+        """Önbelleği tamamen temizler."""
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,45 @@
+# app/utils/schema.py
+"""
+Var olan tablolara, modele sonradan eklenen sütunları ekleyen şema yardımcıları.
+
+db.create_all() yalnızca eksik tabloları oluşturur; mevcut tablolara yeni sütun
+eklemez. Bu modül, uygulama başlarken eksik sütunları ALTER TABLE ile ekler.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+
+def add_missing_columns(db, *models):
+    """
+    Modellerde tanımlı olup veritabanı tablosunda bulunmayan sütunları ekler.
+
+    Eklenen sütunlar her zaman NULL kabul eder; varsayılan değerler uygulama
+    tarafından atanır.
+
+    Args:
+        db (SQLAlchemy): Flask-SQLAlchemy nesnesi.
+        *models: Kontrol edilecek model sınıfları.
+    """
+    inspector = inspect(db.engine)
+    dialect = db.engine.dialect
+
+    for model in models:
+        table = model.__table__
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=dialect)
+            db.session.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type} NULL'))
+            if column.index:
+                db.session.execute(text(
+                    f'CREATE INDEX ix_{table.name}_{column.name} ON {table.name} ({column.name})'))
+            logger.info(f"{table.name} tablosuna {column.name} sütunu eklendi")
+
+    db.session.commit()
@@ -20,6 +20,66 @@ class Config:
         PERMANENT_SESSION_LIFETIME (int): Oturumların kalıcı ömrünü saniye
             cinsinden tanımlar.
         REPO_URL (str): GitHub depo URL'sini tanımlar.
+        REPO_SYNC_INTERVAL (int): Notebook deposunun arka planda güncellenme aralığı (saniye).
+            0 ise depo yalnızca /refresh_repo ile güncellenir.
+        REPO_SYNC_TIMEOUT (int): Tek bir git komutu için süre sınırı (saniye).
+        NOTEBOOK_CACHE_SIZE (int): Bellekte tutulacak ayrıştırılmış notebook sayısı.
+        NOTEBOOK_RENDER_DIR (str): Notebook'ların önceden üretilmiş HTML parçalarının
+            saklandığı dizin.
+        NOTEBOOK_KERNEL_MAX (int): Notebook kodunu çalıştıran kullanıcı çekirdeklerinin en fazla sayısı.
+        NOTEBOOK_KERNEL_IDLE_TIMEOUT (int): Bu süre (saniye) kullanılmayan çekirdekler kapatılır.
+        NOTEBOOK_KERNEL_SPARES (int): Kullanıcıya atanmayı bekleyen ısıtılmış çekirdek sayısı.
+        NOTEBOOK_KERNEL_MEMORY_LIMIT_MB (int): Bir kullanıcının kodunun çekirdeğinde ayırabileceği ek bellek (MB).
+        NOTEBOOK_KERNEL_MEMORY_BUDGET_MB (int): Tüm çekirdeklerin toplam bellek bütçesi (MB). Aşıldığında
+            boşta olan çekirdekler en az yakın zamanda kullanılandan başlayarak kapatılır. 0 ise sınırsız.
+        NOTEBOOK_OUTPUT_FLUSH_MS (int): Çalışan kodun çıktısının istemciye gönderilmeden önce en fazla
+            bekletileceği süre (ms).
+        NOTEBOOK_OUTPUT_CHUNK_KB (int): İstemciye tek seferde gönderilecek çıktı parçasının boyutu (KB).
+        NOTEBOOK_OUTPUT_WINDOW (int): İstemcinin henüz onaylamadığı en fazla çıktı parçası sayısı; dolduğunda
+            kodun çıktısı istemci yetişene kadar bekletilir.
+        SUMMARY_BACKFILL_RPM (int): Notebook özetleri oluşturulurken AI sağlayıcısına dakikada
+            gönderilebilecek en fazla istek sayısı. 0 ise sınırsız.
+        SUMMARY_BACKFILL_TPM (int): Notebook özetleri oluşturulurken dakikada harcanabilecek
+            tahmini en fazla token sayısı. 0 ise sınırsız.
+        SUMMARY_BACKFILL_CONCURRENCY (int): Aynı anda özetlenen en fazla notebook sayısı.
+        SUMMARY_BACKFILL_MAX_ATTEMPTS (int): Bir notebook özeti için yapılacak en fazla deneme sayısı.
+        SUMMARY_BACKFILL_BACKOFF (float): Başarısız bir özet isteğinden sonraki ilk beklemenin
+            üst sınırı (saniye); her denemede iki katına çıkar.
+        SUMMARY_BACKFILL_BACKOFF_MAX (float): Yeniden deneme beklemesinin en büyük değeri (saniye).
+        SUMMARY_BACKFILL_TIMEOUT (int): Tek bir notebook özeti isteği için süre sınırı (saniye).
+        AI_PROVIDER_CONCURRENCY (int): Bir AI sağlayıcısına aynı anda gönderilebilecek en fazla istek sayısı.
+        AI_HEALTH_TTL (int): Başarılı bir AI çağrısının sağlayıcıyı canlı saymak için geçerli kaldığı süre (saniye).
+        AI_CIRCUIT_FAILURE_THRESHOLD (int): AI sağlayıcısına istek gönderimini durduran art arda
+            başarısız çağrı sayısı.
+        AI_CIRCUIT_RESET_TIMEOUT (int): İstek gönderimi durdurulan sağlayıcının yeniden denenmeden önce
+            beklendiği süre (saniye).
+        EVALUATOR_POOL_SIZE (int): Kod değerlendirme için önceden başlatılan işçi süreç sayısı.
+        EVALUATOR_MAX_JOBS_PER_WORKER (int): Bir işçi sürecin yenilenmeden önce çalıştıracağı iş sayısı.
+        EVALUATOR_JOB_TIMEOUT (float): Bir değerlendirme işi için saniye cinsinden duvar saati sınırı.
+        EVALUATOR_JOB_CPU_LIMIT (int): Bir değerlendirme işi için saniye cinsinden CPU süresi sınırı.
+        EVALUATOR_TEST_TIMEOUT (float): Tek bir test çağrısı için saniye cinsinden duvar saati sınırı.
+        EVALUATOR_TEST_CPU_LIMIT (float): Tek bir test çağrısı için saniye cinsinden CPU süresi sınırı.
+        EVALUATOR_MEMORY_LIMIT_MB (int): İşçi sürecin kullanıcı kodu için ayırabileceği ek bellek (MB).
+        EVALUATOR_OUTPUT_LIMIT_KB (int): Kullanıcı kodunun üretebileceği en fazla çıktı boyutu (KB).
+        EVALUATOR_PLAN_CACHE_SIZE (int): Bellekte tutulacak derlenmiş test planı sayısı.
+        EVALUATOR_TRACE_MEMORY (bool): Test başına tepe bellek kullanımının tüm sorularda
+            tracemalloc ile ölçülüp ölçülmeyeceği. Açıkken kullanıcı kodu belirgin biçimde
+            yavaşlar; kapalıyken (varsayılan) yalnızca performans sorularında ölçülür.
+        EVALUATOR_BENCHMARK_SIZES (list): Performans sorularında boyut üretecine verilen
+            varsayılan girdi boyutları.
+        EVALUATOR_BENCHMARK_TOLERANCE (float): Kullanıcı kodunun referans çözüm süresinin
+            en fazla kaç katı sürebileceği (soru kendi toleransını belirtmezse).
+        EVALUATOR_GROWTH_TOLERANCE (float): Ölçülen büyüme üssünün referansınkini en fazla
+            ne kadar aşabileceği (ör. 0.5 ile O(n log n) sorusunda O(n²) reddedilir).
+        EVALUATOR_BENCHMARK_REPEATS (int): Her boyut için yapılan ölçüm tekrarı; en kısa süre alınır.
+        EVALUATOR_SHARD_MIN_TESTS (int): Bir değerlendirme işçiler arasında bölünürken her
+            parçaya düşecek en az test sayısı. 0 (varsayılan) bölmeyi kapatır.
+        EVALUATION_JOB_WORKERS (int): Arka planda aynı anda değerlendirilen gönderim sayısı.
+        EVALUATION_JOB_TTL (int): Tamamlanan değerlendirme işlerinin bellekte tutulma süresi (saniye).
+        EVALUATION_RESULT_CACHE_SIZE (int): Aynı kodun tekrar gönderimi için saklanan sonuç sayısı.
+        EVALUATION_RESULT_CACHE_TTL (int): Saklanan değerlendirme sonuçlarının geçerlilik süresi (saniye).
+        EVALUATION_RESULT_CACHE_PERSIST (bool): Bellekte bulunamayan sonuçların Submission
+            tablosundaki code_hash üzerinden aranıp aranmayacağı.
     """
     FASTAPI_DOMAIN = os.environ.get('FASTAPI_DOMAIN') or 'http://127.0.0.1'
     FASTAPI_PORT = os.environ.get('FASTAPI_PORT') or '7923'
@@ -34,6 +94,60 @@ class Config:
 
     # GitHub repo URL
     REPO_URL = 'https://github.com/msy-bilecik/ist204_2025'
+    REPO_SYNC_INTERVAL = int(os.environ.get('REPO_SYNC_INTERVAL') or 300)
+    REPO_SYNC_TIMEOUT = int(os.environ.get('REPO_SYNC_TIMEOUT') or 120)
+    NOTEBOOK_CACHE_SIZE = int(os.environ.get('NOTEBOOK_CACHE_SIZE') or 64)
+    NOTEBOOK_RENDER_DIR = os.environ.get('NOTEBOOK_RENDER_DIR') or os.path.join(os.getcwd(), 'instance', 'notebook_html')
+    NOTEBOOK_KERNEL_MAX = int(os.environ.get('NOTEBOOK_KERNEL_MAX') or 32)
+    NOTEBOOK_KERNEL_IDLE_TIMEOUT = int(os.environ.get('NOTEBOOK_KERNEL_IDLE_TIMEOUT') or 900)
+    NOTEBOOK_KERNEL_SPARES = int(os.environ.get('NOTEBOOK_KERNEL_SPARES') or 2)
+    NOTEBOOK_KERNEL_MEMORY_LIMIT_MB = int(os.environ.get('NOTEBOOK_KERNEL_MEMORY_LIMIT_MB') or 512)
+    NOTEBOOK_KERNEL_MEMORY_BUDGET_MB = int(os.environ.get('NOTEBOOK_KERNEL_MEMORY_BUDGET_MB') or 4096)
+    NOTEBOOK_OUTPUT_FLUSH_MS = int(os.environ.get('NOTEBOOK_OUTPUT_FLUSH_MS') or 50)
+    NOTEBOOK_OUTPUT_CHUNK_KB = int(os.environ.get('NOTEBOOK_OUTPUT_CHUNK_KB') or 4)
+    NOTEBOOK_OUTPUT_WINDOW = int(os.environ.get('NOTEBOOK_OUTPUT_WINDOW') or 8)
+
+    # Notebook özetlerinin toplu oluşturulması
+    SUMMARY_BACKFILL_RPM = int(os.environ.get('SUMMARY_BACKFILL_RPM') or 15)
+    SUMMARY_BACKFILL_TPM = int(os.environ.get('SUMMARY_BACKFILL_TPM') or 250000)
+    SUMMARY_BACKFILL_CONCURRENCY = int(os.environ.get('SUMMARY_BACKFILL_CONCURRENCY') or 2)
+    SUMMARY_BACKFILL_MAX_ATTEMPTS = int(os.environ.get('SUMMARY_BACKFILL_MAX_ATTEMPTS') or 5)
+    SUMMARY_BACKFILL_BACKOFF = float(os.environ.get('SUMMARY_BACKFILL_BACKOFF') or 5)
+    SUMMARY_BACKFILL_BACKOFF_MAX = float(os.environ.get('SUMMARY_BACKFILL_BACKOFF_MAX') or 300)
+    SUMMARY_BACKFILL_TIMEOUT = int(os.environ.get('SUMMARY_BACKFILL_TIMEOUT') or 900)
+
+    # AI sağlayıcı eşzamanlılık sınırı ve sağlık monitörü
+    AI_PROVIDER_CONCURRENCY = int(os.environ.get('AI_PROVIDER_CONCURRENCY') or 4)
+    AI_HEALTH_TTL = int(os.environ.get('AI_HEALTH_TTL') or 60)
+    AI_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('AI_CIRCUIT_FAILURE_THRESHOLD') or 3)
+    AI_CIRCUIT_RESET_TIMEOUT = int(os.environ.get('AI_CIRCUIT_RESET_TIMEOUT') or 60)
+
+    # Kod değerlendirme sandbox havuzu
+    EVALUATOR_POOL_SIZE = int(os.environ.get('EVALUATOR_POOL_SIZE') or os.cpu_count() or 2)
+    EVALUATOR_MAX_JOBS_PER_WORKER = int(os.environ.get('EVALUATOR_MAX_JOBS_PER_WORKER') or 100)
+    EVALUATOR_JOB_TIMEOUT = float(os.environ.get('EVALUATOR_JOB_TIMEOUT') or 10)
+    EVALUATOR_JOB_CPU_LIMIT = int(os.environ.get('EVALUATOR_JOB_CPU_LIMIT') or 5)
+    EVALUATOR_TEST_TIMEOUT = float(os.environ.get('EVALUATOR_TEST_TIMEOUT') or 2)
+    EVALUATOR_TEST_CPU_LIMIT = float(os.environ.get('EVALUATOR_TEST_CPU_LIMIT') or 1)
+    EVALUATOR_MEMORY_LIMIT_MB = int(os.environ.get('EVALUATOR_MEMORY_LIMIT_MB') or 256)
+    EVALUATOR_OUTPUT_LIMIT_KB = int(os.environ.get('EVALUATOR_OUTPUT_LIMIT_KB') or 64)
+    EVALUATOR_PLAN_CACHE_SIZE = int(os.environ.get('EVALUATOR_PLAN_CACHE_SIZE') or 256)
+    EVALUATOR_TRACE_MEMORY = (os.environ.get('EVALUATOR_TRACE_MEMORY') or 'false').lower() == 'true'
+    EVALUATOR_BENCHMARK_SIZES = [int(size) for size in
+                                 (os.environ.get('EVALUATOR_BENCHMARK_SIZES') or '1000,2000,4000,8000').split(',')]
+    EVALUATOR_BENCHMARK_TOLERANCE = float(os.environ.get('EVALUATOR_BENCHMARK_TOLERANCE') or 3)
+    EVALUATOR_GROWTH_TOLERANCE = float(os.environ.get('EVALUATOR_GROWTH_TOLERANCE') or 0.5)
+    EVALUATOR_BENCHMARK_REPEATS = int(os.environ.get('EVALUATOR_BENCHMARK_REPEATS') or 3)
+    EVALUATOR_SHARD_MIN_TESTS = int(os.environ.get('EVALUATOR_SHARD_MIN_TESTS') or 0)
+
+    # Arka plan değerlendirme iş kuyruğu
+    EVALUATION_JOB_WORKERS = int(os.environ.get('EVALUATION_JOB_WORKERS') or EVALUATOR_POOL_SIZE)
+    EVALUATION_JOB_TTL = int(os.environ.get('EVALUATION_JOB_TTL') or 3600)
+
+    # Tekrarlanan gönderimler için sonuç önbelleği
+    EVALUATION_RESULT_CACHE_SIZE = int(os.environ.get('EVALUATION_RESULT_CACHE_SIZE') or 2048)
+    EVALUATION_RESULT_CACHE_TTL = int(os.environ.get('EVALUATION_RESULT_CACHE_TTL') or 600)
+    EVALUATION_RESULT_CACHE_PERSIST = (os.environ.get('EVALUATION_RESULT_CACHE_PERSIST') or 'true').lower() == 'true'
 
     # Repo dizin yolu
     @property
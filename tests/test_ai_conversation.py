@@ -0,0 +1,35 @@
+# tests/test_ai_conversation.py
+from app.services.ai_conversation import DEFAULT_PROMPT, gemini_contents
+
+
+def test_roles_are_mapped_and_consecutive_turns_merged():
+    messages = [
+        {"role": "user", "content": "merhaba"},
+        {"role": "user", "content": "notebook nedir?"},
+        {"role": "assistant", "content": "bir defter"},
+        {"role": "assistant", "content": "kod içerir"},
+        {"role": "user", "content": "teşekkürler"},
+    ]
+    assert gemini_contents(messages) == [
+        {"role": "user", "parts": ["merhaba", "notebook nedir?"]},
+        {"role": "model", "parts": ["bir defter", "kod içerir"]},
+        {"role": "user", "parts": ["teşekkürler"]},
+    ]
+
+
+def test_system_prompt_is_prefixed_to_first_user_turn():
+    messages = [{"role": "system", "content": "kısa yanıt ver"}, {"role": "user", "content": "özetle"}]
+    assert gemini_contents(messages) == [{"role": "user", "parts": ["SYSTEM: kısa yanıt ver", "özetle"]}]
+
+
+def test_system_prompt_gets_own_user_turn_before_model_turn():
+    messages = [{"role": "system", "content": "eski"}, {"role": "system", "content": "yeni"},
+                {"role": "assistant", "content": "selam"}]
+    assert gemini_contents(messages) == [
+        {"role": "user", "parts": ["SYSTEM: yeni"]},
+        {"role": "model", "parts": ["selam"]},
+    ]
+
+
+def test_empty_conversation_sends_default_prompt():
+    assert gemini_contents([]) == [{"role": "user", "parts": [DEFAULT_PROMPT]}]
@@ -0,0 +1,53 @@
+# tests/test_ai_health.py
+from app.services.ai_health import CLOSED, HALF_OPEN, OPEN, ProviderHealthMonitor, health_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_consecutive_failures_open_the_circuit_and_a_single_trial_closes_it():
+    clock = FakeClock()
+    monitor = ProviderHealthMonitor(ttl=30, failure_threshold=2, reset_timeout=60, clock=clock)
+    key = health_key('gemini', 'anahtar')
+    assert key != health_key('gemini', 'başka-anahtar')
+
+    monitor.record_failure(key, 'zaman aşımı')
+    assert monitor.allow(key) == (True, None)
+    monitor.record_failure(key, 'kota aşıldı')
+    assert monitor.allow(key) == (False, 'kota aşıldı')
+    assert monitor.available(key) == (False, 'kota aşıldı')
+    assert monitor.is_alive(key) is False
+
+    # Bekleme süresi dolunca yalnızca bir deneme çağrısına izin verilir
+    clock.now = 60
+    assert monitor.available(key) == (True, None)
+    assert monitor.allow(key) == (True, None)
+    assert monitor.status()[0]['state'] == HALF_OPEN
+    assert monitor.allow(key)[0] is False
+
+    # Başarısız deneme devreyi hemen yeniden açar
+    monitor.record_failure(key, 'hala kapalı')
+    assert monitor.status()[0]['state'] == OPEN
+    clock.now = 120
+    assert monitor.allow(key) == (True, None)
+    monitor.record_success(key)
+    assert monitor.status()[0] == {'provider': 'gemini', 'state': CLOSED, 'alive': True,
+                                   'failures': 0, 'last_error': 'hala kapalı'}
+
+
+def test_liveness_is_cached_for_ttl():
+    clock = FakeClock()
+    monitor = ProviderHealthMonitor(ttl=30, clock=clock)
+    key = health_key('gemini', 'anahtar')
+    assert monitor.is_alive(key) is None
+    monitor.record_success(key)
+    clock.now = 29
+    assert monitor.is_alive(key) is True
+    clock.now = 31
+    assert monitor.is_alive(key) is None
+    assert monitor.allow(key) == (True, None)
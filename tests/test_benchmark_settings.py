@@ -0,0 +1,44 @@
+# tests/test_benchmark_settings.py
+import pytest
+
+from app.services.evaluator import parse_benchmark_sizes, run_benchmark
+
+
+def test_parse_benchmark_sizes_accepts_two_or_more_positive_integers():
+    assert parse_benchmark_sizes(" 1000, 2000 ,4000") == [1000, 2000, 4000]
+    for value in ("10,abc", ",", "1000", "0,100", "-5,10", "1.5,3"):
+        with pytest.raises(ValueError):
+            parse_benchmark_sizes(value)
+
+
+def test_run_benchmark_reports_error_for_too_few_sizes():
+    result = run_benchmark(sorted, sorted, {"size_generator": "def generate(n):\n    return [list(range(n))]\n",
+                                            "sizes": [], "tolerance": 3})
+    assert result["status"] == "error"
+    assert result["passed"] is False
+
+
+@pytest.fixture
+def client():
+    testclient = pytest.importorskip("fastapi.testclient")
+    import api
+    return testclient.TestClient(api.api)
+
+
+def test_save_question_rejects_malformed_benchmark_sizes(client):
+    response = client.post("/api/save-question", json={
+        "title": "Sıralama", "description": "Listeyi sırala", "function_name": "sort_list",
+        "solution_code": "def sort_list(a):\n    return sorted(a)\n", "test_inputs": "[[[3, 1]]]",
+        "size_generator": "def generate(n):\n    return [list(range(n))]\n", "benchmark_sizes": "10,abc"
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"]
+
+
+def test_evaluate_rejects_single_benchmark_size(client):
+    response = client.post("/api/evaluate", json={
+        "code": "def f(a):\n    return a\n", "function_name": "f", "test_inputs": "[[1]]",
+        "solution_code": "def f(a):\n    return a\n", "size_generator": "def generate(n):\n    return [n]\n",
+        "benchmark_sizes": ","
+    })
+    assert response.status_code == 400
@@ -0,0 +1,247 @@
+# tests/test_evaluator.py
+import marshal
+
+import pytest
+from app.services.evaluator import compute_expected_outputs, encode_expected, execute_submission, run_benchmark
+from app.services.sandbox_pool import SandboxPool
+from app.services.test_plans import CompiledTestPlan, TestPlanCache
+from app.services.test_shards import run_sharded_job, split_shards
+
+SOLUTION = "def add(a, b):\n    return a + b\n"
+
+
+def make_job(code, test_inputs=None):
+    return {
+        "code": code,
+        "solution_code": SOLUTION,
+        "function_name": "add",
+        "test_inputs": test_inputs if test_inputs is not None else [[1, 2], [3, 4]],
+    }
+
+
+@pytest.fixture(scope='module')
+def pool():
+    sandbox = SandboxPool(size=1, max_jobs_per_worker=2, wall_timeout=3, cpu_limit=1)
+    yield sandbox
+    sandbox.shutdown()
+
+
+def test_execute_submission_correct():
+    result = execute_submission(make_job(SOLUTION))
+    assert result["is_correct"] is True
+    assert result["passed_tests"] == 2
+    assert result["failed_tests"] == 0
+
+
+def test_execute_submission_wrong_answer():
+    result = execute_submission(make_job("def add(a, b):\n    return a - b\n"))
+    assert result["is_correct"] is False
+    assert result["failed_tests"] == 2
+    assert result["test_results"]["test_1"]["expected"] == 3
+
+
+def test_execute_submission_missing_function():
+    result = execute_submission(make_job("def other(a, b):\n    return a\n"))
+    assert result["errors"] == ["'add' adında bir fonksiyon bulunamadı"]
+
+
+def test_pool_runs_and_recycles_workers(pool):
+    for _ in range(5):
+        response = pool.run(make_job(SOLUTION))
+        assert response["ok"] is True
+        assert response["result"]["is_correct"] is True
+
+
+def test_pool_times_out_infinite_loop(pool):
+    response = pool.run(make_job("def add(a, b):\n    while True:\n        pass\n"))
+    assert response["ok"] is False
+    assert response["status"] == "timeout"
+
+    # Havuz bir sonraki işe hazır olmalı
+    assert pool.run(make_job(SOLUTION))["ok"] is True
+
+
+LIMITS = {"test_timeout": 0.5, "test_cpu_limit": 0.5, "memory_limit_mb": 64, "output_limit": 100}
+
+
+def test_per_test_timeout_marks_only_slow_test(pool):
+    code = "def add(a, b):\n    while a > 1:\n        pass\n    return a + b\n"
+    response = pool.run(dict(make_job(code), limits=LIMITS))
+    assert response["ok"] is True
+    test_results = response["result"]["test_results"]
+    assert test_results["test_1"]["status"] == "passed"
+    assert test_results["test_2"]["status"] == "timeout"
+
+
+def test_output_limit_status():
+    code = "def add(a, b):\n    print('x' * 1000)\n    return a + b\n"
+    result = execute_submission(dict(make_job(code), limits={"output_limit": 100}))
+    assert result["test_results"]["test_1"]["status"] == "output_limit"
+    assert result["is_correct"] is False
+
+
+def test_memory_limit_status(pool):
+    code = "def add(a, b):\n    data = bytearray(512 * 1024 * 1024)\n    return a + b\n"
+    response = pool.run(dict(make_job(code), limits=LIMITS))
+    assert response["ok"] is True
+    assert response["result"]["test_results"]["test_1"]["status"] == "memory_exceeded"
+
+
+def test_encode_expected_round_trips_literals_only():
+    assert encode_expected((1, [2, 3])) == "(1, [2, 3])"
+    assert encode_expected(object()) is None
+    assert encode_expected(float('nan')) is None
+
+
+def test_cached_expected_outputs_skip_solution():
+    job = make_job(SOLUTION)
+    job["solution_code"] = "raise RuntimeError('çözüm çalıştırılmamalı')\n"
+    job["expected_outputs"] = ["3", "7"]
+    result = execute_submission(job)
+    assert result["is_correct"] is True
+
+
+def test_reference_is_computed_before_student_mutates_input():
+    job = make_job("def add(items):\n    items.append(99)\n    return len(items)\n")
+    job["solution_code"] = "def add(items):\n    return len(items)\n"
+    job["test_inputs"] = [[[1, 2]]]
+    result = execute_submission(job)
+    assert result["is_correct"] is False
+    assert result["test_results"]["test_1"]["expected"] == 2
+    assert "expected_outputs" not in result
+
+
+def test_student_module_code_cannot_patch_reference():
+    job = make_job("import builtins\nbuiltins.sum = lambda items: 0\ndef add(a, b):\n    return 0\n")
+    job["solution_code"] = "def add(a, b):\n    return sum([a, b])\n"
+    result = execute_submission(job)
+    assert result["is_correct"] is False
+
+
+def test_compute_expected_outputs():
+    result = compute_expected_outputs(make_job(SOLUTION))
+    assert result == {"expected_outputs": ["3", "7"], "errors": []}
+
+
+def test_precompiled_solution_bytecode_is_used():
+    job = make_job(SOLUTION)
+    job["solution_code"] = ""
+    job["solution_bytecode"] = marshal.dumps(compile(SOLUTION, "<string>", "exec"))
+    assert execute_submission(job)["is_correct"] is True
+
+
+def test_test_plan_cache_lru_and_invalidate():
+    cache = TestPlanCache(max_size=2)
+    for question_id in (1, 2, 3):
+        cache.put(CompiledTestPlan(question_id, "v1", "hash", [], SOLUTION))
+    assert cache.get(1, "v1") is None
+    assert cache.get(3, "v1").question_id == 3
+
+    cache.invalidate(3)
+    assert cache.get(3, "v1") is None
+    assert len(cache) == 1
+
+
+def test_fail_fast_stops_at_first_failure_in_given_order():
+    job = make_job("def add(a, b):\n    return a - b\n", test_inputs=[[1, 2], [3, 4], [5, 6]])
+    job.update(fail_fast=True, order=[2, 0, 1])
+    result = execute_submission(job)
+    assert result["failed_tests"] == 1
+    assert list(result["test_results"]) == ["test_3"]
+
+
+def test_metrics_cover_only_user_code():
+    job = make_job(SOLUTION)
+    job["solution_code"] = "import time\ntime.sleep(0.2)\n" + SOLUTION
+    job["limits"] = {"trace_memory": True}
+    result = execute_submission(job)
+    metrics = result["test_results"]["test_1"]["metrics"]
+    assert set(metrics) == {"wall_ns", "cpu_ns", "peak_memory_bytes"}
+    # Referans çözümün yüklenme süresi kullanıcıya yansımamalı
+    assert result["execution_time"] < 100
+    assert result["peak_memory"] is not None
+
+
+SORT_SOLUTION = "def sort_list(items):\n    return sorted(items)\n"
+QUADRATIC_SORT = """def sort_list(items):
+    items = list(items)
+    for i in range(len(items)):
+        for j in range(len(items) - i - 1):
+            if items[j] > items[j + 1]:
+                items[j], items[j + 1] = items[j + 1], items[j]
+    return items
+"""
+BENCHMARK = {
+    "size_generator": "import random\ndef generate(n):\n    return [[random.random() for _ in range(n)]]\n",
+    "sizes": [200, 400, 800],
+    "tolerance": 1000,
+    "growth_tolerance": 0.5,
+    "repeats": 1,
+}
+
+
+def _functions(code):
+    user_namespace, solution_namespace = {}, {}
+    exec(code, user_namespace)
+    exec(SORT_SOLUTION, solution_namespace)
+    return user_namespace["sort_list"], solution_namespace["sort_list"]
+
+
+def test_benchmark_rejects_quadratic_growth():
+    result = run_benchmark(*_functions(QUADRATIC_SORT), BENCHMARK)
+    assert result["passed"] is False
+    assert result["status"] == "too_slow"
+    assert result["user_growth"] > 1.5
+
+
+def test_benchmark_accepts_matching_growth():
+    code = "def sort_list(items):\n    return sorted(list(items))\n"
+    result = run_benchmark(*_functions(code), BENCHMARK)
+    assert result["passed"] is True
+    assert len(result["user_times"]) == 3
+
+
+def test_benchmark_runs_after_tests_pass():
+    job = {"code": QUADRATIC_SORT, "solution_code": SORT_SOLUTION, "function_name": "sort_list",
+           "test_inputs": [[[3, 1, 2]]], "benchmark": BENCHMARK}
+    result = execute_submission(job)
+    assert result["is_correct"] is False
+    assert result["passed_tests"] == 1
+    assert result["test_results"]["benchmark"]["status"] == "too_slow"
+
+
+def _run_in(pool, timeout=3):
+    return lambda job, test_count: pool.run(job, timeout=timeout)
+
+
+def test_sharded_run_matches_unsharded_run(pool):
+    code = "def add(a, b):\n    while a < 0:\n        pass\n    return a + b if a != 5 else 0\n"
+    job = dict(make_job(code, [[i, i] for i in range(7)] + [[-1, 0], [8, 1]]), limits=LIMITS)
+    unsharded = pool.run(job)["result"]
+    response = run_sharded_job(job, 3, _run_in(pool))
+    assert response["ok"] is True
+    sharded = response["result"]
+
+    assert list(sharded["test_results"]) == list(unsharded["test_results"])
+    assert ({key: test["status"] for key, test in sharded["test_results"].items()}
+            == {key: test["status"] for key, test in unsharded["test_results"].items()})
+    assert sharded["test_results"]["test_8"]["status"] == "timeout"
+    for field in ("passed_tests", "failed_tests", "is_correct"):
+        assert sharded[field] == unsharded[field]
+    # Süre, parçaların eşzamanlı geçen süresi değil testlerdeki toplam süredir
+    assert sharded["execution_time"] == pytest.approx(
+        sum(test["metrics"]["wall_ns"] for test in sharded["test_results"].values()) / 1e6, abs=0.01)
+
+
+def test_sharded_run_returns_timed_out_shard(pool):
+    code = "def add(a, b):\n    while a > 2:\n        pass\n    return a + b\n"
+    response = run_sharded_job(make_job(code, [[1, 1], [2, 2], [3, 3], [4, 4]]), 2, _run_in(pool, timeout=1))
+    assert response["ok"] is False
+    assert response["status"] == "timeout"
+    assert pool.run(make_job(SOLUTION))["ok"] is True
+
+
+def test_split_shards_are_contiguous():
+    assert split_shards(5, 2) == [[0, 1, 2], [3, 4]]
+    assert split_shards(2, 4) == [[0], [1]]
+    assert split_shards(0, 3) == []
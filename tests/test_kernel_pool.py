@@ -0,0 +1,149 @@
+# tests/test_kernel_pool.py
+import threading
+import time
+
+import pytest
+
+from app.services.kernel_pool import KernelBusy, KernelDied, KernelPool, KernelUnavailable
+
+
+@pytest.fixture
+def pool():
+    kernels = KernelPool(max_kernels=2, idle_timeout=60, spares=0)
+    yield kernels
+    kernels.shutdown()
+
+
+def run(pool, user_id, code, on_input=None):
+    output = []
+    kernel = pool.acquire(user_id)
+    try:
+        kernel.execute(code, output.append, on_input or (lambda prompt, request_id: None))
+    finally:
+        pool.release(kernel)
+    return ''.join(output)
+
+
+def test_namespace_persists_per_user_and_reset_clears_it(pool):
+    assert run(pool, 1, "x = 41\nprint('hazır')") == "hazır\n"
+    assert run(pool, 1, "x + 1") == "42\n"
+    assert run(pool, 2, "'x' in globals()") == "False\n"
+
+    pool.reset(1)
+    assert run(pool, 1, "x") == "name 'x' is not defined"
+
+
+def test_input_is_routed_to_the_waiting_kernel(pool):
+    prompts = []
+    delivered = []
+
+    def answer(prompt, request_id):
+        prompts.append((prompt, request_id))
+
+        def reply():
+            # Başka bir oturumun veya eski bir isteğin yanıtı bekleyen çalıştırmaya ulaşmaz
+            delivered.append(pool.send_input(1, "Grace", session_id="sekme-2", request_id=request_id))
+            delivered.append(pool.send_input(1, "Linus", session_id="sekme-1", request_id=request_id - 1))
+            delivered.append(pool.send_input(1, "Ada", session_id="sekme-1", request_id=request_id))
+
+        threading.Thread(target=reply).start()
+
+    output = []
+    kernel = pool.acquire(1)
+    try:
+        kernel.execute("name = input('Adınız: ')\nprint('Merhaba', name)", output.append, answer,
+                       session_id="sekme-1")
+    finally:
+        pool.release(kernel)
+    assert ''.join(output) == "Merhaba Ada\n"
+    assert prompts == [("Adınız: ", 1)]
+    assert delivered == [False, False, True]
+    # Bekleyen input yokken gelen yanıtlar yok sayılır
+    assert not pool.send_input(1, "fazla")
+
+
+def test_closing_the_session_cancels_its_run(pool):
+    def close_session(prompt, request_id):
+        threading.Thread(target=pool.cancel, args=(1, "sekme-1")).start()
+
+    kernel = pool.acquire(1)
+    try:
+        with pytest.raises(KernelDied):
+            kernel.execute("input()", lambda text: None, close_session, session_id="sekme-1")
+    finally:
+        pool.release(kernel)
+    assert not pool.cancel(1, "sekme-1")
+    assert run(pool, 1, "1 + 1") == "2\n"
+
+
+def test_capacity_evicts_least_recently_used_idle_kernel(pool):
+    run(pool, 1, "a = 1")
+    run(pool, 2, "b = 2")
+    busy = [pool.acquire(2)]
+    try:
+        with pytest.raises(KernelBusy):
+            pool.acquire(2)
+        # Kullanıcı 1'in boşta duran çekirdeği kullanıcı 3'e yer açmak için kapatılır
+        busy.append(pool.acquire(3))
+        status = pool.status()
+        assert (status["kernels"], status["busy"], status["evictions"]["capacity"]) == (2, 2, 1)
+        with pytest.raises(KernelUnavailable):
+            pool.acquire(4)
+    finally:
+        for kernel in busy:
+            pool.release(kernel)
+    assert run(pool, 1, "'a' in globals()") == "False\n"
+
+
+def test_idle_kernels_are_culled(pool):
+    run(pool, 1, "a = 1")
+    pool.idle_timeout = 0
+    assert pool.cull_idle() == 1
+    assert pool.status()["kernels"] == 0
+
+
+def test_memory_is_accounted_per_user_and_budget_evicts_idle_kernels():
+    pool = KernelPool(max_kernels=4, idle_timeout=60, spares=0, memory_limit_mb=64)
+    try:
+        run(pool, 1, "a = 1")
+        run(pool, 2, "b = 2")
+        status = pool.status()
+        assert all(user["memory_bytes"] > 0 for user in status["users"])
+        assert status["memory_bytes"] == sum(user["memory_bytes"] for user in status["users"])
+
+        # Bütçe tek bir yorumlayıcıdan bile küçük: çalışan çekirdek korunur, boşta olanlar kapatılır
+        busy = pool.acquire(2)
+        pool.memory_budget = 1024 * 1024
+        try:
+            assert pool.enforce_memory_budget() == 1
+            assert [user["user_id"] for user in pool.status()["users"]] == [2]
+        finally:
+            pool.release(busy)
+        assert pool.status()["evictions"]["memory"] >= 1
+
+        assert run(pool, 3, "x = bytearray(128 * 1024 * 1024)") == "Bellek sınırı aşıldı"
+    finally:
+        pool.shutdown()
+
+
+def test_output_is_coalesced_into_timed_and_size_bounded_chunks():
+    pool = KernelPool(max_kernels=1, idle_timeout=60, spares=0, flush_interval=0.05, chunk_size=1024)
+    try:
+        chunks = []
+        kernel = pool.acquire(1)
+        try:
+            kernel.execute("for i in range(2000):\n    print(i)", chunks.append, lambda prompt, request_id: None)
+            assert ''.join(chunks) == ''.join(f"{i}\n" for i in range(2000))
+            assert 1 < len(chunks) < 20
+            assert all(len(chunk) >= 1024 for chunk in chunks[:-1])
+
+            # Uzun süren kodun ilk çıktısı kod bitmeden gelir
+            arrivals = []
+            kernel.execute("import time\nprint('başladı')\ntime.sleep(0.5)\nprint('bitti')",
+                           lambda text: arrivals.append((text, time.monotonic())), lambda prompt, request_id: None)
+            assert [text for text, _ in arrivals] == ["başladı\n", "bitti\n"]
+            assert arrivals[1][1] - arrivals[0][1] > 0.3
+        finally:
+            pool.release(kernel)
+    finally:
+        pool.shutdown()
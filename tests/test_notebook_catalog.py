@@ -0,0 +1,71 @@
+# tests/test_notebook_catalog.py
+import json
+import os
+import subprocess
+
+import pytest
+
+from app.services.notebook_catalog import NotebookCatalog, content_hash, git_blob_hash
+
+
+def write_notebook(path, cells):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"cells": cells, "metadata": {}, "nbformat": 4, "nbformat_minor": 5}))
+
+
+def test_git_blob_hash_matches_git(tmp_path):
+    sample = tmp_path / "sample.txt"
+    sample.write_bytes(b"merhaba\n")
+    expected = subprocess.run(["git", "hash-object", str(sample)], capture_output=True, text=True).stdout.strip()
+    assert git_blob_hash(b"merhaba\n") == expected
+
+
+def test_rebuild_collects_metadata_and_skips_unchanged(tmp_path):
+    write_notebook(tmp_path / "hafta1" / "giris.ipynb", [
+        {"cell_type": "markdown", "metadata": {}, "source": ["# Python'a Giriş\n", "metin"]},
+        {"cell_type": "code", "metadata": {}, "source": "print(1)", "outputs": [], "execution_count": None},
+    ])
+    catalog = NotebookCatalog(str(tmp_path))
+    assert catalog.rebuild() == 1
+
+    entry = catalog.get(os.path.join("hafta1", "giris.ipynb"))
+    assert entry["title"] == "Python'a Giriş"
+    assert (entry["cell_count"], entry["code_cell_count"], entry["markdown_cell_count"]) == (2, 1, 1)
+    assert len(entry["blob_hash"]) == 40
+
+    # Değişmeyen dosyalar yeniden okunmaz
+    assert catalog.rebuild() == 0
+    assert catalog.paths() == [os.path.join("hafta1", "giris.ipynb")]
+
+    # Saniyenin altındaki değişiklikler de nanosaniye zaman damgasıyla fark edilir
+    stat = os.stat(tmp_path / "hafta1" / "giris.ipynb")
+    os.utime(tmp_path / "hafta1" / "giris.ipynb", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert catalog.rebuild() == 1
+
+
+def test_content_hash_ignores_outputs_and_whitespace():
+    cells = [{"cell_type": "code", "metadata": {}, "source": ["x = 1\n", "print(x)"],
+              "outputs": [], "execution_count": None}]
+    rerun = [{"cell_type": "code", "metadata": {"collapsed": True}, "source": "x = 1\r\nprint(x)\n",
+              "outputs": [{"output_type": "stream", "text": "1"}], "execution_count": 3}]
+    assert content_hash(cells) == content_hash(rerun)
+    assert content_hash(cells) != content_hash([dict(cells[0], source="x = 2\nprint(x)")])
+    assert content_hash(cells) != content_hash([dict(cells[0], cell_type="markdown")])
+
+
+def test_content_hash_of_nbformat3_matches_v4_reader(tmp_path):
+    nbformat = pytest.importorskip("nbformat")
+    path = tmp_path / "eski.ipynb"
+    path.write_text(json.dumps({"nbformat": 3, "nbformat_minor": 0, "metadata": {"name": "eski"}, "worksheets": [
+        {"cells": [
+            {"cell_type": "heading", "level": 1, "metadata": {}, "source": ["Eski Biçim"]},
+            {"cell_type": "code", "collapsed": False, "input": ["x = 1\n", "print(x)"], "language": "python",
+             "metadata": {}, "outputs": [], "prompt_number": 1},
+        ], "metadata": {}}]}))
+
+    catalog = NotebookCatalog(str(tmp_path))
+    catalog.rebuild()
+    entry = catalog.get("eski.ipynb")
+    with open(path) as f:
+        assert entry["content_hash"] == content_hash(nbformat.read(f, as_version=4).cells)
+    assert (entry["title"], entry["code_cell_count"]) == ("Eski Biçim", 1)
@@ -0,0 +1,71 @@
+# tests/test_repo_sync.py
+import os
+import threading
+import time
+
+from app.services.repo_sync import RepoSyncService
+
+
+def test_concurrent_syncs_share_one_pull(tmp_path):
+    service = RepoSyncService("https://example.invalid/repo", str(tmp_path / "repo"), interval=0)
+    calls = []
+
+    def slow_pull():
+        calls.append(1)
+        time.sleep(0.2)
+        return service.repo_dir
+
+    service._pull_or_clone = slow_pull
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.sync())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [service.repo_dir] * 5
+
+
+def test_existing_checkout_is_read_without_sync(tmp_path):
+    service = RepoSyncService("https://example.invalid/repo", str(tmp_path), interval=0)
+    service._pull_or_clone = lambda: (_ for _ in ()).throw(AssertionError("git çalıştırılmamalı"))
+    assert service.ensure_checkout() == str(tmp_path)
+
+
+def test_clone_swaps_in_new_checkout_and_removes_old_one(tmp_path):
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+    (repo_dir / "eski.ipynb").write_text("{}")
+    service = RepoSyncService("https://example.invalid/repo", str(repo_dir), interval=0)
+
+    def fake_git(*args, cwd=None):
+        staging_dir = args[-1]
+        os.makedirs(staging_dir)
+        with open(os.path.join(staging_dir, "yeni.ipynb"), "w") as f:
+            f.write("{}")
+
+    service._run_git = fake_git
+    service._clone()
+    assert sorted(os.listdir(repo_dir)) == ["yeni.ipynb"]
+    assert sorted(os.listdir(tmp_path)) == ["repo"]
+
+
+def test_listeners_run_in_background_after_sync_lock_is_released(tmp_path):
+    service = RepoSyncService("https://example.invalid/repo", str(tmp_path), interval=0)
+    done = threading.Event()
+    calls = []
+
+    def pull():
+        service.last_sync_at = time.time()
+        return service.repo_dir
+
+    def listener(repo_dir):
+        calls.append((repo_dir, service._sync_lock.locked(), threading.current_thread().name))
+        done.set()
+
+    service._pull_or_clone = pull
+    service.add_listener(listener)
+    assert service.sync() == str(tmp_path)
+    assert done.wait(2)
+    assert calls == [(str(tmp_path), False, 'repo-sync-listeners')]
@@ -0,0 +1,60 @@
+# tests/test_search_index.py
+import json
+import os
+
+from app.services.notebook_catalog import NotebookCatalog
+from app.services.search_index import NOTEBOOK, SUMMARY, SearchIndex, tokenize
+
+
+def write_notebook(path, cells):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"cells": cells, "metadata": {}, "nbformat": 4, "nbformat_minor": 5}))
+
+
+def markdown(source):
+    return {"cell_type": "markdown", "metadata": {}, "source": source}
+
+
+def code(source):
+    return {"cell_type": "code", "metadata": {}, "source": source, "outputs": [], "execution_count": None}
+
+
+def test_tokenize_folds_turkish_characters_and_splits_identifiers():
+    assert tokenize("Döngüler ve İŞLEMLER") == ["donguler", "ve", "islemler"]
+    assert tokenize("df = pd.read_csv(x)") == ["df", "pd", "read_csv", "read", "csv"]
+
+
+def test_search_ranks_title_matches_first_and_updates_incrementally(tmp_path):
+    write_notebook(tmp_path / "hafta1.ipynb", [markdown("# Döngüler\nfor ve while"), code("for i in range(3):\n    print(i)")])
+    write_notebook(tmp_path / "hafta2.ipynb", [markdown("# Fonksiyonlar"), code("def f():\n    return [i for i in range(3)]")])
+    catalog = NotebookCatalog(str(tmp_path))
+    catalog.rebuild()
+
+    index = SearchIndex()
+    assert index.refresh_notebooks(str(tmp_path), catalog.entries()) == 2
+    results = index.search("döngüler range")
+    assert [result["notebook_path"] for result in results] == ["hafta1.ipynb", "hafta2.ipynb"]
+    assert results[0]["title"] == "Döngüler"
+    assert results[0]["matched_in"] == [NOTEBOOK]
+
+    # Değişmeyen notebook'lar yeniden indekslenmez, silinenler çıkarılır
+    assert index.refresh_notebooks(str(tmp_path), catalog.entries()) == 0
+    os.remove(tmp_path / "hafta1.ipynb")
+    catalog.rebuild()
+    index.refresh_notebooks(str(tmp_path), catalog.entries())
+    assert [result["notebook_path"] for result in index.search("döngüler")] == []
+
+
+def test_summary_documents_are_merged_with_notebook_results():
+    index = SearchIndex()
+    index.index_document(NOTEBOOK, "a.ipynb", "v1", {"title": "Listeler", "code": "x = [1, 2]"})
+    assert index.update_summary("a.ipynb", "Bu notebook sözlük ve liste yapılarını anlatır.")
+    assert not index.update_summary("a.ipynb", "Bu notebook sözlük ve liste yapılarını anlatır.")
+
+    results = index.search("sözlük")
+    assert results[0]["notebook_path"] == "a.ipynb"
+    assert results[0]["matched_in"] == [SUMMARY]
+    assert results[0]["snippet"].startswith("Bu notebook")
+
+    index.remove_document(SUMMARY, "a.ipynb")
+    assert index.search("sözlük") == []
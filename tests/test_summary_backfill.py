@@ -0,0 +1,119 @@
+# tests/test_summary_backfill.py
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services.summary_backfill import (STATUS_DONE, STATUS_FAILED, STATUS_PENDING, SummaryBackfill,
+                                           TokenBucket, backoff_delay, estimate_cost)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status_code=200, payload=None, headers=None):
+    return SimpleNamespace(status_code=status_code, json=lambda: payload or {}, text='',
+                           headers=headers or {})
+
+
+def test_token_bucket_spends_a_minute_of_quota_then_paces_callers():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+    assert bucket.reserve(60) == 0
+    # Bekleyen çağıranlar sırayla sonraki dolumları ayırır
+    assert bucket.reserve(1) == 1
+    assert bucket.reserve(2) == 3
+    clock.now = 63
+    assert bucket.reserve(30) == 0
+    # Kapasiteden büyük istekler kapasiteye indirilir
+    assert bucket.reserve(1000) == 30
+    assert TokenBucket(0).reserve(10 ** 9) == 0
+
+
+def test_cost_and_backoff_are_bounded():
+    assert estimate_cost({'size': 10 ** 9, 'code_cell_count': 25}) == (5, 65000 // 4 + 5 * 2000)
+    assert all(0 <= backoff_delay(attempt, 5, 60) <= min(60, 5 * 2 ** (attempt - 1)) for attempt in range(1, 10))
+
+
+def test_transient_errors_are_retried_until_success_and_progress_is_reported():
+    backfill = SummaryBackfill('http://api', requests_per_minute=0, tokens_per_minute=0,
+                               max_attempts=5, backoff_base=0, backoff_max=0)
+    replies = [ConnectionError('bağlantı kesildi'), response(429, headers={'Retry-After': '0'}),
+               response(200, {'error': 'AI yanıtı alınamadı'}), response(200, {'summary': 'özet'})]
+    progress = []
+
+    def post(notebook_path):
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    backfill._post = post
+
+    outcome = backfill.summarize('a.ipynb', (1, 1), attempts=0,
+                                 on_progress=lambda status, attempts, error, next_at: progress.append((status, attempts)))
+    assert outcome == STATUS_DONE
+    assert progress == [(STATUS_PENDING, 1), (STATUS_PENDING, 2), (STATUS_PENDING, 3), (STATUS_DONE, 4)]
+
+
+def test_attempts_resume_from_stored_count_and_permanent_errors_stop_early():
+    backfill = SummaryBackfill('http://api', requests_per_minute=0, tokens_per_minute=0,
+                               max_attempts=3, backoff_base=0, backoff_max=0)
+    calls = []
+    backfill._post = lambda notebook_path: calls.append(notebook_path) or response(503)
+    assert backfill.summarize('a.ipynb', (1, 1), attempts=2) == STATUS_FAILED
+    assert len(calls) == 1
+
+    backfill._post = lambda notebook_path: calls.append(notebook_path) or response(404)
+    assert backfill.summarize('b.ipynb', (1, 1)) == STATUS_FAILED
+    assert calls == ['a.ipynb', 'b.ipynb']
+
+
+class FakeSession:
+    def __init__(self, summaries, progress):
+        self.summaries = summaries
+        self.progress = progress
+        self.saved = []
+
+    def execute(self, query, params=None):
+        sql = str(query)
+        if 'FROM notebook_summary' in sql:
+            return [SimpleNamespace(notebook_path=path, content_hash=content_hash)
+                    for path, content_hash in self.summaries.items()]
+        if 'FROM summary_backfill' in sql:
+            return list(self.progress)
+        self.saved.append((params['path'], params['status']))
+        return SimpleNamespace(rowcount=1)
+
+    def commit(self):
+        pass
+
+
+def test_plan_resumes_progress_and_resummarizes_only_changed_notebooks():
+    retry_at = datetime(2026, 1, 1)
+    session = FakeSession(
+        summaries={'guncel.ipynb': 'h1', 'eski.ipynb': 'h2', 'hashsiz.ipynb': None},
+        progress=[
+            SimpleNamespace(notebook_path='yarim.ipynb', blob_hash='b4', status=STATUS_PENDING,
+                            attempts=2, next_attempt_at=retry_at),
+            SimpleNamespace(notebook_path='bozuk.ipynb', blob_hash='b5', status=STATUS_FAILED,
+                            attempts=5, next_attempt_at=None),
+            SimpleNamespace(notebook_path='degisti.ipynb', blob_hash='eski', status=STATUS_FAILED,
+                            attempts=5, next_attempt_at=None),
+        ])
+    entries = [
+        {'notebook_path': 'guncel.ipynb', 'blob_hash': 'b1', 'content_hash': 'h1'},
+        {'notebook_path': 'eski.ipynb', 'blob_hash': 'b2', 'content_hash': 'h2-yeni'},
+        {'notebook_path': 'hashsiz.ipynb', 'blob_hash': 'b3', 'content_hash': 'h3'},
+        {'notebook_path': 'yarim.ipynb', 'blob_hash': 'b4', 'content_hash': 'h4'},
+        {'notebook_path': 'bozuk.ipynb', 'blob_hash': 'b5', 'content_hash': 'h5'},
+        {'notebook_path': 'degisti.ipynb', 'blob_hash': 'b6', 'content_hash': 'h6'},
+    ]
+
+    jobs = SummaryBackfill('http://api').plan(session, entries)
+    assert [(entry['notebook_path'], attempts, not_before) for entry, attempts, not_before in jobs] == [
+        ('eski.ipynb', 0, None), ('yarim.ipynb', 2, retry_at), ('degisti.ipynb', 0, None)]
+    assert session.saved == [('guncel.ipynb', 'done'), ('hashsiz.ipynb', 'done')]